@@ -8,9 +8,9 @@ from queue import Queue, Empty
 import os
 
 class CameraCommunication:
-    def __init__(self):
+    def __init__(self, retries=3, retry_delay=1.0):
         connected = False
-        for i in range(3):
+        for i in range(retries):
             try:
                 self.camera = pylon.InstantCamera(pylon.TlFactory.GetInstance().CreateFirstDevice())
                 self.camera.Open()
@@ -20,7 +20,8 @@ class CameraCommunication:
                 break
             except Exception as e:
                 print(f"Connection attempt {i+1} failed. Error: {e}")
-                time.sleep(1)
+                if i < retries - 1:
+                    time.sleep(retry_delay)
 
         if not connected:
             raise Exception("No device is available. Please check the camera connection.")
@@ -95,23 +96,37 @@ class CameraDB:
 
 
 class CameraCollector(threading.Thread):
-    def __init__(self, camera, db, sample_rate=30, save_interval=1.0):
+    def __init__(self, camera, db, sample_rate=30, save_interval=1.0, register=None, name="camera"):
         super().__init__(daemon=True)
         self.camera = camera
         self.db = db
         self.running = True
+        # 최신값 레지스터 (백엔드에서 사용, 단독 실행 시 None)
+        self.register = register
+        self.name = name
         self.sample_rate = sample_rate
         self.save_interval = save_interval
         self.last_save = 0
+        # 읽기 오류 통계 (백엔드 재연결 감시에서 사용)
+        self.error_count = 0
+        self.consecutive_errors = 0
+        self.last_error = None
 
     def run(self):
         while self.running:
             loop_start = time.perf_counter()
             frame = self.camera.get_data()
-            if frame is not None:
+            read_time = time.monotonic()
+            if frame is None:
+                # get_data는 획득 실패 시 None 반환
+                self._record_error("이미지 획득 실패")
+            else:
+                self.consecutive_errors = 0
                 area = self.camera.calculate_melt_pool_area(frame, threshold=120)
                 data = {"image": frame, "melt_pool_area": area}
                 self.db.store_data(data)
+                if self.register is not None:
+                    self.register.publish(self.name, data, read_time)
 
                 now = time.time()
                 if now - self.last_save >= self.save_interval:
@@ -126,6 +141,12 @@ class CameraCollector(threading.Thread):
             sleep_time = max(0, (1/self.sample_rate) - (time.perf_counter() - loop_start))
             time.sleep(sleep_time)
 
+    def _record_error(self, error):
+        """읽기 오류 집계 (재연결 감시용)"""
+        self.error_count += 1
+        self.consecutive_errors += 1
+        self.last_error = str(error)
+
     def stop(self):
         self.running = False
         try:
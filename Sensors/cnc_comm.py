@@ -114,25 +114,46 @@ class CNC_DB:
         return None
 
 class CNC_Collector(threading.Thread):
-    def __init__(self, com, db, sample_rate=100):
+    def __init__(self, com, db, sample_rate=100, register=None, name="cnc"):
         threading.Thread.__init__(self)
         self.com = com
         self.db = db
         self.running = True
         self.sample_rate = sample_rate
+        # 최신값 레지스터 (백엔드에서 사용, 단독 실행 시 None)
+        self.register = register
+        self.name = name
+        # 읽기 오류 통계 (백엔드 재연결 감시에서 사용)
+        self.error_count = 0
+        self.consecutive_errors = 0
+        self.last_error = None
 
     def run(self):
         while self.running:
             loop_start = time.perf_counter()
             if self.com.activate:
-                data = self.com.get_pos_data()
+                try:
+                    data = self.com.get_pos_data()
+                    self.consecutive_errors = 0
+                except Exception as e:
+                    self._record_error(e)
+                    data = None
+                read_time = time.monotonic()
                 if data:
                     self.db.store_data(data)
+                    if self.register is not None:
+                        self.register.publish(self.name, data, read_time)
             else:
                 time.sleep(0.5)
             sleep_time = max(0, (1/self.sample_rate)-(time.perf_counter()-loop_start))
             time.sleep(sleep_time)
 
+    def _record_error(self, error):
+        """읽기 오류 집계 (재연결 감시용)"""
+        self.error_count += 1
+        self.consecutive_errors += 1
+        self.last_error = str(error)
+
     def stop(self):
         self.running = False
 
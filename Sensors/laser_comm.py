@@ -34,8 +34,11 @@ class LaserCommunication:
 
         self.ip = str(self.address['ip'])
         self.port = int(self.address['port'])
+        # 연결/응답 타임아웃 (장비가 꺼져 있을 때 connect/recv가 무한 대기하지 않도록)
+        self.timeout = float(self.address.get('timeout', 1.0))
 
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.settimeout(self.timeout)
         self.connect()
 
     def connect(self):
@@ -74,8 +77,9 @@ class LaserCommunication:
         return self.data
     
     def close(self):
-        if self.activate:
-            self.activate = False
+        # 연결 실패(activate=False)로 끝난 경우에도 소켓 핸들 해제
+        self.activate = False
+        if getattr(self, 'socket', None) is not None:
             self.socket.close()
         print("Connection closed.")
 
@@ -92,25 +96,50 @@ class LaserDB:
         return print("Test Data queue is empty")
 
 class IPG_Collector(threading.Thread):
-    def __init__(self, com, db):
+    def __init__(self, com, db, register=None, name="laser"):
         threading.Thread.__init__(self)
         self.com = com
         self.db = db
         self.running = True
         self.sample_rate = 100
+        # 최신값 레지스터 (백엔드에서 사용, 단독 실행 시 None)
+        self.register = register
+        self.name = name
+        # 읽기 오류 통계 (백엔드 재연결 감시에서 사용)
+        self.error_count = 0
+        self.consecutive_errors = 0
+        self.last_error = None
 
     def run(self):
         while self.running:
             loop_start = time.perf_counter()
             if self.com.activate:
-                data = self.com.get_data()
+                try:
+                    data = self.com.get_data()
+                except Exception as e:
+                    self._record_error(e)
+                    data = None
+                read_time = time.monotonic()
+                # 출력/설정 파워를 모두 읽지 못하면 응답 없음으로 집계
+                if data and (data.get('outpower') is not None or data.get('setpower') is not None):
+                    self.consecutive_errors = 0
+                elif data:
+                    self._record_error("응답 없음")
                 if data:
                     self.db.store_data(data)
+                    if self.register is not None:
+                        self.register.publish(self.name, data, read_time)
             else:
                 time.sleep(0.5)
             sleep_time = max(0, (1/self.sample_rate)-(time.perf_counter()-loop_start))
             time.sleep(sleep_time)
         time.sleep(0.1)
+
+    def _record_error(self, error):
+        """읽기 오류 집계 (재연결 감시용)"""
+        self.error_count += 1
+        self.consecutive_errors += 1
+        self.last_error = str(error)
     
     def stop(self):
         self.running = False
@@ -41,14 +41,17 @@ class PyrometerCommunication:
             parity=self.address['parity'],
             stopbits=int(self.address['stopbits']),
             bytesize=int(self.address['bytesize']),
-            timeout=int(self.address['timeout'])
+            timeout=float(self.address['timeout'])
         )
 
         if self.serial.is_open:
             print(f"Serial port {self.address['port']} opened successfully.")
 
+            # 초기 응답은 짧은 타임아웃으로 확인 (장비가 응답하지 않을 때 시작 지연 방지)
+            self.serial.timeout = float(self.address.get('connect_timeout', 0.5))
             self.serial.write("00bum01\r".encode('ascii'))
             initial_response = self.serial.read_until(b'\r').decode('utf-8').strip()
+            self.serial.timeout = float(self.address['timeout'])
             
             if initial_response == 'ok':
                 self.activate = True
@@ -74,6 +77,8 @@ class PyrometerCommunication:
                 except Exception as e:
                     continue
 
+            # 응답 여부 기록 (응답이 없으면 마지막 값이 유지되므로 컬렉터에서 오류로 집계)
+            self.last_read_ok = response is not None
             if response:
                 try:
                     mpt = int(response[0:4], 16) / 10
@@ -93,6 +98,9 @@ class PyrometerCommunication:
     
     def close(self):
         self.activate = False
+        # 재연결 시 같은 COM 포트를 다시 열 수 있도록 핸들 해제 (열려 있으면 Windows에서 포트 사용 중 오류)
+        if getattr(self, 'serial', None) is not None and self.serial.is_open:
+            self.serial.close()
     
 
 class PyrometerDB:
@@ -109,26 +117,50 @@ class PyrometerDB:
 
 
 class PyrometerCollector(threading.Thread):
-    def __init__(self, com, db):
+    def __init__(self, com, db, register=None, name="pyrometer"):
         threading.Thread.__init__(self)
         self.com = com
         self.db = db
         self.running = True
         self.sample_rate = 20   # 🔑 100 → 20 Hz (안정화)
+        # 최신값 레지스터 (백엔드에서 사용, 단독 실행 시 None)
+        self.register = register
+        self.name = name
+        # 읽기 오류 통계 (백엔드 재연결 감시에서 사용)
+        self.error_count = 0
+        self.consecutive_errors = 0
+        self.last_error = None
 
     def run(self):
         while self.running:
             loop_start = time.perf_counter()
             if self.com.activate:
-                data = self.com.get_data()
+                try:
+                    data = self.com.get_data()
+                except Exception as e:
+                    self._record_error(e)
+                    data = None
+                read_time = time.monotonic()
+                if data and getattr(self.com, 'last_read_ok', True):
+                    self.consecutive_errors = 0
+                elif data:
+                    self._record_error("응답 없음")
                 if data:
                     self.db.store_data(data)
+                    if self.register is not None:
+                        self.register.publish(self.name, data, read_time)
             else:
                 time.sleep(0.5)
             sleep_time = max(0, (1/self.sample_rate) - (time.perf_counter() - loop_start))
             time.sleep(sleep_time)
         time.sleep(0.1)
-    
+
+    def _record_error(self, error):
+        """읽기 오류 집계 (재연결 감시용)"""
+        self.error_count += 1
+        self.consecutive_errors += 1
+        self.last_error = str(error)
+
     def stop(self):
         self.running = False
 
@@ -7,17 +7,21 @@ import json
 import threading
 import os
 import sys
+import time
 from typing import Dict, Optional, Any
 
 
 class CNCSubprocessManager:
     """CNC 통신을 별도 프로세스로 실행하고 JSON 데이터를 수신"""
     
-    def __init__(self, python_executable: str = None, config_path: str = None):
+    def __init__(self, python_executable: str = None, config_path: str = None,
+                 register=None, name: str = "cnc"):
         """
         Args:
             python_executable: 32비트 Python 실행 파일 경로 (예: "C:/Python36-32/python.exe")
             config_path: HXApi.ini 설정 파일 경로
+            register: 수신한 데이터를 발행할 최신값 레지스터 (선택)
+            name: 레지스터 슬롯 이름
         """
         self.python_executable = python_executable
         self.config_path = config_path
@@ -25,6 +29,8 @@ class CNCSubprocessManager:
         self.cnc_thread: Optional[threading.Thread] = None
         self.cnc_data: Dict[str, Any] = {}
         self.cnc_thread_running = False
+        self.register = register
+        self.name = name
         
         # 기본 경로 설정
         if not self.config_path:
@@ -118,6 +124,8 @@ class CNCSubprocessManager:
                         # JSON 파싱
                         data = json.loads(output.strip())
                         self.cnc_data = data
+                        if self.register is not None:
+                            self.register.publish(self.name, data, time.monotonic())
                     except json.JSONDecodeError as e:
                         print(f"⚠️ CNC JSON 파싱 오류: {e}, 출력: {output[:100]}")
                     except Exception as e:
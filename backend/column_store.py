@@ -0,0 +1,237 @@
+"""
+열 단위 기록 형식 - 기록 세션을 열별 NumPy 바이너리 파일 + JSON 헤더로 저장
+세션 폴더 "{시각}.columns/" 구성:
+    header.json     형식/버전, 열 이름과 dtype, 기록된 행 수, 첫/마지막 시각
+    {열 이름}.bin   열 값을 dtype 그대로 이어 붙인 파일 (행 그룹마다 append)
+행 그룹을 쓴 뒤 헤더의 행 수를 원자적으로 갱신하므로 기록 중에도 헤더 행 수까지는 항상 읽을 수 있고,
+읽을 때는 np.memmap으로 바로 열려 세션 길이와 관계없이 즉시 분석 가능 (CSV는 export_csv로 내보내기)
+
+사용법:
+    python -m backend.column_store info DB/공정시작_20250827_103906/20250827_103906.columns
+    python -m backend.column_store export DB/.../20250827_103906.columns --output out.csv
+"""
+import argparse
+import json
+import math
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backend.csv_writer import RecordingWriter
+
+FORMAT_NAME = "hbnu-columns"
+FORMAT_VERSION = 1
+HEADER_FILE = "header.json"
+SESSION_SUFFIX = ".columns"
+# CSV 내보내기 기본 파일 이름 접미사 (기록 CSV "{시각}.csv"와 구분)
+EXPORT_SUFFIX = ".export.csv"
+# 시각 열 dtype (로컬 시각, 밀리초)
+TIME_DTYPE = "datetime64[ms]"
+
+
+def _time_column(values: List[Any]) -> np.ndarray:
+    """"%Y-%m-%d %H:%M:%S.%f" 문자열 → datetime64[ms] (빈 값/형식 오류는 NaT)"""
+    values = [value or "NaT" for value in values]
+    try:
+        return np.array(values, dtype=TIME_DTYPE)
+    except ValueError:
+        column = np.full(len(values), np.datetime64("NaT"), dtype=TIME_DTYPE)
+        for i, value in enumerate(values):
+            try:
+                column[i] = np.datetime64(value, "ms")
+            except ValueError:
+                pass
+        return column
+
+
+def _float_column(values: List[Any]) -> np.ndarray:
+    """값 목록 → float64 (None/숫자가 아닌 값은 NaN)"""
+    try:
+        return np.array([math.nan if value is None else value for value in values], dtype=np.float64)
+    except (TypeError, ValueError):
+        column = np.full(len(values), math.nan)
+        for i, value in enumerate(values):
+            try:
+                column[i] = float(value)
+            except (TypeError, ValueError):
+                pass
+        return column
+
+
+def _to_column(values: List[Any], dtype: str) -> np.ndarray:
+    if dtype == TIME_DTYPE:
+        return _time_column(values)
+    if dtype == "bool":
+        return np.array([bool(value) for value in values], dtype=np.bool_)
+    return _float_column(values)
+
+
+def _format_time(value: np.datetime64) -> Optional[str]:
+    """datetime64 → "%Y-%m-%d %H:%M:%S.%f"(밀리초) 문자열 (NaT는 None)"""
+    if np.isnat(value):
+        return None
+    return str(value).replace("T", " ")
+
+
+class ColumnStoreWriter(RecordingWriter):
+    """열 단위 기록 (기록 스레드가 행 묶음을 열별 배열로 바꿔 각 열 파일에 append)"""
+
+    FORMAT = "columns"
+
+    def __init__(self, folder: str, columns: Dict[str, str], queue_size: int = 10000,
+                 flush_interval: float = 1.0, batch_size: int = 500):
+        """
+        Args:
+            columns: 열 이름 → dtype ("datetime64[ms]" / "bool" / "float64"), 행 dict에서 이 이름으로 값을 꺼냄
+            나머지는 RecordingWriter와 같음 (세션 폴더 이름은 생성 시각 "%Y%m%d_%H%M%S.columns", 교체 없음)
+        """
+        super().__init__(folder, queue_size=queue_size, flush_interval=flush_interval, batch_size=batch_size)
+        self.columns = dict(columns)
+        self._files: Dict[str, Any] = {}
+        self._header: Dict[str, Any] = {}
+
+    def _open_file(self) -> str:
+        path = self._new_path(SESSION_SUFFIX)
+        os.makedirs(path, exist_ok=True)
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "ab") for name in self.columns}
+        self._header = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "created": datetime.now().isoformat(),
+            "columns": [{"name": name, "dtype": dtype, "file": f"{name}.bin"} for name, dtype in self.columns.items()],
+            "rows": 0,
+            "first_timestamp": None,
+            "last_timestamp": None,
+            "closed": False
+        }
+        self.path = path
+        self._write_header()
+        return path
+
+    def _write_header(self):
+        """헤더 원자적 갱신 (임시 파일에 쓰고 교체)"""
+        header_path = os.path.join(self.path, HEADER_FILE)
+        with open(header_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self._header, f, ensure_ascii=False, indent=2)
+        os.replace(header_path + ".tmp", header_path)
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        # 행 그룹: 모든 열 파일에 append한 뒤 헤더의 행 수 갱신
+        times = None
+        for name, dtype in self.columns.items():
+            column = _to_column([row.get(name) for row in rows], dtype)
+            self._files[name].write(column.tobytes())
+            if name == "timestamp":
+                times = column
+        for f in self._files.values():
+            f.flush()
+
+        header = self._header
+        header["rows"] += len(rows)
+        if times is not None and len(times):
+            if header["first_timestamp"] is None:
+                header["first_timestamp"] = _format_time(times[0])
+            header["last_timestamp"] = _format_time(times[-1])
+        self._write_header()
+
+    def _close_file(self):
+        if not self._files:
+            return
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        self._header["closed"] = True
+        self._write_header()
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """세션 헤더 읽기"""
+    with open(os.path.join(path, HEADER_FILE), encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"열 단위 기록 세션이 아닙니다: {path}")
+    return header
+
+
+def open_session(path: str, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """세션 열기 → 열 이름별 읽기 전용 memmap 배열 (헤더에 기록된 행 수까지)"""
+    header = read_header(path)
+    rows = int(header["rows"])
+    wanted = set(columns) if columns is not None else None
+    result = {}
+    for column in header["columns"]:
+        name = column["name"]
+        if wanted is not None and name not in wanted:
+            continue
+        dtype = np.dtype(column["dtype"])
+        file_path = os.path.join(path, column["file"])
+        # 기록 중 헤더 갱신 전에 append된 바이트는 제외
+        count = min(rows, os.path.getsize(file_path) // dtype.itemsize)
+        if count == 0:
+            result[name] = np.empty(0, dtype=dtype)
+        else:
+            result[name] = np.memmap(file_path, dtype=dtype, mode="r", shape=(count,))
+    return result
+
+
+def load_dataframe(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """세션 → pandas DataFrame (열 순서는 헤더 순서)"""
+    data = open_session(path, columns)
+    rows = min((len(values) for values in data.values()), default=0)
+    return pd.DataFrame({name: np.asarray(values[:rows]) for name, values in data.items()})
+
+
+def export_csv(path: str, csv_path: Optional[str] = None, columns: Optional[Sequence[str]] = None,
+               chunk_rows: int = 100000) -> str:
+    """세션 → CSV 내보내기 (기존 기록 CSV와 같은 시각 형식, 빈 값은 빈 칸) → CSV 경로
+
+    csv_path 생략 시 세션 폴더 옆 "{시각}.export.csv" (같은 초에 시작한 기록 CSV "{시각}.csv"와 겹치지 않음),
+    이 기본 경로에 파일이 이미 있으면 덮어쓰지 않고 FileExistsError (덮어쓰려면 csv_path로 직접 지정)
+    """
+    header = read_header(path)
+    names = [column["name"] for column in header["columns"]]
+    if columns is not None:
+        names = [name for name in columns if name in names]
+    if csv_path is None:
+        csv_path = os.path.splitext(path.rstrip(os.sep))[0] + EXPORT_SUFFIX
+        if os.path.exists(csv_path):
+            raise FileExistsError(f"이미 있는 파일입니다: {csv_path} (덮어쓰려면 --output으로 직접 지정)")
+
+    data = open_session(path, names)
+    rows = min((len(values) for values in data.values()), default=0)
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        for start in range(0, max(rows, 1), chunk_rows):
+            chunk = {}
+            for name in names:
+                values = np.asarray(data[name][start:start + chunk_rows])
+                if values.dtype.kind == "M":
+                    values = [_format_time(value) for value in values]
+                chunk[name] = values
+            pd.DataFrame(chunk, columns=names).to_csv(f, index=False, header=start == 0, na_rep="")
+    return csv_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="열 단위 기록 세션 조회/CSV 내보내기")
+    parser.add_argument("command", choices=("info", "export"))
+    parser.add_argument("path", help="세션 폴더 (*.columns)")
+    parser.add_argument("--output", help="내보낼 CSV 경로 (기본: 세션 폴더 옆 {시각}.export.csv, 이미 있으면 중단)")
+    parser.add_argument("--columns", help="내보낼 열 (쉼표 구분, 기본: 전체)")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        print(json.dumps(read_header(args.path), ensure_ascii=False, indent=2))
+        return
+    columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+    try:
+        print(f"📄 CSV 내보내기 완료: {export_csv(args.path, args.output, columns)}")
+    except FileExistsError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
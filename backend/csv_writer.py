@@ -0,0 +1,252 @@
+"""
+기록 스레드 - 기록 중인 정규화 행을 전용 스레드 하나에서 순서대로 파일에 기록
+수집 루프는 제한된 큐에 행을 넣기만 하고(대기 없음), 기록 스레드가 열린 파일 핸들에
+flush_interval 동안 쌓인 행을 한 번에 쓰고 디스크로 내보내며, 정해진 주기마다 새 파일로 교체
+RecordingWriter가 스레드/큐를 담당하고, 형식별 클래스(CsvWriter, column_store.ColumnStoreWriter)가 파일 쓰기를 담당
+"""
+import csv
+import io
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.metrics import METRICS
+
+_WRITE_SECONDS = METRICS.histogram("hbnu_recording_write_seconds", "기록 스레드의 묶음 쓰기 + flush 시간",
+                                   ("format",))
+_ROWS_WRITTEN = METRICS.counter("hbnu_recording_rows_written_total", "기록 파일에 쓴 행 수", ("format",))
+_ROWS_DROPPED = METRICS.counter("hbnu_recording_rows_dropped_total", "기록 큐가 가득 차 버린 행 수", ("format",))
+
+# 기록 종료 표시
+_STOP = object()
+
+
+class RecordingWriter(ABC):
+    """기록 스레드 공통 (제한된 큐 + 묶음 쓰기 + 주기적 파일 교체), 형식별 클래스가 _open_file/_write_rows/_close_file 구현"""
+
+    FORMAT = ""
+    # 주기적 파일 교체 시 새 파일 경로 출력 여부
+    LOG_ROTATION = True
+
+    def __init__(self, folder: str, queue_size: int = 10000, flush_interval: float = 1.0,
+                 batch_size: int = 500, rotate_seconds: float = 0.0):
+        """
+        Args:
+            folder: 기록 파일을 만들 폴더
+            queue_size: 기록 대기 큐 최대 행 수 (가득 차면 새 행을 버리고 집계)
+            flush_interval: 대기 중인 행을 모아 기록하고 디스크로 내보내는 주기 (초)
+            batch_size: 이 행 수 이상 쌓이면 주기를 기다리지 않고 바로 기록
+            rotate_seconds: 새 파일로 교체하는 주기 (초, 0이면 교체 안 함)
+        """
+        self.folder = folder
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.batch_size = max(1, int(batch_size))
+        self.rotate_seconds = max(0.0, float(rotate_seconds))
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._rotate_at = 0.0
+        self._write_seconds = _WRITE_SECONDS.labels(format=self.FORMAT)
+        self._rows_written = _ROWS_WRITTEN.labels(format=self.FORMAT)
+        self._rows_dropped = _ROWS_DROPPED.labels(format=self.FORMAT)
+
+        self.path: Optional[str] = None
+        self.files: List[str] = []
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.batches_written = 0
+        self.last_batch_rows = 0
+        self.max_queue_depth = 0
+        self.last_write_ms = 0.0
+        self.max_write_ms = 0.0
+        self.error: Optional[str] = None
+
+    def start(self) -> str:
+        """첫 파일을 열고 기록 스레드 시작 → 첫 파일 경로"""
+        os.makedirs(self.folder, exist_ok=True)
+        self._rotate()
+        self._thread = threading.Thread(target=self._run, name=f"{self.FORMAT}-writer", daemon=True)
+        self._thread.start()
+        return self.path
+
+    def write(self, row: Dict[str, Any]) -> bool:
+        """행 추가 (수집 루프에서 호출, 대기 없음), 큐가 가득 차 버렸으면 False"""
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.rows_dropped += 1
+            self._rows_dropped.inc()
+            return False
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        if depth >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        """남은 행을 모두 기록하고 파일을 닫음 (블로킹, 이벤트 루프에서는 executor로 호출)"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """지금까지 넣은 행이 모두 파일에 기록될 때까지 대기 (블로킹, 이벤트 루프에서는 executor로 호출)"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        self._wake.set()
+        return done.wait(timeout)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _new_path(self, suffix: str) -> str:
+        """생성 시각 기반 파일 이름 "%Y%m%d_%H%M%S{suffix}" (같은 초에 교체되면 번호 추가)"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.folder, f"{timestamp}{suffix}")
+        if path in self.files:
+            path = os.path.join(self.folder, f"{timestamp}_{len(self.files)}{suffix}")
+        return path
+
+    def _rotate(self):
+        self._close_file()
+        self.path = self._open_file()
+        self.files.append(self.path)
+        if self.rotate_seconds:
+            self._rotate_at = time.monotonic() + self.rotate_seconds
+
+    @abstractmethod
+    def _open_file(self) -> str:
+        """새 기록 파일 열기 → 경로"""
+
+    @abstractmethod
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        """행 묶음 쓰기 + flush"""
+
+    @abstractmethod
+    def _close_file(self):
+        """열린 기록 파일 닫기 (열린 파일이 없으면 무시)"""
+
+    def _run(self):
+        stopping = False
+
+        while not stopping:
+            # flush_interval마다 (또는 batch_size 이상 쌓이거나 종료 요청 시) 대기 중인 행을 한 번에 기록
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            rows = []
+            barriers = []
+            try:
+                while True:
+                    item = self._queue.get_nowait()
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    if isinstance(item, threading.Event):
+                        # flush() 대기: 앞서 넣은 행을 이번 묶음에서 기록한 뒤 알림
+                        barriers.append(item)
+                        continue
+                    rows.append(item)
+            except queue.Empty:
+                pass
+
+            try:
+                if self.rotate_seconds and time.monotonic() >= self._rotate_at:
+                    self._rotate()
+                    if self.LOG_ROTATION:
+                        print(f"📄 새 기록 파일 생성: {self.path}")
+                if not rows:
+                    continue
+
+                started = time.perf_counter()
+                self._write_rows(rows)
+                elapsed = time.perf_counter() - started
+
+                self.rows_written += len(rows)
+                self.batches_written += 1
+                self.last_batch_rows = len(rows)
+                self._rows_written.inc(len(rows))
+                self._write_seconds.observe(elapsed)
+                self.last_write_ms = elapsed * 1000.0
+                self.max_write_ms = max(self.max_write_ms, self.last_write_ms)
+            except Exception as e:
+                self.error = str(e)
+                print(f"❌ {self.FORMAT} 기록 오류: {e}")
+            finally:
+                for barrier in barriers:
+                    barrier.set()
+
+        try:
+            self._close_file()
+        except Exception as e:
+            self.error = str(e)
+            print(f"❌ {self.FORMAT} 기록 파일 닫기 오류: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "files": len(self.files),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "batches": self.batches_written,
+            "last_batch_rows": self.last_batch_rows,
+            "last_write_ms": round(self.last_write_ms, 3),
+            "max_write_ms": round(self.max_write_ms, 3),
+            "error": self.error
+        }
+
+
+class CsvWriter(RecordingWriter):
+    """CSV 기록 (열린 파일 핸들에 묶음 단위로 한 번에 쓰기, rotate_seconds마다 새 CSV 파일)"""
+
+    FORMAT = "csv"
+
+    def __init__(self, folder: str, fieldnames: Sequence[str], queue_size: int = 10000,
+                 flush_interval: float = 1.0, batch_size: int = 500, rotate_seconds: float = 3600.0):
+        """
+        Args:
+            fieldnames: CSV 열 (행 dict에서 이 순서대로 값을 꺼냄)
+            나머지는 RecordingWriter와 같음 (파일 이름은 생성 시각 "%Y%m%d_%H%M%S.csv")
+        """
+        super().__init__(folder, queue_size=queue_size, flush_interval=flush_interval,
+                         batch_size=batch_size, rotate_seconds=rotate_seconds)
+        self.fieldnames = list(fieldnames)
+        self._file = None
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer)
+
+    def _open_file(self) -> str:
+        path = self._new_path(".csv")
+        exists = os.path.exists(path)
+        self._file = open(path, 'a', newline='', encoding='utf-8', buffering=1 << 20)
+        if not exists:
+            csv.writer(self._file).writerow(self.fieldnames)
+        return path
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        fieldnames = self.fieldnames
+        self._csv.writerows([[row.get(field) for field in fieldnames] for row in rows])
+        self._file.write(self._buffer.getvalue())
+        self._file.flush()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
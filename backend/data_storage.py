@@ -3,32 +3,79 @@
 기존 CSV 저장 로직을 백엔드로 이동
 """
 import os
-import csv
 import json
+import time
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from collections import deque
+from typing import Dict, List, Optional, Any, Sequence
 import pandas as pd
 import cv2
 import numpy as np
 
+from backend.sensor_registry import SensorRegistry, build_default_registry
+from backend.metrics import METRICS, STAGE_SECONDS
+from backend.csv_writer import CsvWriter, RecordingWriter
+from backend.column_store import ColumnStoreWriter, TIME_DTYPE
+from backend.history_ring import HistoryRing
+from backend.downsample import METHODS as DOWNSAMPLE_METHODS, downsample
+from backend.temp_log import TempSegmentLog
+
+_NORMALIZE_SECONDS = STAGE_SECONDS.labels(stage="normalize")
+_ROWS_STORED = METRICS.counter("hbnu_rows_stored_total", "히스토리에 저장된 정규화 행 수")
+_QUEUE_DEPTH = METRICS.gauge("hbnu_recording_queue_depth", "기록 큐에 대기 중인 행 수", ("format",))
+
+# 기록 형식: csv(기존 CSV, 주기적 파일 교체) / columns(열 단위 NumPy 파일 + JSON 헤더, backend/column_store.py)
+RECORD_FORMATS = ("columns", "csv")
+# 로컬 시각 → UNIX 시각 변환 시 UTC 오프셋을 한 번씩 계산하는 칸 크기 (오프셋은 15분 단위 경계에서만 바뀜)
+_OFFSET_SLOT_MS = 15 * 60 * 1000
+
 
 class DataStorage:
     """센서 데이터 저장 및 관리 클래스"""
     
-    def __init__(self, max_history_size: int = 5000):
+    # 기록 CSV 기본 열
+    CSV_BASE_FIELDS = (
+        "timestamp",
+        "curpos_x", "curpos_y", "curpos_z", "curpos_a", "curpos_c",
+        "mpt", "melt_pool_area", "outpower", "setpower"
+    )
+    
+    def __init__(self, max_history_size: int = 5000, registry: Optional[SensorRegistry] = None,
+                 csv_queue_size: int = 10000, csv_flush_interval: float = 1.0,
+                 csv_rotate_seconds: float = 3600.0, record_formats: Sequence[str] = RECORD_FORMATS,
+                 temp_retention_seconds: float = 1800.0, temp_segment_seconds: float = 60.0):
+        """
+        Args:
+            max_history_size: 메모리 히스토리 최대 행 수 (구조체 배열 링 버퍼로 미리 할당, 행당 약 130바이트)
+            registry: 센서 플러그인 레지스트리 (정규화/CSV 열 구성)
+            csv_queue_size: 형식별 기록 큐 최대 행 수
+            csv_flush_interval: 기록 파일을 디스크로 내보내는 주기 (초)
+            csv_rotate_seconds: 새 CSV 파일로 교체하는 주기 (초)
+            record_formats: 기록 형식 ("columns", "csv" 중 하나 이상)
+            temp_retention_seconds: 임시 저장(자동저장) 보관 시간 (초, 이후 세션 자동 정리)
+            temp_segment_seconds: 임시 저장 디스크 세그먼트 길이 (초)
+        """
         self.max_history_size = max_history_size
-        self.data_history = deque(maxlen=max_history_size)
         
         # 저장 관련 상태
         self.is_saving = False
-        self.current_save_path = None
         self.save_folder = None
-        self.save_task = None
+        self.recorders: Dict[str, RecordingWriter] = {}
+        self.csv_queue_size = csv_queue_size
+        self.csv_flush_interval = csv_flush_interval
+        self.csv_rotate_seconds = csv_rotate_seconds
+        unknown = set(record_formats) - set(RECORD_FORMATS)
+        if unknown or not record_formats:
+            raise ValueError(f"지원하지 않는 기록 형식: {sorted(unknown) or '(없음)'} (사용 가능: {', '.join(RECORD_FORMATS)})")
+        self.record_formats = tuple(record_formats)
+        for record_format in RECORD_FORMATS:
+            _QUEUE_DEPTH.labels(format=record_format).callback = (
+                lambda f=record_format: self.recorders[f].queue_depth if f in self.recorders else 0)
         
-        # 임시 저장 관련 (자동저장 데이터 보관)
-        self.temp_storage = deque(maxlen=10000)  # 최대 10,000개 데이터 보관
+        # 임시 저장 관련 (자동저장 데이터를 디스크 세그먼트 로그에 보관, 메모리에는 기록 대기 행만 유지)
+        self.temp_storage: Optional[TempSegmentLog] = None
+        self.temp_retention_seconds = temp_retention_seconds
+        self.temp_segment_seconds = temp_segment_seconds
         self.temp_storage_start_time = None
         self.temp_storage_session_id = None
         self.temp_storage_cleanup_task = None
@@ -46,12 +93,22 @@ class DataStorage:
         # 이미지 저장 경로 설정
         self.images_path = os.path.join(os.path.dirname(__file__), "images")
         os.makedirs(self.images_path, exist_ok=True)
+        
+        # 센서 레지스트리 기반 정규화 열 구성
+        self.registry = registry or build_default_registry()
+        self._build_normalize_plan()
+        
+        # 히스토리: 정규화 열 dtype 그대로 미리 할당한 링 버퍼
+        self.data_history = HistoryRing(self.column_types, max_history_size)
     
     def store_data(self, sensor_data: Dict[str, Any]):
         """센서 데이터를 히스토리에 저장"""
         try:
             # 데이터 정규화
+            started = time.perf_counter()
             normalized_data = self._normalize_data(sensor_data)
+            _NORMALIZE_SECONDS.observe(time.perf_counter() - started)
+            _ROWS_STORED.inc()
             
             # 히스토리에 추가
             self.data_history.append(normalized_data)
@@ -59,79 +116,72 @@ class DataStorage:
             # 이미지 저장 처리
             asyncio.create_task(self._save_images_async(normalized_data))
             
-            # 저장 중이면 CSV에 추가
-            if self.is_saving and self.save_folder:
-                asyncio.create_task(self._save_to_csv_async(normalized_data))
+            # 저장 중이면 형식별 기록 큐에 추가 (기록 스레드가 순서대로 묶어서 기록)
+            if self.is_saving:
+                for recorder in self.recorders.values():
+                    recorder.write(normalized_data)
             
             # 임시 저장 중이면 임시 스토리지에 추가
-            if self.temp_storage_session_id:
-                self.temp_storage.append(normalized_data)
+            if self.temp_storage_session_id and self.temp_storage:
+                self.temp_storage.write(normalized_data)
                 
         except Exception as e:
             print(f"❌ 데이터 저장 오류: {e}")
     
+    def _build_normalize_plan(self):
+        """레지스트리에서 정규화 열 구성 (센서 추가 시 코드 변경 없이 열이 늘어남)"""
+        template = {
+            "timestamp": "",
+            "time_elapsed": 0.0
+        }
+        plan = []
+        
+        for plugin in self.registry:
+            if not plugin.data_key or not (plugin.columns or plugin.flags):
+                continue
+            for column in plugin.columns.values():
+                template[column] = None
+            for column in plugin.flags:
+                template[column] = False
+            plan.append((plugin.data_key, tuple(plugin.columns.items()), tuple(plugin.flags.items())))
+        
+        # HikRobot 2대 합성 이미지
+        template["hik_image_available"] = False
+        
+        self._normalize_template = template
+        self._normalize_plan = plan
+        
+        # 열 단위 기록 dtype: 시각 / 플래그(bool) / 나머지 실수
+        self.column_types = {
+            name: TIME_DTYPE if name == "timestamp" else "bool" if value is False else "float64"
+            for name, value in template.items()
+        }
+        
+        # 기록 CSV 열: 기존 열 + 추가 등록된 센서 인스턴스의 열
+        self.csv_fields = list(self.CSV_BASE_FIELDS)
+        for plugin in self.registry:
+            if plugin.name != plugin.kind:
+                self.csv_fields.extend(plugin.columns.values())
+    
     def _normalize_data(self, sensor_data: Dict[str, Any]) -> Dict[str, Any]:
         """센서 데이터를 정규화"""
-        normalized = {
-            "timestamp": sensor_data.get("timestamp", ""),
-            "time_elapsed": 0.0,
-            "curpos_x": None,
-            "curpos_y": None,
-            "curpos_z": None,
-            "curpos_a": None,
-            "curpos_c": None,
-            "mpt": None,  # melt pool temperature
-            "1ct": None,  # 1-color temperature
-            "2ct": None,  # 2-color temperature
-            "outpower": None,
-            "setpower": None,
-            "melt_pool_area": None,
-            "image_available": False,
-            "hik_image_available": False
-        }
+        normalized = dict(self._normalize_template)
+        normalized["timestamp"] = sensor_data.get("timestamp", "")
         
-        # CNC 데이터 처리
-        if sensor_data.get("cnc_data"):
-            cnc_data = sensor_data["cnc_data"]
-            normalized.update({
-                "curpos_x": cnc_data.get("curpos_x"),
-                "curpos_y": cnc_data.get("curpos_y"),
-                "curpos_z": cnc_data.get("curpos_z"),
-                "curpos_a": cnc_data.get("curpos_a"),
-                "curpos_c": cnc_data.get("curpos_c")
-            })
-        
-        # 레이저 데이터 처리
-        if sensor_data.get("laser_data"):
-            laser_data = sensor_data["laser_data"]
-            normalized.update({
-                "outpower": laser_data.get("outpower"),
-                "setpower": laser_data.get("setpower")
-            })
-        
-        # Pyrometer 데이터 처리
-        if sensor_data.get("pyrometer_data"):
-            pyro_data = sensor_data["pyrometer_data"]
-            normalized.update({
-                "mpt": pyro_data.get("mpt"),
-                "1ct": pyro_data.get("1ct"),
-                "2ct": pyro_data.get("2ct")
-            })
-        
-        # 카메라 데이터 처리
-        if sensor_data.get("camera_data"):
-            camera_data = sensor_data["camera_data"]
-            normalized.update({
-                "melt_pool_area": camera_data.get("melt_pool_area"),
-                "image_available": camera_data.get("image") is not None
-            })
+        # 레지스트리 순서대로 센서별 열 채우기
+        for data_key, columns, flags in self._normalize_plan:
+            data = sensor_data.get(data_key)
+            if not data:
+                continue
+            for channel, column in columns:
+                normalized[column] = data.get(channel)
+            for column, field in flags:
+                normalized[column] = data.get(field) is not None
         
         # HikRobot 카메라 데이터 처리
         if sensor_data.get("hik_camera_data"):
             hik_data = sensor_data["hik_camera_data"]
-            normalized.update({
-                "hik_image_available": hik_data.get("combined_image") is not None
-            })
+            normalized["hik_image_available"] = bool(hik_data.get("hik_image_available"))
         
         return normalized
     
@@ -157,50 +207,17 @@ class DataStorage:
         except Exception as e:
             print(f"⚠️ 이미지 저장 오류: {e}")
     
-    async def _save_to_csv_async(self, data: Dict[str, Any]):
-        """CSV 파일에 데이터 저장 (비동기)"""
-        try:
-            if not self.current_save_path:
-                return
-            
-            # CSV에 저장할 데이터 준비
-            csv_data = {
-                "timestamp": data["timestamp"],
-                "curpos_x": data["curpos_x"],
-                "curpos_y": data["curpos_y"],
-                "curpos_z": data["curpos_z"],
-                "curpos_a": data["curpos_a"],
-                "curpos_c": data["curpos_c"],
-                "mpt": data["mpt"],
-                "melt_pool_area": data["melt_pool_area"],
-                "outpower": data["outpower"],
-                "setpower": data["setpower"]
-            }
-            
-            # CSV 파일에 추가
-            file_exists = os.path.exists(self.current_save_path)
-            
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None, self._write_csv_row, self.current_save_path, csv_data, file_exists
-            )
-            
-        except Exception as e:
-            print(f"⚠️ CSV 저장 오류: {e}")
+    @property
+    def current_save_path(self) -> Optional[str]:
+        """현재 기록 중인 파일 (CSV 기록 시 CSV 파일, 주기적으로 새 파일로 교체됨 / 아니면 열 단위 세션 폴더)"""
+        recorder = self.recorders.get("csv") or next(iter(self.recorders.values()), None)
+        return recorder.path if recorder else None
     
-    def _write_csv_row(self, filepath: str, data: Dict, file_exists: bool):
-        """CSV 파일에 행 추가 (동기 함수)"""
-        try:
-            with open(filepath, 'a', newline='', encoding='utf-8') as csvfile:
-                fieldnames = list(data.keys())
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                if not file_exists:
-                    writer.writeheader()
-                
-                writer.writerow(data)
-        except Exception as e:
-            print(f"❌ CSV 쓰기 오류: {e}")
+    def get_writer_stats(self) -> Optional[Dict[str, Any]]:
+        """형식별 기록 스레드 통계 (큐 길이, 기록 행 수, 쓰기 시간)"""
+        if not self.recorders:
+            return None
+        return {record_format: recorder.get_stats() for record_format, recorder in self.recorders.items()}
     
     async def start_saving(self, folder_name: str) -> str:
         """데이터 저장 시작"""
@@ -222,24 +239,35 @@ class DataStorage:
             os.makedirs(self.image_save_dir, exist_ok=True)
             os.makedirs(self.hik_save_dir, exist_ok=True)
             
-            # CSV 파일 경로 설정
-            self.current_save_path = os.path.join(
-                self.save_folder, 
-                f"{timestamp}.csv"
-            )
+            # 형식별 기록 스레드 시작 (CSV는 rotate_seconds마다 새 파일로 교체)
+            if "columns" in self.record_formats:
+                self.recorders["columns"] = ColumnStoreWriter(
+                    self.save_folder, self.column_types,
+                    queue_size=self.csv_queue_size,
+                    flush_interval=self.csv_flush_interval
+                )
+            if "csv" in self.record_formats:
+                self.recorders["csv"] = CsvWriter(
+                    self.save_folder, self.csv_fields,
+                    queue_size=self.csv_queue_size,
+                    flush_interval=self.csv_flush_interval,
+                    rotate_seconds=self.csv_rotate_seconds
+                )
+            for recorder in self.recorders.values():
+                recorder.start()
             
             self.is_saving = True
             self.frame_id = 0
             self.last_hik_save = 0
             
-            # 1시간마다 새 CSV 파일 생성하는 태스크 시작
-            self.save_task = asyncio.create_task(self._csv_rotation_task())
-            
             print(f"✅ 데이터 저장 시작: {self.save_folder}")
             return self.save_folder
             
         except Exception as e:
             self.is_saving = False
+            for recorder in self.recorders.values():
+                recorder.stop()
+            self.recorders = {}
             raise Exception(f"저장 시작 실패: {str(e)}")
     
     async def stop_saving(self):
@@ -250,15 +278,14 @@ class DataStorage:
         try:
             self.is_saving = False
             
-            # CSV 로테이션 태스크 정지
-            if self.save_task:
-                self.save_task.cancel()
-                try:
-                    await self.save_task
-                except asyncio.CancelledError:
-                    pass
+            # 남은 행을 모두 기록하고 파일 닫기 (기록 스레드 종료 대기)
+            recorders, self.recorders = self.recorders, {}
+            loop = asyncio.get_running_loop()
+            for record_format, recorder in recorders.items():
+                await loop.run_in_executor(None, recorder.stop)
+                stats = recorder.get_stats()
+                print(f"📄 {record_format} 기록 완료: {stats['rows_written']}행, 파일 {stats['files']}개, 버린 행 {stats['rows_dropped']}")
             
-            self.current_save_path = None
             self.save_folder = None
             self.image_save_dir = None
             self.hik_save_dir = None
@@ -268,41 +295,111 @@ class DataStorage:
         except Exception as e:
             raise Exception(f"저장 중지 실패: {str(e)}")
     
-    async def _csv_rotation_task(self):
-        """1시간마다 새 CSV 파일 생성"""
-        while self.is_saving:
-            try:
-                # 1시간 대기
-                await asyncio.sleep(3600)
-                
-                if self.is_saving and self.save_folder:
-                    # 새 CSV 파일 생성
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    self.current_save_path = os.path.join(
-                        self.save_folder, 
-                        f"{timestamp}.csv"
-                    )
-                    print(f"📄 새 CSV 파일 생성: {self.current_save_path}")
-                    
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                print(f"⚠️ CSV 로테이션 오류: {e}")
-    
     def get_latest_data(self) -> Optional[Dict[str, Any]]:
         """최신 데이터 조회"""
-        if self.data_history:
-            return dict(self.data_history[-1])
-        return None
+        return self.data_history.latest()
     
     def get_history_data(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """히스토리 데이터 조회"""
-        if not self.data_history:
-            return []
+        """히스토리 데이터 조회 (최근 limit개, 링 버퍼 뷰에서 limit행만 변환)"""
+        return self.data_history.to_records(self.data_history.tail(limit))
+    
+    @staticmethod
+    def _to_history_time(value: Any) -> np.datetime64:
+        """UNIX 시각(초) 또는 ISO 형식 로컬 시각 문자열 → 히스토리 timestamp와 같은 로컬 datetime64[ms]"""
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            seconds = None
+        if seconds is not None:
+            try:
+                return np.datetime64(datetime.fromtimestamp(seconds), "ms")
+            except (ValueError, OverflowError, OSError):
+                # NaN/Inf, 플랫폼 time_t 범위를 벗어난 값 (예: 1e20)
+                raise ValueError(f"범위를 벗어난 UNIX 시각입니다: {value}")
+        try:
+            return np.datetime64(datetime.fromisoformat(str(value)), "ms")
+        except ValueError:
+            raise ValueError(f"잘못된 시각입니다: {value} (UNIX 시각(초) 또는 ISO 형식)")
+    
+    @staticmethod
+    def _to_epoch(times: np.ndarray) -> np.ndarray:
+        """로컬 datetime64[ms] 배열 → UNIX 시각(초) 배열 (NaT는 NaN)
+        
+        UTC 오프셋은 행마다 그 시각의 값을 적용 (구간이 서머타임 전환을 걸쳐도 정확),
+        오프셋은 15분 단위 경계에서만 바뀌므로 구간 안의 서로 다른 15분 칸마다 한 번씩만 time.mktime으로 계산
+        """
+        epoch = np.full(len(times), np.nan)
+        valid = ~np.isnat(times)
+        local_ms = times[valid].view(np.int64)
+        if len(local_ms):
+            slots, inverse = np.unique(local_ms // _OFFSET_SLOT_MS, return_inverse=True)
+            offsets = np.empty(len(slots), dtype=np.float64)
+            for i, slot in enumerate(slots.tolist()):
+                local_seconds = slot * _OFFSET_SLOT_MS // 1000
+                # 로컬 벽시계 시각을 mktime에 넣어 (서머타임 여부는 mktime이 판단) 그 시각의 UTC 오프셋 계산
+                offsets[i] = local_seconds - time.mktime(time.gmtime(local_seconds)[:8] + (-1,))
+            epoch[valid] = local_ms / 1000.0 - offsets[inverse.reshape(-1)]
+        return epoch
+    
+    def query_history(self, start: Any = None, end: Any = None, seconds: Optional[float] = None,
+                      max_points: Optional[int] = None, method: str = "minmax",
+                      channels: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """히스토리 시간 구간 조회 (채널별 다운샘플)
+        
+        Args:
+            start, end: 구간 [start, end] (UNIX 시각(초) 또는 ISO 형식 로컬 시각, 생략 시 처음/끝까지)
+            seconds: start 생략 시 최신 행 기준 최근 N초
+            max_points: 구간 행 수가 이보다 많으면 채널별로 이 개수 안팎의 점으로 다운샘플
+            method: 다운샘플 방식 minmax(버킷별 최소/최대) / lttb
+            channels: 조회할 채널 (기본: 모든 숫자 열)
+        
+        Returns:
+            {"count": 구간 행 수, "start"/"end": 구간 첫/마지막 UNIX 시각, "downsample": 적용한 방식 또는 None,
+             "channels": {채널: {"timestamp": UNIX 시각 배열, "values": 값 배열}}} (NumPy 배열, NaN은 null로 직렬화)
+        """
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"지원하지 않는 다운샘플 방식입니다: {method} (가능: {', '.join(DOWNSAMPLE_METHODS)})")
+        if max_points is not None and max_points < 3:
+            raise ValueError(f"max_points는 3 이상이어야 합니다: {max_points}")
+        
+        numeric = [name for name, dtype in self.column_types.items() if dtype == "float64"]
+        if channels:
+            unknown = [name for name in channels if name not in numeric]
+            if unknown:
+                raise ValueError(f"알 수 없는 채널입니다: {', '.join(unknown)} (가능: {', '.join(numeric)})")
+            numeric = list(channels)
+        
+        start_time = self._to_history_time(start) if start is not None else None
+        end_time = self._to_history_time(end) if end is not None else None
+        if start_time is None and seconds is not None:
+            latest = self.data_history.tail(1)
+            if len(latest):
+                start_time = latest["timestamp"][0] - np.timedelta64(int(seconds * 1000), "ms")
         
-        # 최근 limit개 데이터 반환
-        recent_data = list(self.data_history)[-limit:]
-        return [dict(item) for item in recent_data]
+        # 구간 행은 링 버퍼 뷰 (응답 직렬화까지 같은 이벤트 루프 틱 안에서만 사용)
+        rows = self.data_history.range(start_time, end_time)
+        times = rows["timestamp"]
+        epoch = self._to_epoch(times)
+        
+        downsampled = max_points is not None and len(rows) > max_points
+        result = {}
+        for name in numeric:
+            values = rows[name]
+            if downsampled:
+                # 구조체 배열 열은 행 간격으로 띄엄띄엄 놓인 뷰이므로 연속 배열로 복사한 뒤 계산
+                values = np.ascontiguousarray(values)
+                indices = downsample(epoch, values, max_points, method)
+                result[name] = {"timestamp": epoch[indices], "values": values[indices]}
+            else:
+                result[name] = {"timestamp": epoch, "values": values}
+        
+        return {
+            "count": int(len(rows)),
+            "start": float(epoch[0]) if len(rows) else None,
+            "end": float(epoch[-1]) if len(rows) else None,
+            "downsample": method if downsampled else None,
+            "channels": result
+        }
     
     def save_camera_image(self, image: np.ndarray, power: float, area: float) -> Optional[str]:
         """Basler 카메라 이미지 저장"""
@@ -348,11 +445,25 @@ class DataStorage:
     async def start_temp_storage(self, session_id: str):
         """임시 저장 시작 (자동저장 데이터 보관)"""
         try:
+            # 기존 임시 데이터 정리
+            if self.temp_storage:
+                await self.stop_temp_storage()
+            
             self.temp_storage_session_id = session_id
             self.temp_storage_start_time = datetime.now()
-            self.temp_storage.clear()  # 기존 임시 데이터 초기화
             
-            # 30분 후 자동 정리 태스크 시작
+            # 디스크 세그먼트 로그 시작 (DB/.temp/{세션}_{시각}/)
+            timestamp = self.temp_storage_start_time.strftime("%Y%m%d_%H%M%S")
+            self.temp_storage = TempSegmentLog(
+                os.path.join(self.base_db_path, ".temp", f"{session_id}_{timestamp}"),
+                list(self._normalize_template),
+                segment_seconds=self.temp_segment_seconds,
+                queue_size=self.csv_queue_size,
+                flush_interval=self.csv_flush_interval
+            )
+            self.temp_storage.start()
+            
+            # 보관 시간 후 자동 정리 태스크 시작
             self.temp_storage_cleanup_task = asyncio.create_task(self._temp_storage_cleanup())
             
             print(f"📦 임시 저장 시작: {session_id}")
@@ -362,28 +473,43 @@ class DataStorage:
             raise Exception(f"임시 저장 시작 실패: {str(e)}")
     
     async def stop_temp_storage(self):
-        """임시 저장 중지"""
+        """임시 저장 중지 (임시 세그먼트 삭제)"""
         try:
-            if self.temp_storage_cleanup_task:
-                self.temp_storage_cleanup_task.cancel()
-                try:
-                    await self.temp_storage_cleanup_task
-                except asyncio.CancelledError:
-                    pass
+            await self._cancel_temp_storage_cleanup()
             
             self.temp_storage_session_id = None
             self.temp_storage_start_time = None
             
+            if self.temp_storage:
+                temp_storage, self.temp_storage = self.temp_storage, None
+                await asyncio.get_running_loop().run_in_executor(None, temp_storage.discard)
+            
             print("📦 임시 저장 중지 완료")
             
         except Exception as e:
             print(f"❌ 임시 저장 중지 실패: {e}")
     
+    async def _cancel_temp_storage_cleanup(self):
+        """보관 시간 정리 태스크 취소 (정리 태스크 자신이 호출한 경우는 제외)"""
+        task, self.temp_storage_cleanup_task = self.temp_storage_cleanup_task, None
+        if task and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
     async def save_temp_storage_to_permanent(self, folder_name: str) -> str:
-        """임시 저장된 데이터를 영구 저장으로 이동"""
-        if not self.temp_storage_session_id or not self.temp_storage:
+        """임시 저장된 데이터를 영구 저장으로 이동 (세그먼트를 CSV 한 개로 복사한 뒤 임시 폴더 삭제)"""
+        if not self.temp_storage_session_id or not self.temp_storage or not self.temp_storage.row_count:
             raise Exception("저장할 임시 데이터가 없습니다")
         
+        # 옮기는 도중 보관 시간 정리가 임시 폴더를 지우지 않도록 정리 태스크를 취소하고 임시 저장에서 분리
+        await self._cancel_temp_storage_cleanup()
+        temp_storage, self.temp_storage = self.temp_storage, None
+        session_id, self.temp_storage_session_id = self.temp_storage_session_id, None
+        start_time, self.temp_storage_start_time = self.temp_storage_start_time, None
+        
         try:
             # 영구 저장 폴더 생성
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -396,36 +522,35 @@ class DataStorage:
             # CSV 파일 경로 설정
             csv_path = os.path.join(permanent_folder, f"{timestamp}.csv")
             
-            # 임시 데이터를 CSV로 저장
-            temp_data_list = list(self.temp_storage)
-            if temp_data_list:
-                # CSV 헤더 작성
-                fieldnames = list(temp_data_list[0].keys())
-                
-                with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    # 데이터 행들 작성
-                    for data in temp_data_list:
-                        writer.writerow(data)
-                
-                print(f"✅ 임시 데이터 영구 저장 완료: {csv_path} ({len(temp_data_list)}개 데이터)")
-                
-                # 임시 저장 중지
-                await self.stop_temp_storage()
-                
-                return permanent_folder
-            else:
-                raise Exception("저장할 데이터가 없습니다")
+            # 남은 행을 기록하고 세그먼트를 복사 (행을 다시 직렬화하지 않음)
+            # 분리 후에는 새 행이 들어오지 않으므로 flush로 모든 행이 기록되며, 기록 스레드와 세그먼트는
+            # 삭제 전까지 그대로 두어 실패 시 되돌린 임시 저장이 계속 기록/재시도 가능
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, temp_storage.flush):
+                raise Exception("임시 저장 대기 행 기록 시간 초과")
+            count = await loop.run_in_executor(None, temp_storage.promote, csv_path)
+            
+            print(f"✅ 임시 데이터 영구 저장 완료: {csv_path} ({count}개 데이터)")
+            
+            # 임시 저장 중지 (남은 임시 폴더 삭제)
+            await loop.run_in_executor(None, temp_storage.discard)
+            print("📦 임시 저장 중지 완료")
+            
+            return permanent_folder
                 
         except Exception as e:
+            # 다시 저장할 수 있도록 임시 저장을 되돌림 (새 임시 저장이 시작되지 않은 경우만)
+            if self.temp_storage is None:
+                self.temp_storage = temp_storage
+                self.temp_storage_session_id = session_id
+                self.temp_storage_start_time = start_time
+                self.temp_storage_cleanup_task = asyncio.create_task(self._temp_storage_cleanup())
             print(f"❌ 임시 데이터 영구 저장 실패: {e}")
             raise Exception(f"임시 데이터 영구 저장 실패: {str(e)}")
 
     async def save_temp_storage_to_path(self, dest_path: str) -> str:
-        """임시 저장 데이터를 사용자가 지정한 절대 경로에 저장"""
-        if not self.temp_storage_session_id or not self.temp_storage:
+        """임시 저장 데이터를 사용자가 지정한 절대 경로에 저장 (세그먼트 바이트 구간 복사)"""
+        if not self.temp_storage_session_id or not self.temp_storage or not self.temp_storage.row_count:
             raise Exception("저장할 임시 데이터가 없습니다")
         
         try:
@@ -437,28 +562,28 @@ class DataStorage:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             csv_path = os.path.join(dest_path, f"{timestamp}.csv")
             
-            temp_data_list = list(self.temp_storage)
-            if temp_data_list:
-                fieldnames = list(temp_data_list[0].keys())
-                with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for data in temp_data_list:
-                        writer.writerow(data)
-                print(f"✅ 임시 데이터 사용자 경로로 저장 완료: {csv_path} ({len(temp_data_list)}개 데이터)")
-                # 임시 저장은 유지(자동저장 계속) — 요청 시에만 중지
-                return dest_path
-            else:
-                raise Exception("저장할 데이터가 없습니다")
+            # 대기 행을 기록한 뒤 현재까지의 세그먼트를 복사 (복사 중에는 보관 시간 정리를 멈춤)
+            await self._cancel_temp_storage_cleanup()
+            temp_storage = self.temp_storage
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, temp_storage.flush)
+                count = await loop.run_in_executor(None, temp_storage.promote, csv_path)
+            finally:
+                if self.temp_storage is temp_storage and self.temp_storage_cleanup_task is None:
+                    self.temp_storage_cleanup_task = asyncio.create_task(self._temp_storage_cleanup())
+            print(f"✅ 임시 데이터 사용자 경로로 저장 완료: {csv_path} ({count}개 데이터)")
+            # 임시 저장은 유지(자동저장 계속) — 요청 시에만 중지
+            return dest_path
         except Exception as e:
             print(f"❌ 사용자 경로 저장 실패: {e}")
             raise Exception(f"사용자 경로 저장 실패: {str(e)}")
     
     async def _temp_storage_cleanup(self):
-        """30분 후 임시 저장 데이터 자동 정리"""
+        """보관 시간(기본 30분) 후 임시 저장 데이터 자동 정리 (다시 시작해도 임시 저장 시작 시각 기준)"""
         try:
-            # 30분 대기
-            await asyncio.sleep(1800)  # 30분 = 1800초
+            elapsed = (datetime.now() - self.temp_storage_start_time).total_seconds() if self.temp_storage_start_time else 0.0
+            await asyncio.sleep(max(0.0, self.temp_retention_seconds - elapsed))
             
             if self.temp_storage_session_id:
                 print(f"🧹 임시 저장 데이터 자동 정리: {self.temp_storage_session_id}")
@@ -483,12 +608,13 @@ class DataStorage:
         remaining_seconds = 0
         if self.temp_storage_start_time:
             elapsed = (datetime.now() - self.temp_storage_start_time).total_seconds()
-            remaining_seconds = max(0, 1800 - elapsed)  # 30분 - 경과시간
+            remaining_seconds = max(0, self.temp_retention_seconds - elapsed)  # 보관 시간 - 경과시간
         
         return {
             "has_temp_data": True,
             "session_id": self.temp_storage_session_id,
-            "data_count": len(self.temp_storage),
+            "data_count": self.temp_storage.row_count if self.temp_storage else 0,
             "start_time": self.temp_storage_start_time.isoformat() if self.temp_storage_start_time else None,
-            "remaining_time": int(remaining_seconds)
+            "remaining_time": int(remaining_seconds),
+            "storage": self.temp_storage.get_stats() if self.temp_storage else None
         }
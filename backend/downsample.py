@@ -0,0 +1,83 @@
+"""
+차트용 다운샘플링 - 히스토리 구간을 채널별로 max_points개 안팎의 점으로 줄임
+구간을 같은 크기 버킷으로 나눈 2차원 배열에서 버킷별 선택을 한 번에 계산 (버킷 수만큼 파이썬 루프를 돌지 않음)
+    minmax: 버킷마다 최소/최대 점 (피크 보존, 버킷당 2점)
+    lttb:   Largest-Triangle-Three-Buckets, 버킷마다 삼각형 면적이 가장 큰 점
+            원 알고리즘은 앞 버킷에서 선택된 점을 기준으로 삼아 순차 계산이 필요하므로,
+            앞 버킷 평균점을 기준으로 삼는 변형을 사용해 전체를 벡터 연산으로 처리
+"""
+import math
+
+import numpy as np
+
+METHODS = ("minmax", "lttb")
+
+
+def _buckets(values: np.ndarray, count: int, fill: float):
+    """1차원 배열 → (버킷 수, 버킷 크기) 2차원 배열 (끝은 fill로 채움), 버킷 크기"""
+    size = math.ceil(len(values) / count)
+    rows = math.ceil(len(values) / size)
+    padded = np.full(rows * size, fill, dtype=np.float64)
+    padded[:len(values)] = values
+    return padded.reshape(rows, size), size
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """버킷별 최소/최대 점 인덱스 (시간 순서, 최대 max_points개)"""
+    n = len(y)
+    if n <= max_points or max_points < 2:
+        return np.arange(n)
+    # 마지막 버킷은 끝 값으로 채움 (채운 칸이 선택되면 실제 마지막 점으로 대체)
+    size = math.ceil(n / (max_points // 2))
+    padded = np.pad(y, (0, -n % size), mode="edge").reshape(-1, size)
+    nan = np.isnan(padded)
+    if nan.any():
+        lows = np.where(nan, np.inf, padded).argmin(axis=1)
+        highs = np.where(nan, -np.inf, padded).argmax(axis=1)
+    else:
+        lows = padded.argmin(axis=1)
+        highs = padded.argmax(axis=1)
+
+    # 버킷 안에서 시간 순서로 (앞 점, 뒤 점), 최소/최대가 같은 점이면 한 번만
+    offsets = np.arange(len(padded)) * size
+    pairs = np.stack([np.minimum(lows, highs), np.maximum(lows, highs)], axis=1) + offsets[:, None]
+    keep = np.ones(pairs.shape, dtype=bool)
+    keep[:, 1] = lows != highs
+    indices = np.minimum(pairs[keep], n - 1)
+    return indices[np.concatenate([[True], np.diff(indices) > 0])]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """LTTB(앞 버킷 평균 기준 변형) 점 인덱스 (첫/마지막 점 포함, 시간 순서)"""
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+    xs, size = _buckets(x[1:-1], max_points - 2, np.nan)
+    ys, _ = _buckets(y[1:-1], max_points - 2, np.nan)
+
+    # 버킷 평균 (NaN 제외, 값이 없는 버킷은 NaN)
+    valid = ~(np.isnan(xs) | np.isnan(ys))
+    count = valid.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = np.where(valid, xs, 0.0).sum(axis=1) / count
+        mean_y = np.where(valid, ys, 0.0).sum(axis=1) / count
+
+    # 기준점: 앞 버킷 평균(첫 버킷은 첫 점), 다음 버킷 평균(마지막 버킷은 마지막 점)
+    ax = np.concatenate([x[:1], mean_x[:-1]])[:, None]
+    ay = np.concatenate([y[:1], mean_y[:-1]])[:, None]
+    cx = np.concatenate([mean_x[1:], x[-1:]])[:, None]
+    cy = np.concatenate([mean_y[1:], y[-1:]])[:, None]
+    area = np.abs((ax - cx) * (ys - ay) - (ax - xs) * (cy - ay))
+    area[np.isnan(area)] = -1.0
+
+    picks = area.argmax(axis=1) + np.arange(len(xs)) * size + 1
+    return np.concatenate([[0], np.minimum(picks, n - 2), [n - 1]])
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int, method: str = "minmax") -> np.ndarray:
+    """채널 하나의 다운샘플 인덱스 (x: 시각 배열, y: 값 배열)"""
+    if method == "minmax":
+        return minmax_indices(y, max_points)
+    if method == "lttb":
+        return lttb_indices(x, y, max_points)
+    raise ValueError(f"지원하지 않는 다운샘플 방식입니다: {method} (가능: {', '.join(METHODS)})")
@@ -0,0 +1,80 @@
+"""
+센서 이벤트 버스 - 컬렉터 스레드에서 asyncio 이벤트 루프로 새 샘플 알림 전달
+고정 타이머로 모든 센서를 폴링하는 대신, 새 샘플이 도착했을 때(또는 데드라인에) 융합 단계를 깨움
+"""
+import asyncio
+import threading
+from typing import Optional, Set
+
+
+class SensorEventBus:
+    """스레드 → asyncio 브리지 (loop.call_soon_threadsafe 기반)
+
+    컬렉터 스레드는 publish()로 갱신된 센서 이름만 기록하고,
+    이벤트 루프에 대기 중인 깨우기 콜백이 없을 때만 한 번 예약하므로
+    100Hz 센서가 여러 개여도 루프에 쌓이는 콜백 수가 제한됨
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._wakeup_scheduled = False
+
+        # 통계
+        self.publish_count = 0
+        self.wakeup_count = 0
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """이벤트 루프에 연결 (루프 스레드에서 호출)"""
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def publish(self, name: str, snapshot=None):
+        """새 샘플 알림 (임의 스레드에서 호출 가능, SnapshotRegister 리스너 시그니처 호환)"""
+        with self._lock:
+            self._pending.add(name)
+            self.publish_count += 1
+            if self._wakeup_scheduled or self._loop is None:
+                return
+            self._wakeup_scheduled = True
+
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup)
+        except RuntimeError:
+            # 루프가 이미 종료됨
+            with self._lock:
+                self._wakeup_scheduled = False
+
+    def _wakeup(self):
+        """이벤트 루프 스레드에서 대기 중인 소비자를 깨움"""
+        with self._lock:
+            self._wakeup_scheduled = False
+        self.wakeup_count += 1
+        self._event.set()
+
+    def drain(self) -> Set[str]:
+        """대기 중인 갱신 센서 이름을 꺼내고 초기화"""
+        with self._lock:
+            names = self._pending
+            self._pending = set()
+        if self._event is not None:
+            self._event.clear()
+        return names
+
+    async def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """새 샘플이 도착하거나 timeout이 지날 때까지 대기 후 갱신된 센서 이름 반환 (timeout 시 빈 집합)"""
+        if self._event is None:
+            raise RuntimeError("이벤트 버스가 이벤트 루프에 연결되지 않았습니다")
+
+        with self._lock:
+            has_pending = bool(self._pending)
+
+        if not has_pending:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        return self.drain()
@@ -0,0 +1,91 @@
+"""
+빠른 JSON 직렬화 - REST 응답과 WebSocket 브로드캐스트 공용
+orjson이 설치되어 있으면 사용하고(NumPy 배열/스칼라 직접 직렬화), 없으면 표준 json으로 대체
+결과는 UTF-8 bytes로 반환하여 FastAPI 응답 본문이나 WebSocket 메시지로 그대로 전송
+"""
+import json
+import math
+from datetime import date, datetime
+from typing import Any
+
+import numpy as np
+from fastapi.responses import Response
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# 사용 중인 직렬화 백엔드 이름 (상태 조회용)
+BACKEND = "orjson" if ORJSON_AVAILABLE else "json"
+
+
+def _finite_list(array: np.ndarray) -> Any:
+    """실수 배열 → 리스트 (NaN/Inf는 None, orjson과 같은 결과)"""
+    if array.dtype.kind != "f":
+        return array.tolist()
+    if array.ndim == 0:
+        value = array.item()
+        return value if math.isfinite(value) else None
+    if array.ndim == 1:
+        return [v if math.isfinite(v) else None for v in array.tolist()]
+    return [_finite_list(row) for row in array]
+
+
+def _default(obj: Any) -> Any:
+    """기본 직렬화가 처리하지 못하는 타입 변환 (기존 default=str 동작을 마지막 대안으로 유지)"""
+    if isinstance(obj, np.ndarray):
+        return _finite_list(obj)
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        return None if isinstance(value, float) and not math.isfinite(value) else value
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8", errors="replace")
+    return str(obj)
+
+
+def _finite(obj: Any) -> Any:
+    """dict/list/tuple 안의 NaN/Inf 실수(float, np.float64) → None (표준 json 대체 경로용, orjson과 같은 결과)"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def dumps(obj: Any) -> bytes:
+    """객체 → JSON UTF-8 bytes (NumPy 배열/스칼라, datetime 지원, NaN은 null)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson이 거부하는 입력 (64비트 초과 정수, 연속 메모리가 아닌 특수 dtype 배열 등)
+            pass
+    # 표준 json은 NaN/Inf를 그대로 출력하므로(JSON 규격 위반) 미리 None으로 바꾸고 allow_nan=False로 확인
+    return json.dumps(_finite(obj), ensure_ascii=False, default=_default, separators=(",", ":"),
+                      allow_nan=False).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """객체 → JSON 문자열 (WebSocket 텍스트 프레임용)"""
+    return dumps(obj).decode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """미리 직렬화한 JSON 응답 (라우트에서 직접 반환하면 jsonable_encoder를 거치지 않음)"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
@@ -0,0 +1,253 @@
+"""
+센서 융합 - 다중 센서 시간 정렬 및 리샘플링
+센서별 링 버퍼의 전체 샘플레이트 데이터를 공통 시간축(50Hz 격자)으로 벡터화 보간하여,
+서로 다른 시점에 획득된 값이 한 행에 섞이지 않도록 SensorManager와 DataStorage.store_data 사이에서 정렬
+기록된 세션(CSV)에도 오프라인으로 동일한 보간을 적용할 수 있음
+"""
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+INTERPOLATION_METHODS = ("zoh", "linear")
+
+# 채널별 기본 보간 방식 ("센서.채널"), 지정되지 않은 채널은 zoh
+# 연속적으로 변하는 측정값은 선형, 설정값/카운터류는 영차 유지(zoh)
+DEFAULT_METHODS = {
+    "cnc.curpos_x": "linear", "cnc.curpos_y": "linear", "cnc.curpos_z": "linear",
+    "cnc.curpos_a": "linear", "cnc.curpos_c": "linear",
+    "cnc.macpos_x": "linear", "cnc.macpos_y": "linear", "cnc.macpos_z": "linear",
+    "cnc.macpos_a": "linear", "cnc.macpos_c": "linear",
+    "cnc.rempos_x": "linear", "cnc.rempos_y": "linear", "cnc.rempos_z": "linear",
+    "cnc.rempos_a": "linear", "cnc.rempos_c": "linear",
+    "laser.outpower": "linear",
+    "pyrometer.mpt": "linear", "pyrometer.1ct": "linear", "pyrometer.2ct": "linear",
+    "camera.melt_pool_area": "linear",
+}
+
+
+def resample_columns(timestamps: np.ndarray, columns: Dict[str, np.ndarray], grid: np.ndarray,
+                     methods: Optional[Dict[str, str]] = None, default_method: str = "zoh",
+                     max_hold: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """한 센서의 샘플 블록을 공통 시간축으로 리샘플링
+
+    Args:
+        timestamps: 오름차순 샘플 시각
+        columns: 채널명 → 샘플 값 (timestamps와 같은 길이)
+        grid: 출력 시간축
+        methods: 채널명 → "zoh" 또는 "linear"
+        default_method: methods에 없는 채널의 보간 방식
+        max_hold: 가장 가까운 이전 샘플이 이보다 오래되면 NaN (센서 끊김 감지)
+
+    Returns:
+        채널명 → grid 길이의 배열 (첫 샘플 이전 시점은 NaN)
+    """
+    methods = methods or {}
+    grid = np.asarray(grid, dtype=np.float64)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+
+    if timestamps.size == 0 or grid.size == 0:
+        return {name: np.full(grid.size, np.nan) for name in columns}
+
+    # 모든 채널이 공유하는 이전 샘플 인덱스 (한 번만 계산)
+    prev_idx = np.searchsorted(timestamps, grid, side="right") - 1
+    before_first = prev_idx < 0
+    safe_idx = np.clip(prev_idx, 0, timestamps.size - 1)
+
+    invalid = before_first
+    if max_hold is not None:
+        invalid = invalid | ((grid - timestamps[safe_idx]) > max_hold)
+
+    zoh_names = [n for n in columns if methods.get(n, default_method) == "zoh"]
+    linear_names = [n for n in columns if methods.get(n, default_method) == "linear"]
+    unknown = set(columns) - set(zoh_names) - set(linear_names)
+    if unknown:
+        raise ValueError(f"지원하지 않는 보간 방식입니다: {sorted(unknown)}")
+
+    result: Dict[str, np.ndarray] = {}
+
+    # 영차 유지: 채널을 2차원 블록으로 쌓아 한 번의 fancy indexing으로 처리
+    if zoh_names:
+        block = np.vstack([np.asarray(columns[n], dtype=np.float64) for n in zoh_names])
+        held = block[:, safe_idx]
+        held[:, invalid] = np.nan
+        for i, name in enumerate(zoh_names):
+            result[name] = held[i]
+
+    # 선형 보간: 이전/다음 샘플 사이 가중치를 한 번 계산해 모든 선형 채널에 적용
+    if linear_names:
+        next_idx = np.minimum(safe_idx + 1, timestamps.size - 1)
+        t0 = timestamps[safe_idx]
+        t1 = timestamps[next_idx]
+        span = t1 - t0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(span > 0, (grid - t0) / span, 0.0)
+        weight = np.clip(weight, 0.0, 1.0)
+
+        block = np.vstack([np.asarray(columns[n], dtype=np.float64) for n in linear_names])
+        v0 = block[:, safe_idx]
+        v1 = block[:, next_idx]
+        # 다음 샘플이 NaN이면 이전 값 유지
+        v1 = np.where(np.isnan(v1), v0, v1)
+        interpolated = v0 + (v1 - v0) * weight
+        interpolated[:, invalid] = np.nan
+        for i, name in enumerate(linear_names):
+            result[name] = interpolated[i]
+
+    return result
+
+
+class SensorFusion:
+    """센서 링 버퍼 → 공통 50Hz 시간축 정렬 (블록 단위 온라인 처리)"""
+
+    def __init__(self, ring_buffers: Dict[str, Any], data_keys: Dict[str, str],
+                 rate_hz: float = 50.0, delay: float = 0.06, block_seconds: float = 0.1,
+                 max_hold: float = 0.5, methods: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            ring_buffers: 센서명 → SensorRingBuffer
+            data_keys: 센서명 → sensor_data 키 (예: "cnc" → "cnc_data")
+            rate_hz: 출력 시간축 주기
+            delay: 출력 시각을 현재보다 늦추는 시간 (선형 보간에 필요한 다음 샘플 대기,
+                   가장 느린 센서 주기(파이로미터 50ms)보다 커야 함)
+            block_seconds: 한 번에 처리할 최소 블록 길이
+            max_hold: 이보다 오래된 샘플은 값으로 유지하지 않음 (NaN)
+            methods: "센서.채널" → 보간 방식 (DEFAULT_METHODS 덮어쓰기)
+        """
+        self.ring_buffers = ring_buffers
+        self.data_keys = data_keys
+        self.period = 1.0 / rate_hz
+        self.delay = delay
+        self.block_seconds = block_seconds
+        self.max_hold = max_hold
+        self.methods = dict(DEFAULT_METHODS)
+        if methods:
+            for key, method in methods.items():
+                if method not in INTERPOLATION_METHODS:
+                    raise ValueError(f"지원하지 않는 보간 방식입니다: {key}={method}")
+                self.methods[key] = method
+
+        self._next_t: Optional[float] = None
+        self.rows_emitted = 0
+
+    def fuse_pending(self, now: Optional[float] = None) -> Tuple[np.ndarray, Dict[str, Dict[str, np.ndarray]]]:
+        """아직 출력하지 않은 시간 구간을 블록 단위로 정렬
+
+        Returns:
+            (grid, {센서명: {채널명: 값 배열}}), 처리할 블록이 없으면 빈 grid
+        """
+        now = time.monotonic() if now is None else now
+        end = now - self.delay
+
+        if self._next_t is None:
+            # 격자를 주기 배수에 맞춰 시작
+            self._next_t = np.ceil(end / self.period) * self.period
+
+        if end - self._next_t < self.block_seconds - 1e-9:
+            return np.empty(0), {}
+
+        count = int(np.floor((end - self._next_t) / self.period)) + 1
+        grid = self._next_t + np.arange(count) * self.period
+        self._next_t = grid[-1] + self.period
+
+        fused: Dict[str, Dict[str, np.ndarray]] = {}
+        for name, ring in self.ring_buffers.items():
+            # 첫 격자 이전 샘플(max_hold 범위)부터 최신 샘플까지 (선형 보간용 다음 샘플 포함)
+            window = ring.window(start=grid[0] - self.max_hold)
+            timestamps = window.pop("timestamp")
+            methods = {
+                channel: self.methods.get(f"{name}.{channel}", "zoh")
+                for channel in window
+            }
+            fused[name] = resample_columns(
+                timestamps, window, grid, methods, max_hold=self.max_hold
+            )
+
+        self.rows_emitted += count
+        return grid, fused
+
+    def to_rows(self, grid: np.ndarray, fused: Dict[str, Dict[str, np.ndarray]],
+                live_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """정렬 결과를 sensor_data 형식의 행 목록으로 변환
+
+        숫자 채널은 정렬된 값으로, 이미지 등 비숫자 필드는 현재 스냅샷 값으로 채움
+        """
+        if grid.size == 0:
+            return []
+
+        epoch_offset = time.time() - time.monotonic()
+        timestamps = [
+            datetime.fromtimestamp(t + epoch_offset).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            for t in grid.tolist()
+        ]
+
+        # 센서별 값 목록을 미리 파이썬 리스트로 변환 (행 단위 numpy 인덱싱 회피)
+        per_sensor = {
+            name: {channel: values.tolist() for channel, values in channels.items()}
+            for name, channels in fused.items()
+        }
+
+        rows = []
+        for i, timestamp in enumerate(timestamps):
+            row = dict(live_data)
+            row["timestamp"] = timestamp
+            for name, channels in per_sensor.items():
+                key = self.data_keys.get(name)
+                if key is None:
+                    continue
+                values = {ch: (None if v[i] != v[i] else v[i]) for ch, v in channels.items()}
+                live = live_data.get(key)
+                if live is None and all(v is None for v in values.values()):
+                    row[key] = None
+                    continue
+                merged = dict(live) if live else {}
+                merged.update(values)
+                row[key] = merged
+            rows.append(row)
+        return rows
+
+
+def resample_dataframe(df, rate_hz: float = 50.0, methods: Optional[Dict[str, str]] = None,
+                       timestamp_column: Optional[str] = None, max_hold: Optional[float] = None):
+    """기록된 세션(DataFrame)을 균일한 시간축으로 오프라인 리샘플링
+
+    Args:
+        df: timestamp 열과 숫자 채널 열을 가진 DataFrame (DataStorage CSV 형식)
+        rate_hz: 출력 주기
+        methods: 열 이름 → "zoh" 또는 "linear" (기본: DEFAULT_METHODS의 채널명 기준)
+        timestamp_column: 시각 열 이름 (기본: "timestamp" 또는 "time" 자동 선택)
+        max_hold: 이보다 오래된 샘플은 NaN
+
+    Returns:
+        균일한 시간축의 새 DataFrame
+    """
+    import pandas as pd
+
+    if timestamp_column is None:
+        timestamp_column = "timestamp" if "timestamp" in df.columns else "time"
+
+    times = pd.to_datetime(df[timestamp_column])
+    t = (times - times.iloc[0]).dt.total_seconds().to_numpy()
+    order = np.argsort(t, kind="stable")
+    t = t[order]
+
+    if methods is None:
+        methods = {key.split(".", 1)[1]: method for key, method in DEFAULT_METHODS.items()}
+
+    numeric = df.drop(columns=[timestamp_column]).select_dtypes(include=[np.number, bool])
+    grid = np.arange(0.0, t[-1] + 1e-9, 1.0 / rate_hz) if t.size else np.empty(0)
+
+    # 열마다 결측(NaN)이 아닌 샘플만 사용해 리샘플링
+    result = {}
+    for name in numeric.columns:
+        values = numeric[name].to_numpy(dtype=np.float64)[order]
+        valid = ~np.isnan(values)
+        result.update(resample_columns(
+            t[valid], {name: values[valid]}, grid,
+            {name: methods.get(name, "zoh")}, max_hold=max_hold
+        ))
+
+    out = pd.DataFrame(result, columns=list(numeric.columns))
+    out.insert(0, timestamp_column, times.iloc[0] + pd.to_timedelta(grid, unit="s"))
+    return out
@@ -0,0 +1,158 @@
+"""
+히스토리 링 버퍼 - DataStorage 정규화 행을 미리 할당한 NumPy 구조체 배열에 보관
+행마다 dict를 보관하던 deque 대신 고정 폭 열(seq int64, 시각 datetime64[ms], 실수 float64, 플래그 bool)에 기록하여
+50Hz로 수 시간 분량을 보관해도 메모리가 행당 수백 바이트로 고정되고, 최근 N행 조회는 N에 비례하는 비용으로 처리
+"""
+import math
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from backend.column_store import TIME_DTYPE
+
+
+class HistoryRing:
+    """구조체 배열 기반 고정 크기 링 버퍼 (행마다 단조 증가 seq 부여)"""
+
+    def __init__(self, columns: Dict[str, str], capacity: int):
+        """
+        Args:
+            columns: 열 이름 → dtype ("datetime64[ms]" / "bool" / "float64"), 행 dict에서 이 이름으로 값을 꺼냄
+            capacity: 보관할 최대 행 수
+        """
+        if capacity <= 0:
+            raise ValueError(f"잘못된 버퍼 크기입니다: {capacity}")
+
+        self.columns = dict(columns)
+        self.capacity = int(capacity)
+        self.dtype = np.dtype([("seq", np.int64)] + [(name, dtype) for name, dtype in self.columns.items()])
+        self.buffer = np.zeros(self.capacity, dtype=self.dtype)
+
+        # 행 dict → 구조체 한 행 변환 순서 (seq 다음 열 순서)
+        self._converters = [(name, self._converter(dtype)) for name, dtype in self.columns.items()]
+        self._lock = threading.Lock()
+        self._head = 0          # 다음 기록 위치
+        self.total_count = 0    # 누적 기록 행 수 (마지막 행의 seq)
+
+    @staticmethod
+    def _converter(dtype: str):
+        if dtype == TIME_DTYPE:
+            def to_time(value):
+                try:
+                    return np.datetime64(value or "NaT", "ms")
+                except ValueError:
+                    return np.datetime64("NaT")
+            return to_time
+        if dtype == "bool":
+            return bool
+
+        def to_float(value):
+            if value is None:
+                return math.nan
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return math.nan
+        return to_float
+
+    def __len__(self) -> int:
+        return min(self.total_count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return self.buffer.nbytes
+
+    def append(self, row: Dict[str, Any]) -> int:
+        """행 한 개 기록 → seq (1부터 시작)"""
+        values = [convert(row.get(name)) for name, convert in self._converters]
+        with self._lock:
+            seq = self.total_count + 1
+            self.buffer[self._head] = (seq, *values)
+            self._head = (self._head + 1) % self.capacity
+            self.total_count = seq
+        return seq
+
+    def _tail_slices(self, keep: int):
+        """마지막 keep개 행의 인덱스 구간 (시간 순서, 최대 2개)"""
+        head = self._head
+        if keep <= head:
+            return [(head - keep, head)]
+        return [(self.capacity - (keep - head), self.capacity), (0, head)]
+
+    def tail(self, n: int) -> np.ndarray:
+        """최근 n행 (구조체 배열, 링 경계를 넘지 않으면 내부 버퍼의 뷰)
+
+        뷰는 이후 기록으로 덮어써질 수 있으므로 보관하려면 복사하거나 to_records로 변환할 것
+        """
+        with self._lock:
+            keep = max(0, min(int(n), len(self)))
+            if keep == 0:
+                return self.buffer[:0]
+            slices = self._tail_slices(keep)
+            if len(slices) == 1:
+                a, b = slices[0]
+                return self.buffer[a:b]
+            return np.concatenate([self.buffer[a:b] for a, b in slices])
+
+    def range(self, start: Optional[np.datetime64] = None, end: Optional[np.datetime64] = None) -> np.ndarray:
+        """timestamp가 [start, end]인 행 (구조체 배열, 링 경계를 넘지 않으면 내부 버퍼의 뷰)
+
+        각 링 구간의 timestamp가 시간 순서라고 보고 이진 탐색하므로 구간 길이와 관계없이 O(log n)으로 위치를 찾음
+        """
+        with self._lock:
+            n = len(self)
+            head = self._head
+            if n < self.capacity:
+                segments = [(0, n)]
+            elif head == 0:
+                segments = [(0, self.capacity)]
+            else:
+                segments = [(head, self.capacity), (0, head)]
+
+            slices = []
+            for lo, hi in segments:
+                times = self.buffer["timestamp"][lo:hi]
+                a = lo + (int(np.searchsorted(times, start, side="left")) if start is not None else 0)
+                b = lo + (int(np.searchsorted(times, end, side="right")) if end is not None else hi - lo)
+                if b > a:
+                    slices.append((a, b))
+
+            if not slices:
+                return self.buffer[:0]
+            if len(slices) == 1:
+                a, b = slices[0]
+                return self.buffer[a:b]
+            return np.concatenate([self.buffer[a:b] for a, b in slices])
+
+    def to_records(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        """구조체 배열 → 기존 히스토리 행 dict 목록 (NaN은 None, 시각은 "%Y-%m-%d %H:%M:%S.%f" 밀리초 문자열)"""
+        if len(rows) == 0:
+            return []
+        names = list(self.columns)
+        columns = []
+        for name in names:
+            values = rows[name]
+            if values.dtype.kind == "M":
+                text = np.datetime_as_string(values, unit="ms")
+                columns.append([None if t == "NaT" else t.replace("T", " ") for t in text.tolist()])
+            elif values.dtype.kind == "f" and np.isnan(values).any():
+                columns.append([v if v == v else None for v in values.tolist()])
+            else:
+                columns.append(values.tolist())
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """마지막 행 dict (없으면 None)"""
+        records = self.to_records(self.tail(1))
+        return records[0] if records else None
+
+    def get_info(self) -> Dict[str, Any]:
+        """버퍼 상태 조회"""
+        return {
+            "capacity": self.capacity,
+            "size": len(self),
+            "total_count": self.total_count,
+            "row_bytes": self.dtype.itemsize,
+            "memory_bytes": self.nbytes
+        }
@@ -13,7 +13,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
@@ -23,6 +23,21 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.sensor_manager import SensorManager
 from backend.data_storage import DataStorage
 from backend.websocket_manager import WebSocketManager
+from backend.tick_scheduler import TickScheduler
+from backend.event_bus import SensorEventBus
+from backend.fusion import SensorFusion
+from backend.sensor_supervisor import SensorSupervisor
+from backend.video_stream import VideoHub, MJPEG_BOUNDARY
+from backend.fast_json import FastJSONResponse
+from backend.metrics import METRICS, STAGE_SECONDS
+
+# 수집 루프 단계별 지연 히스토그램 (핫 패스에서 레이블 조회를 피하도록 미리 바인딩)
+_TICK_SECONDS = STAGE_SECONDS.labels(stage="tick")
+_COLLECT_SECONDS = STAGE_SECONDS.labels(stage="collect_all_data")
+_FUSION_SECONDS = STAGE_SECONDS.labels(stage="fusion")
+_STORE_SECONDS = STAGE_SECONDS.labels(stage="store_data")
+_BROADCAST_SECONDS = STAGE_SECONDS.labels(stage="broadcast")
+_TICKS = METRICS.counter("hbnu_ticks_total", "수집 루프 실행 횟수")
 
 
 class SensorData(BaseModel):
@@ -46,12 +61,18 @@ class SaveRequest(BaseModel):
 sensor_manager: Optional[SensorManager] = None
 data_storage: Optional[DataStorage] = None
 websocket_manager: Optional[WebSocketManager] = None
+tick_scheduler: Optional[TickScheduler] = None
+event_bus: Optional[SensorEventBus] = None
+sensor_fusion: Optional[SensorFusion] = None
+sensor_supervisor: Optional[SensorSupervisor] = None
+video_hub: Optional[VideoHub] = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 생명주기 관리"""
-    global sensor_manager, data_storage, websocket_manager
+    global sensor_manager, data_storage, websocket_manager, tick_scheduler, event_bus, sensor_fusion
+    global sensor_supervisor, video_hub
     
     print("🚀 백엔드 서버 시작 중...")
     
@@ -67,18 +88,95 @@ async def lifespan(app: FastAPI):
     # 센서 매니저 초기화
     sensor_manager = SensorManager(
         use_cnc_subprocess=use_cnc_subprocess,
-        cnc_python_path=cnc_python_path
+        cnc_python_path=cnc_python_path,
+        ring_seconds=float(os.getenv('SENSOR_RING_SECONDS', '60')),
+        startup_timeout=float(os.getenv('SENSOR_STARTUP_TIMEOUT', '0.5')),
+        process_workers=os.getenv('SENSOR_PROCESS_WORKERS', ''),
+        simulate=os.getenv('SENSOR_SIMULATE', 'false').lower() == 'true'
     )
+    if sensor_manager.process_plugins:
+        print(f"📌 워커 프로세스 모드: {', '.join(sensor_manager.process_plugins)}")
+    
+    # 이벤트 구동 모드: 컬렉터가 새 샘플을 발행하면 수집 루프를 깨움
+    if os.getenv('ACQ_EVENT_DRIVEN', 'true').lower() == 'true':
+        event_bus = SensorEventBus()
+        event_bus.attach(asyncio.get_running_loop())
+        sensor_manager.register.add_listener(event_bus.publish)
+        print("📌 이벤트 구동 수집 모드 활성화")
+    
     await sensor_manager.initialize()
     
+    # 센서 감시자: 멈추거나 끊긴 센서를 지수 백오프로 재연결
+    if os.getenv('SENSOR_SUPERVISOR', 'true').lower() == 'true':
+        sensor_supervisor = SensorSupervisor(
+            sensor_manager,
+            stale_timeout=float(os.getenv('SENSOR_STALE_SECONDS', '2.0')),
+            error_threshold=int(os.getenv('SENSOR_ERROR_THRESHOLD', '5')),
+            backoff_max=float(os.getenv('SENSOR_BACKOFF_MAX', '30'))
+        )
+        sensor_supervisor.start()
+    
+    # 센서 융합 (시간 정렬) 단계: 저장 데이터를 공통 시간축으로 보간
+    if os.getenv('ACQ_FUSION', 'false').lower() == 'true':
+        sensor_fusion = SensorFusion(
+            sensor_manager.ring_buffers,
+            sensor_manager.data_keys,
+            rate_hz=float(os.getenv('ACQ_RATE_HZ', '50')),
+            delay=float(os.getenv('FUSION_DELAY', '0.06')),
+            block_seconds=float(os.getenv('FUSION_BLOCK_SECONDS', '0.1')),
+            methods={
+                **sensor_manager.registry.fusion_methods(),
+                **_parse_fusion_methods(os.getenv('FUSION_METHODS', ''))
+            }
+        )
+        print("📌 센서 융합(시간 정렬) 단계 활성화")
+    
+    # 영상 스트림 (프레임은 요청 시 인코딩 워커에서 JPEG로 한 번만 인코딩)
+    video_hub = VideoHub(
+        sensor_manager,
+        quality=int(os.getenv('VIDEO_JPEG_QUALITY', '80')),
+        max_fps=float(os.getenv('VIDEO_MAX_FPS', '15'))
+    )
+    
     # 데이터 스토리지 초기화
-    data_storage = DataStorage()
+    data_storage = DataStorage(
+        max_history_size=int(os.getenv('DATA_HISTORY_SIZE', '180000')),
+        registry=sensor_manager.registry,
+        csv_queue_size=int(os.getenv('CSV_QUEUE_SIZE', '10000')),
+        csv_flush_interval=float(os.getenv('CSV_FLUSH_INTERVAL', '1.0')),
+        csv_rotate_seconds=float(os.getenv('CSV_ROTATE_SECONDS', '3600')),
+        record_formats=[f.strip() for f in os.getenv('RECORD_FORMATS', 'columns,csv').split(',') if f.strip()],
+        temp_retention_seconds=float(os.getenv('TEMP_STORAGE_SECONDS', '1800')),
+        temp_segment_seconds=float(os.getenv('TEMP_SEGMENT_SECONDS', '60'))
+    )
     
     # WebSocket 매니저 초기화
-    websocket_manager = WebSocketManager()
+    websocket_manager = WebSocketManager(
+        queue_size=int(os.getenv('WS_QUEUE_SIZE', '8')),
+        queue_policy=os.getenv('WS_QUEUE_POLICY', 'latest').lower(),
+        registry=sensor_manager.registry,
+        keyframe_interval=float(os.getenv('WS_KEYFRAME_INTERVAL', '2.0')),
+        replay_size=int(os.getenv('WS_REPLAY_SIZE', '3000')),
+        heartbeat_interval=float(os.getenv('WS_HEARTBEAT_INTERVAL', '10')),
+        heartbeat_timeout=float(os.getenv('WS_HEARTBEAT_TIMEOUT', '30'))
+    )
+    
+    # 수집 루프 스케줄러 초기화 (환경 변수로 주기/오버런 정책 설정)
+    tick_scheduler = TickScheduler(
+        rate_hz=float(os.getenv('ACQ_RATE_HZ', '50')),
+        overrun_policy=os.getenv('ACQ_OVERRUN_POLICY', 'skip').lower(),
+        max_catch_up=int(os.getenv('ACQ_MAX_CATCH_UP', '5'))
+    )
+    
+    # 스케줄러 통계 게이지 (/api/metrics 조회 시점 값)
+    METRICS.gauge("hbnu_tick_overruns", "수집 루프 오버런 누적 횟수",
+                  callback=lambda: tick_scheduler.overrun_count)
+    METRICS.gauge("hbnu_tick_skipped", "수집 루프에서 건너뛴 틱 누적 수",
+                  callback=lambda: tick_scheduler.skipped_ticks)
     
     # 데이터 수집 태스크 시작
     data_collection_task = asyncio.create_task(collect_sensor_data())
+    websocket_manager.start()
     
     print("✅ 백엔드 서버 준비 완료")
     
@@ -87,6 +185,16 @@ async def lifespan(app: FastAPI):
     # 정리 작업
     print("🛑 백엔드 서버 종료 중...")
     data_collection_task.cancel()
+    if sensor_supervisor:
+        await sensor_supervisor.stop()
+    if websocket_manager:
+        websocket_manager.shutdown()
+    if video_hub:
+        video_hub.shutdown()
+    if data_storage:
+        # 기록 중인 파일의 남은 행 기록 및 임시 저장 세그먼트 정리
+        await data_storage.stop_saving()
+        await data_storage.stop_temp_storage()
     if sensor_manager:
         await sensor_manager.cleanup()
     print("✅ 백엔드 서버 종료 완료")
@@ -97,7 +205,8 @@ app = FastAPI(
     title="HBNU Monitoring Backend",
     description="DED 모니터링 시스템 백엔드 API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS 설정
@@ -110,27 +219,68 @@ app.add_middleware(
 )
 
 
+def _parse_fusion_methods(spec: str) -> Dict[str, str]:
+    """FUSION_METHODS 환경 변수 파싱 (예: "laser.outpower=zoh,cnc.feed_rate=linear")"""
+    methods = {}
+    for item in spec.split(','):
+        if '=' in item:
+            key, method = item.split('=', 1)
+            methods[key.strip()] = method.strip().lower()
+    return methods
+
+
 async def collect_sensor_data():
     """센서 데이터 수집 및 WebSocket 전송 (HBU_monitoring 방식 - 50Hz)"""
+    idle_timeout = float(os.getenv('ACQ_IDLE_TIMEOUT', '1.0'))
+    
     while True:
         try:
+            # 단조 시계 데드라인까지 대기 (작업 시간과 무관하게 20ms 격자 유지)
+            await tick_scheduler.wait_next()
+            
+            # 이벤트 구동 모드: 지난 틱 이후 새 샘플이 없으면 갱신 또는 유휴 데드라인까지 대기
+            # (테스트 모드는 발행하는 컬렉터가 없으므로 타이머로 동작)
+            if event_bus and sensor_manager and not sensor_manager.test_mode:
+                if not event_bus.drain():
+                    await event_bus.wait(timeout=idle_timeout)
+                    tick_scheduler.resync()
+            
             if sensor_manager and data_storage:
+                tick_started = time.perf_counter()
+                
                 # 모든 센서 데이터 수집 (이미 Thread로 수집 중이므로 DB에서만 조회)
                 sensor_data = await sensor_manager.collect_all_data()
+                stage_done = time.perf_counter()
+                _COLLECT_SECONDS.observe(stage_done - tick_started)
                 
-                # 데이터 저장소에 저장
-                data_storage.store_data(sensor_data)
+                # 데이터 저장소에 저장 (융합 활성화 시 공통 시간축으로 정렬된 블록 저장)
+                if sensor_fusion and not sensor_manager.test_mode:
+                    grid, fused = sensor_fusion.fuse_pending()
+                    rows = sensor_fusion.to_rows(grid, fused, sensor_data)
+                    stage_started, stage_done = stage_done, time.perf_counter()
+                    _FUSION_SECONDS.observe(stage_done - stage_started)
+                    for row in rows:
+                        data_storage.store_data(row)
+                else:
+                    data_storage.store_data(sensor_data)
+                stage_started, stage_done = stage_done, time.perf_counter()
+                _STORE_SECONDS.observe(stage_done - stage_started)
                 
                 # WebSocket으로 실시간 전송
                 if websocket_manager:
                     await websocket_manager.broadcast_data(sensor_data)
+                    stage_started, stage_done = stage_done, time.perf_counter()
+                    _BROADCAST_SECONDS.observe(stage_done - stage_started)
+                
+                _TICK_SECONDS.observe(stage_done - tick_started)
+                _TICKS.inc()
             
-            # 20ms 간격으로 수집 (50Hz) - HBU_monitoring과 동일
-            await asyncio.sleep(0.02)
-            
+        except asyncio.CancelledError:
+            break
         except Exception as e:
             print(f"❌ 데이터 수집 오류: {e}")
             await asyncio.sleep(1)
+            tick_scheduler.resync()
 
 
 # API 엔드포인트들
@@ -154,26 +304,117 @@ async def get_status():
     return {
         "system_status": "running",
         "sensors": status,
+        "sensor_states": dict(sensor_manager.sensor_states),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/api/status/startup")
+async def get_startup_status():
+    """센서별 시작 소요 시간 및 연결 상태 조회 (connecting 센서는 백그라운드에서 연결 중)"""
+    if not sensor_manager:
+        raise HTTPException(status_code=503, detail="센서 매니저가 초기화되지 않았습니다")
+    
+    return {
+        **sensor_manager.get_startup_report(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/api/status/sensors")
+async def get_sensor_health():
+    """센서별 연결 상태, 재연결 횟수, 다운타임 조회"""
+    if not sensor_supervisor:
+        raise HTTPException(status_code=503, detail="센서 감시자가 비활성화되어 있습니다")
+    
+    return {
+        **sensor_supervisor.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/api/status/scheduler")
+async def get_scheduler_status():
+    """수집 루프 스케줄러 통계 조회 (달성 주기, 지터, 오버런)"""
+    if not tick_scheduler:
+        raise HTTPException(status_code=503, detail="스케줄러가 초기화되지 않았습니다")
+    
+    return {
+        **tick_scheduler.get_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
 
+@app.get("/api/status/websocket")
+async def get_websocket_status():
+    """WebSocket 클라이언트별 송신 큐 길이, 전송/버린 메시지 수"""
+    if not websocket_manager:
+        raise HTTPException(status_code=503, detail="WebSocket 매니저가 초기화되지 않았습니다")
+    
+    return websocket_manager.get_connection_info()
+
+
+@app.get("/api/sensors/{sensor_name}/window")
+async def get_sensor_window(sensor_name: str, seconds: float = 2.0, last_n: Optional[int] = None):
+    """센서 링 버퍼 구간 조회 (전체 샘플레이트, 예: 최근 2초간 CNC 100Hz 데이터)"""
+    if not sensor_manager:
+        raise HTTPException(status_code=503, detail="센서 매니저가 초기화되지 않았습니다")
+    
+    # 응답 직렬화는 잠금 밖에서 이뤄지므로 컬렉터 스레드가 덮어쓰지 않도록 잠금 안에서 복사
+    window = sensor_manager.get_sensor_window(sensor_name, seconds=seconds, last_n=last_n, copy=True)
+    if window is None:
+        raise HTTPException(status_code=404, detail=f"링 버퍼가 없는 센서입니다: {sensor_name}")
+    
+    # time.monotonic 기준 획득 시각을 UNIX 시각으로 변환 (NumPy 배열 그대로 직렬화, NaN은 null)
+    epoch_offset = time.time() - time.monotonic()
+    timestamps = window.pop("timestamp")
+    return FastJSONResponse({
+        "sensor": sensor_name,
+        "count": int(timestamps.size),
+        "timestamp": timestamps + epoch_offset,
+        "channels": window
+    })
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """단계별 지연 히스토그램 및 카운터 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/api/data/latest")
 async def get_latest_data():
     """최신 센서 데이터 조회"""
     if not data_storage:
         raise HTTPException(status_code=503, detail="데이터 스토리지가 초기화되지 않았습니다")
     
-    return data_storage.get_latest_data()
+    return FastJSONResponse(data_storage.get_latest_data())
 
 
 @app.get("/api/data/history")
-async def get_data_history(limit: int = 100):
-    """히스토리 데이터 조회"""
+async def get_data_history(limit: int = 100, start: Optional[str] = None, end: Optional[str] = None,
+                           seconds: Optional[float] = None, max_points: Optional[int] = None,
+                           downsample: str = "minmax", channels: Optional[str] = None):
+    """히스토리 데이터 조회
+    
+    limit만 주면 최근 limit행 (행 목록),
+    start/end/seconds/max_points/channels 중 하나라도 주면 시간 구간을 채널별 열로 반환 (max_points 초과 시 다운샘플)
+    예: /api/data/history?seconds=1800&max_points=2000&downsample=lttb&channels=mpt,outpower
+    """
     if not data_storage:
         raise HTTPException(status_code=503, detail="데이터 스토리지가 초기화되지 않았습니다")
     
-    return data_storage.get_history_data(limit)
+    if start is None and end is None and seconds is None and max_points is None and channels is None:
+        return FastJSONResponse(data_storage.get_history_data(limit))
+    
+    try:
+        result = data_storage.query_history(
+            start=start, end=end, seconds=seconds, max_points=max_points, method=downsample.lower(),
+            channels=[name.strip() for name in channels.split(",") if name.strip()] if channels else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(result)
 
 
 @app.post("/api/save/start")
@@ -274,6 +515,7 @@ async def get_save_status():
     return {
         "is_saving": data_storage.is_saving,
         "save_path": data_storage.current_save_path,
+        "writer": data_storage.get_writer_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -290,6 +532,41 @@ async def get_image(image_type: str):
         raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다")
 
 
+@app.get("/api/video")
+async def get_video_status():
+    """영상 스트림 목록, 시청자 수, 인코딩 프레임 수"""
+    if not video_hub:
+        raise HTTPException(status_code=503, detail="영상 스트림이 초기화되지 않았습니다")
+    
+    return video_hub.get_stats()
+
+
+@app.get("/api/video/{stream}")
+async def get_video_stream(stream: str, width: int = 0, fps: Optional[float] = None):
+    """MJPEG 영상 스트림 (basler/camera, hik, hik_camera_1 등, width로 축소 요청, 160px 단위로 올림)"""
+    if not video_hub or video_hub.get_stream(stream) is None:
+        raise HTTPException(status_code=404, detail="영상 스트림을 찾을 수 없습니다")
+    if fps is not None and not fps > 0:
+        raise HTTPException(status_code=400, detail=f"fps는 0보다 커야 합니다: {fps}")
+    
+    return StreamingResponse(
+        video_hub.mjpeg(stream, width=max(0, width), fps=fps),
+        media_type=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}"
+    )
+
+
+@app.get("/api/video/{stream}/snapshot")
+async def get_video_snapshot(stream: str, width: int = 0):
+    """최신 프레임 JPEG 한 장"""
+    if not video_hub or video_hub.get_stream(stream) is None:
+        raise HTTPException(status_code=404, detail="영상 스트림을 찾을 수 없습니다")
+    
+    jpeg = await video_hub.snapshot(stream, width=max(0, width))
+    if jpeg is None:
+        raise HTTPException(status_code=404, detail="아직 수신된 프레임이 없습니다")
+    return Response(content=jpeg, media_type="image/jpeg")
+
+
 ## NC 기능 제거: 관련 모델 및 엔드포인트 삭제
 
 
@@ -301,8 +578,10 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             # 클라이언트로부터 메시지 수신 대기
             data = await websocket.receive_text()
-            # 필요시 클라이언트 메시지 처리 로직 추가
+            websocket_manager.handle_client_message(websocket, data)
     except WebSocketDisconnect:
+        pass
+    finally:
         websocket_manager.disconnect(websocket)
 
 
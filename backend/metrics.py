@@ -0,0 +1,205 @@
+"""
+메트릭 - 수집 루프 단계별 지연 히스토그램과 카운터
+고정 버킷 히스토그램(관측 1회 = bisect 1회 + 정수 증가)으로 20ms 틱 안에서도 부담 없이 기록하고
+/api/metrics에서 Prometheus 텍스트 형식으로 노출
+"""
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 지연 시간 버킷 (초): 50us ~ 1s, 20ms 틱 예산 주변을 촘촘하게
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.02, 0.05,
+    0.1, 0.25, 0.5, 1.0
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (누적이 아닌 버킷별 개수를 저장하고 출력 시 누적)"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)   # 마지막은 +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """(누적 버킷 개수, 합계, 개수)"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = []
+        running = 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return cumulative, total, running
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """현재 값 (직접 설정하거나 출력 시 콜백으로 조회)"""
+
+    def __init__(self, callback: Optional[Callable[[], float]] = None):
+        self.value = 0.0
+        self.callback = callback
+
+    def set(self, value: float):
+        self.value = value
+
+    def get(self) -> Optional[float]:
+        if self.callback is None:
+            return self.value
+        try:
+            return self.callback()
+        except Exception:
+            return None
+
+
+class MetricFamily:
+    """이름이 같은 메트릭 묶음 (레이블 값별 자식 메트릭)"""
+
+    def __init__(self, name: str, help_text: str, kind: str, factory: Callable[[], object],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[Tuple[str, str], ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        """레이블 값에 해당하는 자식 메트릭 (핫 패스에서는 모듈 로드 시 미리 받아 둘 것)"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 레이블이 맞지 않습니다: {sorted(labels)} != {sorted(self.labelnames)}")
+        key = tuple((name, str(labels[name])) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def remove(self, **labels):
+        key = tuple((name, str(labels[name])) for name in self.labelnames)
+        with self._lock:
+            self._children.pop(key, None)
+
+    # 레이블 없는 메트릭은 자식 하나를 그대로 사용
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = list(self._children.items())
+        for labels, child in children:
+            if self.kind == "histogram":
+                cumulative, total, count = child.snapshot()
+                bounds = list(child.buckets) + [float("inf")]
+                for bound, value in zip(bounds, cumulative):
+                    lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {value}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+            elif self.kind == "counter":
+                lines.append(f"{self.name}{_format_labels(labels)} {_format_value(child.value)}")
+            else:
+                value = child.get()
+                if value is not None:
+                    lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 등록 및 Prometheus 텍스트 출력"""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, help_text: str, kind: str, factory, labelnames) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = MetricFamily(name, help_text, kind, factory, labelnames)
+                self._families[name] = family
+            elif family.kind != kind:
+                raise ValueError(f"이미 다른 종류로 등록된 메트릭입니다: {name}")
+            return family
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> MetricFamily:
+        return self._register(name, help_text, "histogram", lambda: Histogram(buckets), labelnames)
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(name, help_text, "counter", Counter, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+              callback: Optional[Callable[[], float]] = None) -> MetricFamily:
+        family = self._register(name, help_text, "gauge", lambda: Gauge(callback), labelnames)
+        if callback is not None and not labelnames:
+            family.labels().callback = callback
+        return family
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        with self._lock:
+            families = list(self._families.values())
+        lines = []
+        for family in families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 전역 레지스트리
+METRICS = MetricsRegistry()
+
+# 수집 루프 단계별 소요 시간
+STAGE_SECONDS = METRICS.histogram(
+    "hbnu_stage_duration_seconds",
+    "수집 루프 단계별 소요 시간",
+    labelnames=("stage",)
+)
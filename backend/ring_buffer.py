@@ -0,0 +1,148 @@
+"""
+센서 링 버퍼 - 센서별 전체 샘플레이트 이력 보관
+NumPy 컬럼 배열을 미리 할당해 두고 컬렉터 스레드가 샘플마다 획득 시각(time.monotonic)과 함께 기록
+50Hz 스냅샷에서 버려지던 100Hz CNC/레이저 샘플을 구간 단위로 조회할 수 있게 함
+"""
+import math
+import threading
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+
+class SensorRingBuffer:
+    """NumPy 컬럼 기반 고정 크기 링 버퍼 (단일 쓰기 스레드, 다중 읽기)"""
+
+    def __init__(self, channels: List[str], capacity: int):
+        """
+        Args:
+            channels: 기록할 숫자 채널 이름 목록 (샘플 dict의 키)
+            capacity: 보관할 최대 샘플 수
+        """
+        if capacity <= 0:
+            raise ValueError(f"잘못된 버퍼 크기입니다: {capacity}")
+
+        self.channels = list(channels)
+        self.capacity = int(capacity)
+        self.timestamps = np.full(self.capacity, np.nan, dtype=np.float64)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.full(self.capacity, np.nan, dtype=np.float64)
+            for name in self.channels
+        }
+
+        self._lock = threading.Lock()
+        self._head = 0          # 다음 기록 위치
+        self.total_count = 0    # 누적 기록 샘플 수
+
+    def __len__(self) -> int:
+        return min(self.total_count, self.capacity)
+
+    def append(self, timestamp: float, data: Dict[str, Any]):
+        """샘플 한 개 기록 (숫자가 아닌 값은 NaN)"""
+        with self._lock:
+            i = self._head
+            self.timestamps[i] = timestamp
+            for name, column in self.columns.items():
+                value = data.get(name)
+                try:
+                    column[i] = float(value) if value is not None else math.nan
+                except (TypeError, ValueError):
+                    column[i] = math.nan
+            self._head = (i + 1) % self.capacity
+            self.total_count += 1
+
+    def _segments(self):
+        """시간 순서대로 정렬된 (시작, 끝) 인덱스 구간 목록 (최대 2개)"""
+        n = len(self)
+        if n < self.capacity:
+            return [(0, n)]
+        if self._head == 0:
+            return [(0, self.capacity)]
+        return [(self._head, self.capacity), (0, self._head)]
+
+    def window(self, seconds: Optional[float] = None, start: Optional[float] = None,
+               end: Optional[float] = None, last_n: Optional[int] = None,
+               channels: Optional[List[str]] = None, copy: bool = False) -> Dict[str, np.ndarray]:
+        """시간 구간 조회
+
+        Args:
+            seconds: 최신 샘플 기준 최근 N초 (start 미지정 시)
+            start, end: time.monotonic 기준 구간 [start, end]
+            last_n: 최근 N개 샘플
+            channels: 조회할 채널 (기본 전체)
+            copy: True면 잠금 안에서 복사본을 만들어 반환 (잠금 해제 후 직렬화하는 REST 응답 등)
+
+        Returns:
+            {"timestamp": ..., 채널명: ...} 배열 dict.
+            구간이 링 경계를 넘지 않으면 내부 버퍼의 뷰(복사 없음)를 반환하고,
+            경계를 넘으면 해당 구간만 이어 붙여 반환함.
+            뷰는 쓰기 스레드가 덮어쓰기 전까지만 유효하므로 오래 보관할 경우 복사할 것
+        """
+        names = self.channels if channels is None else [c for c in channels if c in self.columns]
+
+        with self._lock:
+            segments = self._segments()
+            n = len(self)
+            if n == 0:
+                return self._pack([], names, copy)
+
+            if last_n is not None:
+                keep = max(0, min(int(last_n), n))
+                slices = self._tail_slices(segments, keep)
+            else:
+                if start is None and seconds is not None:
+                    latest = self.timestamps[(self._head - 1) % self.capacity]
+                    start = latest - seconds
+                slices = []
+                for lo, hi in segments:
+                    ts = self.timestamps[lo:hi]
+                    a = lo + (int(np.searchsorted(ts, start, side="left")) if start is not None else 0)
+                    b = lo + (int(np.searchsorted(ts, end, side="right")) if end is not None else hi - lo)
+                    if b > a:
+                        slices.append((a, b))
+
+            return self._pack(slices, names, copy)
+
+    @staticmethod
+    def _tail_slices(segments, keep: int):
+        """시간 순서 구간에서 마지막 keep개 샘플에 해당하는 인덱스 구간"""
+        slices = []
+        for lo, hi in reversed(segments):
+            if keep <= 0:
+                break
+            take = min(keep, hi - lo)
+            slices.insert(0, (hi - take, hi))
+            keep -= take
+        return slices
+
+    def _pack(self, slices, names, copy: bool = False) -> Dict[str, np.ndarray]:
+        """인덱스 구간을 결과 dict로 변환 (구간이 하나면 뷰, copy=True면 복사본)"""
+        arrays = [("timestamp", self.timestamps)] + [(name, self.columns[name]) for name in names]
+        if not slices:
+            return {key: np.empty(0, dtype=np.float64) for key, _ in arrays}
+        if len(slices) == 1:
+            a, b = slices[0]
+            if copy:
+                return {key: array[a:b].copy() for key, array in arrays}
+            return {key: array[a:b] for key, array in arrays}
+        return {
+            key: np.concatenate([array[a:b] for a, b in slices])
+            for key, array in arrays
+        }
+
+    def get_info(self) -> Dict[str, Any]:
+        """버퍼 상태 조회"""
+        with self._lock:
+            n = len(self)
+            oldest = newest = None
+            if n:
+                segments = self._segments()
+                oldest = float(self.timestamps[segments[0][0]])
+                newest = float(self.timestamps[(self._head - 1) % self.capacity])
+        return {
+            "channels": self.channels,
+            "capacity": self.capacity,
+            "size": n,
+            "total_count": self.total_count,
+            "span_seconds": round(newest - oldest, 3) if n else 0.0
+        }
@@ -1,322 +1,285 @@
 """
 센서 매니저 - 모든 센서의 통신과 데이터 수집을 관리
 기존 센서 통신 모듈들을 비동기적으로 관리
+센서 목록은 플러그인 레지스트리(backend.sensor_registry)에서 가져와 일반적으로 처리
 """
 import asyncio
 import sys
 import os
-from typing import Dict, Optional, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+import numpy as np
+
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 센서 모듈 임포트 (선택적)
-try:
-    from Sensors.camera_comm import CameraCommunication, CameraDB, CameraCollector
-    CAMERA_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ 카메라 모듈 임포트 실패: {e}")
-    CAMERA_AVAILABLE = False
-
-try:
-    from Sensors.laser_comm import LaserCommunication, LaserDB, IPG_Collector
-    LASER_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ 레이저 모듈 임포트 실패: {e}")
-    LASER_AVAILABLE = False
-
-try:
-    from Sensors.pyrometer_comm import PyrometerCommunication, PyrometerDB, PyrometerCollector
-    PYROMETER_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Pyrometer 모듈 임포트 실패: {e}")
-    PYROMETER_AVAILABLE = False
-
-try:
-    from Sensors.cnc_comm import CNCCommunication, CNC_DB, CNC_Collector
-    CNC_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ CNC 모듈 임포트 실패: {e}")
-    CNC_AVAILABLE = False
-
-# CNC Subprocess Manager (32비트 호환성)
-try:
-    from backend.cnc_subprocess_manager import CNCSubprocessManager
-    CNC_SUBPROCESS_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ CNC Subprocess Manager 임포트 실패: {e}")
-    CNC_SUBPROCESS_AVAILABLE = False
-
-try:
-    from Sensors.vision2 import HikCameraThread
-    HIKCAMERA_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ HikRobot 카메라 모듈 임포트 실패: {e}")
-    HIKCAMERA_AVAILABLE = False
+from backend.snapshot_register import SnapshotRegister
+from backend.ring_buffer import SensorRingBuffer
+from backend.sensor_registry import SensorRegistry, SensorPlugin, build_default_registry
+from backend.sensor_worker import ProcessSensorPlugin
 
 
 class SensorManager:
     """센서 통신 및 데이터 수집을 관리하는 클래스"""
     
-    def __init__(self, use_cnc_subprocess: bool = False, cnc_python_path: str = None):
+    # 센서 연결 상태 (sensor_states 값)
+    SENSOR_STATES = ("unavailable", "connecting", "connected", "failed", "reconnecting")
+    
+    def __init__(self, use_cnc_subprocess: bool = False, cnc_python_path: str = None,
+                 ring_seconds: float = 60.0, registry: Optional[SensorRegistry] = None,
+                 startup_timeout: float = 0.5, process_workers: str = "", simulate: bool = False):
         """
         Args:
             use_cnc_subprocess: True면 CNC를 subprocess로 실행 (32비트 호환성)
             cnc_python_path: 32비트 Python 실행 파일 경로
+            ring_seconds: 센서별 링 버퍼에 전체 샘플레이트로 보관할 시간 (초)
+            registry: 센서 플러그인 레지스트리 (기본: 기본 센서 + config/Sensors.ini)
+            startup_timeout: initialize()가 센서 연결을 기다리는 최대 시간 (초),
+                             이후에도 연결 중인 센서는 백그라운드에서 연결되는 대로 합류
+            process_workers: 별도 워커 프로세스에서 실행할 센서
+                             ("" 사용 안 함, "heavy" 프레임을 다루는 센서, "all" 전체, 또는 센서 이름 목록 "camera,laser")
+                             워커는 기본 레지스트리를 다시 구성하므로 registry 인자와 함께 사용하지 않음
+            simulate: True면 센서에 연결하지 않고 테스트 모드(더미 데이터)로 동작 (부하 테스트 등)
         """
         self.sensors = {}
         self.collectors = {}
         self.databases = {}
-        self.connection_status = {}
-        self.hik_cam_threads = {}
         self.use_cnc_subprocess = use_cnc_subprocess
-        self.cnc_subprocess_manager = None
+        self.test_mode = False
+        self.simulate = simulate
+        
+        self.registry = registry or build_default_registry(
+            use_cnc_subprocess=use_cnc_subprocess,
+            cnc_python_path=cnc_python_path
+        )
+        
+        # 워커 프로세스에서 실행할 플러그인 (공유 메모리로 샘플/프레임 전달)
+        self.process_plugins: Dict[str, ProcessSensorPlugin] = {}
+        registry_kwargs = {"use_cnc_subprocess": use_cnc_subprocess, "cnc_python_path": cnc_python_path}
+        for plugin in self._select_process_plugins(process_workers):
+            self.process_plugins[plugin.name] = ProcessSensorPlugin(plugin, registry_kwargs)
+        
+        # 레지스터 슬롯 이름 → sensor_data 키 (틱마다 순회)
+        self.data_keys: Dict[str, str] = self.registry.data_keys()
+        # 이미지 프레임을 함께 발행하는 센서 (sensor_data에는 프레임 대신 메타데이터만 포함)
+        self.frame_keys: Dict[str, str] = {
+            plugin.name: plugin.frame_key for plugin in self.registry if plugin.frame_key
+        }
+        self.hik_names: List[str] = [plugin.name for plugin in self.registry if plugin.kind == "hik_camera"]
+        self._data_template = {
+            "timestamp": None,
+            **{key: None for key in self.data_keys.values()},
+            "hik_camera_data": None
+        }
         
-        # 센서별 연결 상태
-        self.connection_status = {
-            "camera": False,
-            "laser": False,
-            "pyrometer": False,
-            "cnc": False,
-            "hik_camera_1": False,
-            "hik_camera_2": False
+        # 컬렉터 스레드가 발행하는 센서별 최신값 레지스터
+        self.register = SnapshotRegister()
+        
+        # 센서별 전체 샘플레이트 링 버퍼 (미리 할당, 레지스터 발행 시 기록, 샘플레이트 변동 여유 20%)
+        self.ring_buffers: Dict[str, SensorRingBuffer] = {
+            plugin.name: SensorRingBuffer(
+                plugin.channels,
+                capacity=int(plugin.sample_rate * ring_seconds * 1.2)
+            )
+            for plugin in self.registry if plugin.channels
         }
+        self.register.add_listener(self._record_sample)
+        
+        # 센서별 연결 상태 (connection_status: 데이터 사용 가능 여부, sensor_states: 상세 상태)
+        self.connection_status = {plugin.name: False for plugin in self.registry}
+        self.sensor_states = {plugin.name: "connecting" for plugin in self.registry}
+        self.attached_at: Dict[str, float] = {}   # 센서별 마지막 연결 시각 (time.monotonic)
+        self._ever_connected = False
+        
+        # 시작 시간 제한 및 센서별 시작 소요 시간 보고
+        self.startup_timeout = startup_timeout
+        self.startup_report: Dict[str, Dict[str, Any]] = {}
+        self.startup_ready_ms: Optional[float] = None
+        self._startup_started: Optional[float] = None
+        self._connect_tasks: Dict[str, asyncio.Task] = {}
+        # 느린 장비가 기본 스레드 풀을 점유하지 않도록 연결 전용 스레드 풀 사용
+        self._connect_executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self.registry)),
+            thread_name_prefix="sensor-connect"
+        )
+        self._closing = False
+    
+    def _select_process_plugins(self, spec: str):
+        """process_workers 설정에 해당하는 플러그인 목록"""
+        spec = (spec or "").strip().lower()
+        if not spec:
+            return []
+        if spec == "all":
+            selected = list(self.registry)
+        elif spec == "heavy":
+            selected = [p for p in self.registry if p.max_frame_bytes]
+        else:
+            names = {name.strip() for name in spec.split(',') if name.strip()}
+            unknown = names - set(self.registry.names())
+            if unknown:
+                print(f"⚠️ 워커 프로세스 설정에 알 수 없는 센서가 있습니다: {sorted(unknown)}")
+            selected = [p for p in self.registry if p.name in names]
+        return [p for p in selected if p.process_capable and p.available]
     
     async def initialize(self):
-        """모든 센서 초기화"""
+        """모든 센서 초기화 (최대 startup_timeout까지만 대기)"""
         print("🔧 센서 매니저 초기화 중...")
+        self._startup_started = time.monotonic()
         
-        # 각 센서를 비동기적으로 초기화
-        await asyncio.gather(
-            self._initialize_camera(),
-            self._initialize_laser(),
-            self._initialize_pyrometer(),
-            self._initialize_cnc(),
-            self._initialize_hik_cameras(),
-            return_exceptions=True
+        # 각 센서를 동시에 연결 시작
+        for plugin in self.registry:
+            self._connect_tasks[plugin.name] = asyncio.create_task(self._initialize_sensor(plugin))
+        
+        # 시간 제한 내에 끝나지 않은 센서는 "connecting" 상태로 백그라운드에서 계속 연결
+        _, pending = await asyncio.wait(
+            list(self._connect_tasks.values()), timeout=self.startup_timeout
         )
+        connecting = [name for name, state in self.sensor_states.items() if state == "connecting"]
+        for name in connecting:
+            print(f"⏳ {self.registry.get(name).label} 연결 중 (백그라운드에서 계속)")
         
-        # 테스트 모드 설정 (센서가 없는 경우)
-        self.test_mode = not any(self.connection_status.values())
-        if self.test_mode:
-            print("🧪 테스트 모드 활성화 (센서 없음)")
+        self.startup_ready_ms = round((time.monotonic() - self._startup_started) * 1000.0, 1)
+        self._update_test_mode()
         
-        print("✅ 센서 매니저 초기화 완료")
+        print(f"✅ 센서 매니저 초기화 완료 ({self.startup_ready_ms:.0f}ms, 연결 중 {len(pending)}개)")
     
-    async def _initialize_camera(self):
-        """Basler 카메라 초기화"""
-        if not CAMERA_AVAILABLE:
-            print("⚠️ 카메라 모듈이 사용 불가능합니다")
-            self.connection_status["camera"] = False
+    async def _initialize_sensor(self, plugin: SensorPlugin):
+        """플러그인 하나 초기화 (통신 객체 생성 → 컬렉터 시작)"""
+        name = plugin.name
+        started = time.monotonic()
+        if self.simulate:
+            self._finish_startup(name, "unavailable", started, error="시뮬레이션 모드")
             return
-            
-        try:
-            print("📷 Basler 카메라 연결 시도 중...")
-            
-            # 비동기 실행을 위해 스레드 풀 사용
-            loop = asyncio.get_event_loop()
-            
-            # 센서 초기화
-            self.sensors["camera"] = await loop.run_in_executor(
-                None, CameraCommunication
-            )
-            self.databases["camera"] = CameraDB()
-            self.collectors["camera"] = CameraCollector(
-                self.sensors["camera"], 
-                self.databases["camera"]
-            )
-            
-            # 컬렉터 시작
-            self.collectors["camera"].start()
-            self.connection_status["camera"] = True
-            
-            print("✅ Basler 카메라 연결 성공")
-            
-        except Exception as e:
-            print(f"❌ Basler 카메라 연결 실패: {e}")
-            self.connection_status["camera"] = False
-    
-    async def _initialize_laser(self):
-        """IPG 레이저 초기화"""
-        if not LASER_AVAILABLE:
-            print("⚠️ 레이저 모듈이 사용 불가능합니다")
-            self.connection_status["laser"] = False
+        if not plugin.available:
+            print(f"⚠️ {plugin.label} 모듈이 사용 불가능합니다")
+            self._finish_startup(name, "unavailable", started)
             return
-            
+        
         try:
-            print("🔴 IPG 레이저 연결 시도 중...")
-            
-            loop = asyncio.get_event_loop()
-            
-            self.sensors["laser"] = await loop.run_in_executor(
-                None, LaserCommunication
-            )
-            self.databases["laser"] = LaserDB()
-            self.collectors["laser"] = IPG_Collector(
-                self.sensors["laser"],
-                self.databases["laser"]
-            )
-            
-            self.collectors["laser"].start()
-            self.connection_status["laser"] = True
+            print(f"{plugin.icon} {plugin.label} 연결 시도 중...")
+            await self._attach(plugin)
+            self._finish_startup(name, "connected", started)
             
-            print("✅ IPG 레이저 연결 성공")
+            print(f"✅ {plugin.label} 연결 성공 ({self.startup_report[name]['elapsed_ms']:.0f}ms)")
             
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"❌ IPG 레이저 연결 실패: {e}")
-            self.connection_status["laser"] = False
+            print(f"❌ {plugin.label} 연결 실패: {e}")
+            self.connection_status[name] = False
+            self._finish_startup(name, "failed", started, error=str(e))
+        
+        # 시작 대기 이후 합류/실패한 센서는 테스트 모드 재평가
+        if self.startup_ready_ms is not None:
+            self._update_test_mode()
     
-    async def _initialize_pyrometer(self):
-        """Pyrometer 초기화"""
-        if not PYROMETER_AVAILABLE:
-            print("⚠️ Pyrometer 모듈이 사용 불가능합니다")
-            self.connection_status["pyrometer"] = False
-            return
-            
-        try:
-            print("🌡️ Pyrometer 연결 시도 중...")
-            
-            loop = asyncio.get_event_loop()
-            
-            self.sensors["pyrometer"] = await loop.run_in_executor(
-                None, PyrometerCommunication
-            )
-            self.databases["pyrometer"] = PyrometerDB()
-            self.collectors["pyrometer"] = PyrometerCollector(
-                self.sensors["pyrometer"],
-                self.databases["pyrometer"]
-            )
-            
-            self.collectors["pyrometer"].start()
-            self.connection_status["pyrometer"] = True
-            
-            print("✅ Pyrometer 연결 성공")
-            
-        except Exception as e:
-            print(f"❌ Pyrometer 연결 실패: {e}")
-            self.connection_status["pyrometer"] = False
+    async def _attach(self, plugin: SensorPlugin):
+        """통신 객체 생성 → 컬렉터 시작 (실패 시 예외)"""
+        name = plugin.name
+        # 통신 객체 생성은 블로킹이므로 연결 전용 스레드 풀에서 실행
+        loop = asyncio.get_running_loop()
+        created = await loop.run_in_executor(self._connect_executor, self._connect, plugin)
+        if created is None:
+            # 종료 중 연결 완료 → 폐기
+            raise asyncio.CancelledError()
+        comm, db, collector = created
+        
+        if comm is not None:
+            self.sensors[name] = comm
+        self.databases[name] = db
+        self.collectors[name] = collector
+        
+        # 컬렉터 시작
+        collector.start()
+        self.attached_at[name] = time.monotonic()
+        self.connection_status[name] = True
+        self.sensor_states[name] = "connected"
+        self._ever_connected = True
     
-    async def _initialize_cnc(self):
-        """HXApi CNC 초기화 (subprocess 옵션 지원)"""
-        # Subprocess 모드 사용
-        if self.use_cnc_subprocess:
-            if not CNC_SUBPROCESS_AVAILABLE:
-                print("⚠️ CNC Subprocess Manager가 사용 불가능합니다")
-                self.connection_status["cnc"] = False
-                return
-            
+    async def reconnect_sensor(self, name: str):
+        """센서 하나를 해제 후 다시 연결 (실패 시 예외, 링 버퍼/저장 이력은 유지)"""
+        plugin = self.registry.get(name)
+        self.sensor_states[name] = "reconnecting"
+        await self.detach_sensor(name)
+        await self._attach(plugin)
+        self._update_test_mode()
+    
+    async def detach_sensor(self, name: str):
+        """컬렉터 정지 및 통신 객체 종료 (블로킹 정리는 연결 스레드 풀에서 실행)"""
+        self.connection_status[name] = False
+        collector = self.collectors.pop(name, None)
+        sensor = self.sensors.pop(name, None)
+        self.databases.pop(name, None)
+        self.attached_at.pop(name, None)
+        
+        if collector is not None or sensor is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._connect_executor, self._release, name, collector, sensor)
+        # 끊긴 센서의 마지막 값이 실시간 데이터에 남지 않도록 슬롯 제거
+        self.register.clear(name)
+    
+    @staticmethod
+    def _release(name: str, collector, sensor):
+        """컬렉터 정지 → 통신 객체 종료 (연결 스레드에서 실행)"""
+        if collector is not None:
             try:
-                print("🔧 HXApi CNC 연결 시도 중... (Subprocess 모드)")
-                
-                # 설정 파일 경로 설정
-                config_path = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)),
-                    "config", "HXApi.ini"
-                )
-                
-                # 환경 변수에서 Python 경로 읽기 (선택적)
-                cnc_python_path = os.getenv('CNC_PYTHON_EXECUTABLE', None)
-                
-                # Subprocess Manager 생성 및 시작
-                self.cnc_subprocess_manager = CNCSubprocessManager(
-                    python_executable=cnc_python_path,
-                    config_path=config_path
-                )
-                self.cnc_subprocess_manager.start()
-                
-                # DB는 subprocess에서 직접 사용하지 않으므로 None
-                self.databases["cnc"] = None
-                self.connection_status["cnc"] = True
-                
-                print("✅ HXApi CNC 연결 성공 (Subprocess 모드)")
-                
+                collector.stop()
+                if hasattr(collector, 'join'):
+                    collector.join(timeout=2)
             except Exception as e:
-                print(f"❌ HXApi CNC 연결 실패 (Subprocess): {e}")
-                self.connection_status["cnc"] = False
-                return
-        
-        # 직접 DLL 로드 모드 (기존 방식)
-        else:
-            if not CNC_AVAILABLE:
-                print("⚠️ CNC 모듈이 사용 불가능합니다")
-                self.connection_status["cnc"] = False
-                return
-                
+                print(f"⚠️ {name} 컬렉터 정지 오류: {e}")
+        if sensor is not None and hasattr(sensor, 'close'):
             try:
-                print("🔧 HXApi CNC 연결 시도 중... (직접 DLL 로드)")
-                
-                loop = asyncio.get_event_loop()
-                
-                # 설정 파일 경로 설정
-                config_path = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)),
-                    "config", "HXApi.ini"
-                )
-                
-                self.sensors["cnc"] = await loop.run_in_executor(
-                    None, CNCCommunication, config_path
-                )
-                self.databases["cnc"] = CNC_DB()
-                self.collectors["cnc"] = CNC_Collector(
-                    self.sensors["cnc"],
-                    self.databases["cnc"]
-                )
-                
-                self.collectors["cnc"].start()
-                self.connection_status["cnc"] = True
-                
-                print("✅ HXApi CNC 연결 성공 (직접 DLL 로드)")
-                
+                sensor.close()
             except Exception as e:
-                print(f"❌ HXApi CNC 연결 실패: {e}")
-                self.connection_status["cnc"] = False
+                print(f"⚠️ {name} 센서 연결 종료 오류: {e}")
     
-    async def _initialize_hik_cameras(self):
-        """HikRobot 카메라 2대 초기화"""
-        if not HIKCAMERA_AVAILABLE:
-            print("⚠️ HikRobot 카메라 모듈이 사용 불가능합니다")
-            self.connection_status["hik_camera_1"] = False
-            self.connection_status["hik_camera_2"] = False
-            return
-            
+    def _connect(self, plugin: SensorPlugin):
+        """통신 객체 생성 (연결 스레드에서 실행)"""
+        factory = self.process_plugins.get(plugin.name, plugin)
         try:
-            print("📹 HikRobot 카메라 연결 시도 중...")
-            
-            # HikRobot 카메라 1
-            def push_hik_frame_1(frame):
-                self.latest_frame1 = frame
-            
-            def push_hik_frame_2(frame):
-                self.latest_frame2 = frame
-            
-            self.hik_cam_threads["hik_camera_1"] = HikCameraThread(
-                "02J81094725", 
-                on_new_frame=push_hik_frame_1, 
-                parent=self
-            )
-            self.hik_cam_threads["hik_camera_1"].start()
-            self.connection_status["hik_camera_1"] = True
-            
-            # HikRobot 카메라 2
-            self.hik_cam_threads["hik_camera_2"] = HikCameraThread(
-                "02J75405689", 
-                on_new_frame=push_hik_frame_2, 
-                parent=self
-            )
-            self.hik_cam_threads["hik_camera_2"].start()
-            self.connection_status["hik_camera_2"] = True
-            
-            # 프레임 저장 변수 초기화
-            self.latest_frame1 = None
-            self.latest_frame2 = None
-            
-            print("✅ HikRobot 카메라 연결 성공")
-            
-        except Exception as e:
-            print(f"❌ HikRobot 카메라 연결 실패: {e}")
-            self.connection_status["hik_camera_1"] = False
-            self.connection_status["hik_camera_2"] = False
+            created = factory.create(self.register)
+        except SystemExit as e:
+            # 센서 모듈이 설정 파일 오류 시 sys.exit()를 호출함 → 서버 종료 대신 연결 실패로 처리
+            raise RuntimeError(f"센서 모듈이 종료를 요청했습니다 (code={e.code})")
+        
+        comm, _, collector = created
+        if self._closing:
+            # 종료 중 연결 완료 (워커 프로세스 모드는 컬렉터가 프로세스를 소유하므로 함께 정지)
+            self._release(plugin.name, collector if plugin.name in self.process_plugins else None, comm)
+            return None
+        if getattr(comm, 'activate', True) is False:
+            if comm is not None and hasattr(comm, 'close'):
+                comm.close()
+            # 통신 객체는 생성됐지만 장비가 응답하지 않음 (예: 레이저 소켓 연결 실패)
+            raise RuntimeError("장비가 응답하지 않습니다")
+        return created
+    
+    def _finish_startup(self, name: str, state: str, started: float, error: Optional[str] = None):
+        """센서 상태 갱신 및 시작 소요 시간 기록"""
+        self.sensor_states[name] = state
+        self.startup_report[name] = {
+            "state": state,
+            "elapsed_ms": round((time.monotonic() - started) * 1000.0, 1),
+            "background": self.startup_ready_ms is not None,
+            "error": error
+        }
+    
+    def _update_test_mode(self):
+        """테스트 모드 설정 (연결된 센서도, 연결 중인 센서도 없는 경우)
+
+        한 번이라도 센서가 연결된 뒤에는 센서가 끊겨도 더미 데이터로 전환하지 않음
+        """
+        test_mode = (not self._ever_connected and
+                     "connecting" not in self.sensor_states.values())
+        if test_mode and not self.test_mode:
+            print("🧪 테스트 모드 활성화 (센서 없음)")
+        elif self.test_mode and not test_mode:
+            print("🧪 테스트 모드 해제 (센서 연결됨)")
+        self.test_mode = test_mode
     
     async def collect_all_data(self) -> Dict[str, Any]:
         """
@@ -325,17 +288,11 @@ class SensorManager:
         """
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         
-        sensor_data = {
-            "timestamp": timestamp,
-            "camera_data": None,
-            "laser_data": None,
-            "pyrometer_data": None,
-            "cnc_data": None,
-            "hik_camera_data": None
-        }
+        sensor_data = dict(self._data_template)
+        sensor_data["timestamp"] = timestamp
         
         # 테스트 모드에서 더미 데이터 생성
-        if getattr(self, 'test_mode', False):
+        if self.test_mode:
             import random
             import time
             current_time = time.time()
@@ -370,130 +327,110 @@ class SensorManager:
             })
             return sensor_data
         
-        # 각 센서 DB에서 최신 데이터 조회 (비동기 실행으로 블로킹 방지)
-        loop = asyncio.get_event_loop()
-        
-        # 카메라 데이터
-        if self.connection_status["camera"] and "camera" in self.databases:
-            try:
-                camera_data = await loop.run_in_executor(
-                    None, self.databases["camera"].retrieve_data
-                )
-                if camera_data:
-                    sensor_data["camera_data"] = camera_data
-            except Exception as e:
-                print(f"⚠️ 카메라 데이터 수집 오류: {e}")
-        
-        # 레이저 데이터
-        if self.connection_status["laser"] and "laser" in self.databases:
-            try:
-                laser_data = await loop.run_in_executor(
-                    None, self.databases["laser"].retrieve_data
-                )
-                if laser_data:
-                    sensor_data["laser_data"] = laser_data
-            except Exception as e:
-                print(f"⚠️ 레이저 데이터 수집 오류: {e}")
+        # 레지스터에서 모든 센서의 최신값을 한 번에 조회 (스레드 풀 왕복 없음)
+        snapshots = self.register.snapshot()
         
-        # Pyrometer 데이터
-        if self.connection_status["pyrometer"] and "pyrometer" in self.databases:
-            try:
-                pyrometer_data = await loop.run_in_executor(
-                    None, self.databases["pyrometer"].retrieve_data
-                )
-                if pyrometer_data:
-                    sensor_data["pyrometer_data"] = pyrometer_data
-            except Exception as e:
-                print(f"⚠️ Pyrometer 데이터 수집 오류: {e}")
+        for name, key in self.data_keys.items():
+            snap = snapshots.get(name)
+            if snap is not None and self.connection_status[name] and snap.data:
+                frame_key = self.frame_keys.get(name)
+                sensor_data[key] = self._frame_metadata(snap, frame_key) if frame_key else snap.data
         
-        # CNC 데이터
-        if self.connection_status["cnc"]:
-            try:
-                if self.use_cnc_subprocess and self.cnc_subprocess_manager:
-                    # Subprocess 모드: subprocess manager에서 데이터 가져오기
-                    cnc_data = self.cnc_subprocess_manager.get_latest_data()
-                    if cnc_data:
-                        sensor_data["cnc_data"] = cnc_data
-                elif "cnc" in self.databases and self.databases["cnc"]:
-                    # 직접 DLL 모드: DB에서 데이터 가져오기
-                    cnc_data = await loop.run_in_executor(
-                        None, self.databases["cnc"].retrieve_data
-                    )
-                    if cnc_data:
-                        sensor_data["cnc_data"] = cnc_data
-            except Exception as e:
-                print(f"⚠️ CNC 데이터 수집 오류: {e}")
-        
-        # HikRobot 카메라 데이터
-        if (self.connection_status["hik_camera_1"] and 
-            self.connection_status["hik_camera_2"]):
-            try:
-                hik_data = self._get_combined_hik_image()
-                if hik_data:
-                    sensor_data["hik_camera_data"] = hik_data
-            except Exception as e:
-                print(f"⚠️ HikRobot 데이터 수집 오류: {e}")
+        # HikRobot 카메라 데이터 (영상은 /api/video/hik, 여기서는 메타데이터만)
+        if len(self.hik_names) >= 2:
+            hik_data = self._get_hik_metadata(snapshots)
+            if hik_data:
+                sensor_data["hik_camera_data"] = hik_data
         
         return sensor_data
     
-    def _get_combined_hik_image(self) -> Optional[Dict]:
-        """HikRobot 2대 이미지를 합쳐서 반환"""
-        if hasattr(self, 'latest_frame1') and hasattr(self, 'latest_frame2'):
-            if self.latest_frame1 is not None and self.latest_frame2 is not None:
-                import cv2
-                try:
-                    h1, w1 = self.latest_frame1.shape[:2]
-                    h2, w2 = self.latest_frame2.shape[:2]
-                    h = max(h1, h2)
-                    
-                    f1 = cv2.resize(self.latest_frame1, (w1, h))
-                    f2 = cv2.resize(self.latest_frame2, (w2, h))
-                    combined = cv2.hconcat([f1, f2])
-                    
-                    return {
-                        "combined_image": combined,
-                        "frame1_shape": self.latest_frame1.shape,
-                        "frame2_shape": self.latest_frame2.shape,
-                        "combined_shape": combined.shape
-                    }
-                except Exception as e:
-                    print(f"⚠️ HikRobot 이미지 합치기 오류: {e}")
-        return None
+    @staticmethod
+    def _frame_metadata(snap, frame_key: str) -> Dict[str, Any]:
+        """프레임 필드를 제외하고 frame_id/크기만 남긴 센서 데이터 (영상은 /api/video로 전송)"""
+        data = dict(snap.data)
+        frame = data.pop(frame_key, None)
+        available = isinstance(frame, np.ndarray)
+        data["image_available"] = available
+        data["frame_id"] = snap.seq if available else None
+        data["frame_shape"] = list(frame.shape) if available else None
+        return data
+    
+    def _get_hik_metadata(self, snapshots: Dict[str, Any]) -> Optional[Dict]:
+        """HikRobot 2대 프레임 메타데이터 (합성 이미지는 영상 스트림에서 인코딩 시 생성)"""
+        first, second = self.hik_names[:2]
+        if not (self.connection_status.get(first) and self.connection_status.get(second)):
+            return None
+        snap1, snap2 = snapshots.get(first), snapshots.get(second)
+        if snap1 is None or snap2 is None:
+            return None
+        frame1, frame2 = snap1.data, snap2.data
+        if not isinstance(frame1, np.ndarray) or not isinstance(frame2, np.ndarray):
+            return None
+        h = max(frame1.shape[0], frame2.shape[0])
+        return {
+            "hik_image_available": True,
+            "frame_id": [snap1.seq, snap2.seq],
+            "frame1_shape": list(frame1.shape),
+            "frame2_shape": list(frame2.shape),
+            "combined_shape": [h, frame1.shape[1] + frame2.shape[1]] + list(frame1.shape[2:] or frame2.shape[2:])
+        }
+    
+    def _record_sample(self, name: str, snap):
+        """레지스터 발행 리스너: 링 버퍼에 샘플 기록 (컬렉터 스레드에서 실행)"""
+        ring = self.ring_buffers.get(name)
+        if ring is not None and isinstance(snap.data, dict):
+            ring.append(snap.timestamp, snap.data)
+    
+    def get_sensor_window(self, name: str, seconds: Optional[float] = None,
+                          last_n: Optional[int] = None, copy: bool = False) -> Optional[Dict[str, Any]]:
+        """센서 링 버퍼에서 전체 샘플레이트 구간 조회 (copy: SensorRingBuffer.window 참고)"""
+        ring = self.ring_buffers.get(name)
+        if ring is None:
+            return None
+        return ring.window(seconds=seconds, last_n=last_n, copy=copy)
     
     async def get_connection_status(self) -> Dict[str, bool]:
         """연결 상태 조회"""
         return self.connection_status.copy()
     
+    def get_startup_report(self) -> Dict[str, Any]:
+        """센서별 시작 소요 시간 및 상태 조회 (연결 중인 센서는 현재까지 경과 시간)"""
+        now = time.monotonic()
+        sensors = {}
+        for name, state in self.sensor_states.items():
+            entry = self.startup_report.get(name)
+            if entry is None:
+                elapsed = (now - self._startup_started) * 1000.0 if self._startup_started else 0.0
+                entry = {"state": state, "elapsed_ms": round(elapsed, 1), "background": True, "error": None}
+            sensors[name] = entry
+        return {
+            "startup_timeout_s": self.startup_timeout,
+            "ready_ms": self.startup_ready_ms,
+            "test_mode": self.test_mode,
+            "sensors": sensors
+        }
+    
     async def cleanup(self):
         """리소스 정리"""
         print("🧹 센서 매니저 정리 중...")
         
-        # CNC Subprocess 정지
-        if self.cnc_subprocess_manager:
-            try:
-                self.cnc_subprocess_manager.stop()
-                print("✅ CNC subprocess 정지 완료")
-            except Exception as e:
-                print(f"⚠️ CNC subprocess 정지 오류: {e}")
+        # 아직 연결 중인 센서 취소 (연결 스레드가 끝나면 통신 객체를 스스로 닫음)
+        self._closing = True
+        for task in self._connect_tasks.values():
+            if not task.done():
+                task.cancel()
+        self._connect_executor.shutdown(wait=False)
         
-        # 모든 컬렉터 정지
+        # 모든 컬렉터 정지 (CNC subprocess 매니저, HikRobot 스레드 포함)
         for name, collector in self.collectors.items():
             try:
                 collector.stop()
-                collector.join(timeout=5)
+                if hasattr(collector, 'join'):
+                    collector.join(timeout=5)
                 print(f"✅ {name} 컬렉터 정지 완료")
             except Exception as e:
                 print(f"⚠️ {name} 컬렉터 정지 오류: {e}")
         
-        # HikRobot 카메라 정지
-        for name, thread in self.hik_cam_threads.items():
-            try:
-                thread.stop()
-                thread.join(timeout=5)
-                print(f"✅ {name} 스레드 정지 완료")
-            except Exception as e:
-                print(f"⚠️ {name} 스레드 정지 오류: {e}")
-        
         # 센서 연결 종료
         for name, sensor in self.sensors.items():
             try:
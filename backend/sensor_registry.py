@@ -0,0 +1,458 @@
+"""
+센서 플러그인 레지스트리 - 센서 추가 시 새 코드 경로 없이 등록만으로 확장
+각 플러그인이 통신 클래스, 저장(DB) 클래스, 컬렉터, 샘플레이트, 출력 스키마를 선언하고
+SensorManager(수집), SensorFusion(융합), DataStorage(정규화)는 레지스트리를 순회하여 일반적으로 처리
+추가 센서(파이로미터 2대째, 레이저 2대째, Optris 등)는 config/Sensors.ini에 섹션으로 등록
+"""
+import configparser as conf
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.fusion import DEFAULT_METHODS
+
+# 센서 모듈 임포트 (선택적)
+try:
+    from Sensors.camera_comm import CameraCommunication, CameraDB, CameraCollector
+    CAMERA_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ 카메라 모듈 임포트 실패: {e}")
+    CAMERA_AVAILABLE = False
+
+try:
+    from Sensors.laser_comm import LaserCommunication, LaserDB, IPG_Collector
+    LASER_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ 레이저 모듈 임포트 실패: {e}")
+    LASER_AVAILABLE = False
+
+try:
+    from Sensors.pyrometer_comm import PyrometerCommunication, PyrometerDB, PyrometerCollector
+    PYROMETER_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ Pyrometer 모듈 임포트 실패: {e}")
+    PYROMETER_AVAILABLE = False
+
+try:
+    from Sensors.cnc_comm import CNCCommunication, CNC_DB, CNC_Collector
+    CNC_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ CNC 모듈 임포트 실패: {e}")
+    CNC_AVAILABLE = False
+
+# CNC Subprocess Manager (32비트 호환성)
+try:
+    from backend.cnc_subprocess_manager import CNCSubprocessManager
+    CNC_SUBPROCESS_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ CNC Subprocess Manager 임포트 실패: {e}")
+    CNC_SUBPROCESS_AVAILABLE = False
+
+try:
+    from Sensors.vision2 import HikCameraThread
+    HIKCAMERA_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ HikRobot 카메라 모듈 임포트 실패: {e}")
+    HIKCAMERA_AVAILABLE = False
+
+try:
+    from Sensors.optris_client_with_fallback import OptrisCamera
+    OPTRIS_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ Optris 모듈 임포트 실패: {e}")
+    OPTRIS_AVAILABLE = False
+
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+
+class PollingCollector(threading.Thread):
+    """자체 컬렉터가 없는 통신 객체(get_data 제공)를 주기적으로 폴링하는 범용 컬렉터"""
+
+    def __init__(self, com, db, sample_rate=10, register=None, name="sensor"):
+        super().__init__(daemon=True)
+        self.com = com
+        self.db = db
+        self.running = True
+        self.sample_rate = sample_rate
+        self.register = register
+        self.name = name
+        # 읽기 오류 통계 (재연결 감시에서 사용)
+        self.error_count = 0
+        self.consecutive_errors = 0
+        self.last_error = None
+
+    def run(self):
+        while self.running:
+            loop_start = time.perf_counter()
+            try:
+                data = self.com.get_data()
+                self.consecutive_errors = 0
+            except Exception as e:
+                self.error_count += 1
+                self.consecutive_errors += 1
+                self.last_error = str(e)
+                data = None
+            read_time = time.monotonic()
+            if data:
+                if self.db is not None:
+                    self.db.store_data(data)
+                if self.register is not None:
+                    self.register.publish(self.name, data, read_time)
+            sleep_time = max(0, (1/self.sample_rate) - (time.perf_counter() - loop_start))
+            time.sleep(sleep_time)
+
+    def stop(self):
+        self.running = False
+        if hasattr(self.com, 'stop'):
+            self.com.stop()
+
+
+class SensorPlugin:
+    """센서 플러그인 정의
+
+    Attributes:
+        name: 센서 인스턴스 이름 (레지스터 슬롯, connection_status 키)
+        label: 로그 표시 이름
+        kind: 센서 종류 (camera, laser, pyrometer, cnc, hik_camera, optris)
+        sample_rate: 컬렉터 샘플레이트 (Hz), 링 버퍼 크기 계산에 사용
+        channels: 링 버퍼/융합 대상 숫자 채널
+        data_key: sensor_data 내 키 (None이면 sensor_data에 직접 포함하지 않음)
+        columns: 정규화 데이터에 포함할 채널 → 열 이름
+        flags: 정규화 데이터의 존재 여부 열 이름 → 검사할 필드 (값이 None이 아니면 True)
+        methods: 채널 → 보간 방식 ("zoh" / "linear")
+        frame_key: 발행 데이터 중 이미지 프레임 필드 (워커 프로세스 모드에서 공유 메모리로 전달)
+        max_frame_bytes: 프레임 최대 크기 (0이면 프레임 없음)
+        process_capable: 워커 프로세스에서 실행 가능 여부
+    """
+
+    def __init__(self, name: str, label: str, kind: str,
+                 comm_factory: Optional[Callable[[], Any]] = None,
+                 db_class: Optional[Callable[[], Any]] = None,
+                 collector_class: Optional[Callable[..., Any]] = None,
+                 sample_rate: float = 10.0,
+                 channels: Optional[List[str]] = None,
+                 data_key: Optional[str] = None,
+                 columns: Optional[Dict[str, str]] = None,
+                 flags: Optional[Dict[str, str]] = None,
+                 methods: Optional[Dict[str, str]] = None,
+                 available: bool = True,
+                 icon: str = "🔌",
+                 collector_kwargs: Optional[Dict[str, Any]] = None,
+                 frame_key: Optional[str] = None,
+                 max_frame_bytes: int = 0,
+                 process_capable: bool = True):
+        self.name = name
+        self.label = label
+        self.kind = kind
+        self.comm_factory = comm_factory
+        self.db_class = db_class
+        self.collector_class = collector_class
+        self.sample_rate = sample_rate
+        self.channels = list(channels or [])
+        self.data_key = data_key
+        self.columns = dict(columns or {})
+        self.flags = dict(flags or {})
+        self.methods = dict(methods or {})
+        self.available = available
+        self.icon = icon
+        self.collector_kwargs = dict(collector_kwargs or {})
+        self.frame_key = frame_key
+        self.max_frame_bytes = int(max_frame_bytes)
+        self.process_capable = process_capable
+
+    def create(self, register) -> Tuple[Any, Any, Any]:
+        """통신 객체, DB, 컬렉터 생성 (블로킹 - 스레드 풀에서 호출)
+
+        Returns:
+            (comm, db, collector), collector는 start()/stop()을 제공
+        """
+        comm = self.comm_factory() if self.comm_factory else None
+        db = self.db_class() if self.db_class else None
+        collector = self.collector_class(
+            comm, db, register=register, name=self.name, **self.collector_kwargs
+        )
+        return comm, db, collector
+
+    def __repr__(self) -> str:
+        return f"SensorPlugin(name={self.name!r}, kind={self.kind!r}, rate={self.sample_rate})"
+
+
+class SensorRegistry:
+    """센서 플러그인 레지스트리 (등록 순서 유지)"""
+
+    def __init__(self):
+        self._plugins: Dict[str, SensorPlugin] = {}
+
+    def register(self, plugin: SensorPlugin) -> SensorPlugin:
+        """플러그인 등록"""
+        if plugin.name in self._plugins:
+            raise ValueError(f"이미 등록된 센서입니다: {plugin.name}")
+        self._plugins[plugin.name] = plugin
+        return plugin
+
+    def get(self, name: str) -> Optional[SensorPlugin]:
+        return self._plugins.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._plugins)
+
+    def __iter__(self) -> Iterator[SensorPlugin]:
+        return iter(list(self._plugins.values()))
+
+    def __len__(self) -> int:
+        return len(self._plugins)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._plugins
+
+    def data_keys(self) -> Dict[str, str]:
+        """센서 이름 → sensor_data 키"""
+        return {p.name: p.data_key for p in self if p.data_key}
+
+    def fusion_methods(self) -> Dict[str, str]:
+        """센서.채널 → 보간 방식"""
+        return {
+            f"{p.name}.{channel}": method
+            for p in self for channel, method in p.methods.items()
+        }
+
+
+# ---------------------------------------------------------------------------
+# 센서 종류별 플러그인 생성 함수
+# name이 기본 이름과 같으면 기존 열 이름을, 다르면 "{name}_{채널}" 열 이름을 사용
+# ---------------------------------------------------------------------------
+
+def _column_names(name: str, kind: str, channels: List[str]) -> Dict[str, str]:
+    if name == kind:
+        return {channel: channel for channel in channels}
+    return {channel: f"{name}_{channel}" for channel in channels}
+
+
+def _methods_for(kind: str, channels: List[str]) -> Dict[str, str]:
+    return {channel: DEFAULT_METHODS.get(f"{kind}.{channel}", "zoh") for channel in channels}
+
+
+def _config_path(options: Dict[str, str], default_file: Optional[str]) -> Optional[str]:
+    config_file = options.get("config", default_file)
+    if not config_file:
+        return None
+    return config_file if os.path.isabs(config_file) else os.path.join(CONFIG_DIR, config_file)
+
+
+def make_camera_plugin(name: str = "camera", options: Optional[Dict[str, str]] = None) -> SensorPlugin:
+    """Basler 카메라 (용융풀 면적)"""
+    options = options or {}
+    # 재시도는 짧게 (연결 실패 시 재연결은 백그라운드에서 처리)
+    retries = int(options.get("retries", 2))
+    retry_delay = float(options.get("retry_delay", 0.2))
+    channels = ["melt_pool_area"]
+    return SensorPlugin(
+        name=name, label="Basler 카메라", kind="camera", icon="📷",
+        comm_factory=lambda: CameraCommunication(retries=retries, retry_delay=retry_delay),
+        db_class=CameraDB if CAMERA_AVAILABLE else None,
+        collector_class=CameraCollector if CAMERA_AVAILABLE else None,
+        sample_rate=30,
+        channels=channels,
+        data_key=f"{name}_data",
+        columns=_column_names(name, "camera", channels),
+        # 프레임은 sensor_data에서 제외되고 메타데이터(frame_shape)만 남음
+        flags={"image_available" if name == "camera" else f"{name}_image_available": "frame_shape"},
+        methods=_methods_for("camera", channels),
+        available=CAMERA_AVAILABLE,
+        frame_key="image",
+        max_frame_bytes=720 * 520 * 3
+    )
+
+
+def make_laser_plugin(name: str = "laser", options: Optional[Dict[str, str]] = None) -> SensorPlugin:
+    """IPG 레이저 (출력/설정 파워)"""
+    config_path = _config_path(options or {}, None)
+    channels = ["outpower", "setpower"]
+    return SensorPlugin(
+        name=name, label="IPG 레이저", kind="laser", icon="🔴",
+        comm_factory=lambda: LaserCommunication(config_path),
+        db_class=LaserDB if LASER_AVAILABLE else None,
+        collector_class=IPG_Collector if LASER_AVAILABLE else None,
+        sample_rate=100,
+        channels=channels,
+        data_key=f"{name}_data",
+        columns=_column_names(name, "laser", channels),
+        methods=_methods_for("laser", channels),
+        available=LASER_AVAILABLE
+    )
+
+
+def make_pyrometer_plugin(name: str = "pyrometer", options: Optional[Dict[str, str]] = None) -> SensorPlugin:
+    """Pyrometer (용융풀/1색/2색 온도)"""
+    config_path = _config_path(options or {}, None)
+    channels = ["mpt", "1ct", "2ct"]
+    return SensorPlugin(
+        name=name, label="Pyrometer", kind="pyrometer", icon="🌡️",
+        comm_factory=lambda: PyrometerCommunication(config_path),
+        db_class=PyrometerDB if PYROMETER_AVAILABLE else None,
+        collector_class=PyrometerCollector if PYROMETER_AVAILABLE else None,
+        sample_rate=20,
+        channels=channels,
+        data_key=f"{name}_data",
+        columns=_column_names(name, "pyrometer", channels),
+        methods=_methods_for("pyrometer", channels),
+        available=PYROMETER_AVAILABLE
+    )
+
+
+CNC_CHANNELS = [
+    "curpos_x", "curpos_y", "curpos_z", "curpos_a", "curpos_c",
+    "macpos_x", "macpos_y", "macpos_z", "macpos_a", "macpos_c",
+    "rempos_x", "rempos_y", "rempos_z", "rempos_a", "rempos_c",
+    "oper_time", "total_oper_time",
+    "feed_override", "rapid_override", "feed_rate"
+]
+
+
+class _CNCSubprocessPlugin(SensorPlugin):
+    """CNC를 32비트 subprocess로 실행하는 플러그인 (subprocess 매니저가 컬렉터 역할)"""
+
+    def __init__(self, python_executable: Optional[str], config_path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.python_executable = python_executable
+        self.config_path = config_path
+
+    def create(self, register):
+        manager = CNCSubprocessManager(
+            python_executable=self.python_executable,
+            config_path=self.config_path,
+            register=register,
+            name=self.name
+        )
+        return None, None, manager
+
+
+def make_cnc_plugin(name: str = "cnc", options: Optional[Dict[str, str]] = None,
+                    use_subprocess: bool = False, python_executable: Optional[str] = None) -> SensorPlugin:
+    """HXApi CNC (좌표/이송 정보), subprocess 모드 지원"""
+    config_path = _config_path(options or {}, "HXApi.ini")
+    # 정규화 데이터에는 현재 좌표만 포함
+    position_channels = ["curpos_x", "curpos_y", "curpos_z", "curpos_a", "curpos_c"]
+    common = dict(
+        name=name, kind="cnc", icon="🔧",
+        sample_rate=100,
+        channels=CNC_CHANNELS,
+        data_key=f"{name}_data",
+        columns=_column_names(name, "cnc", position_channels),
+        methods=_methods_for("cnc", CNC_CHANNELS)
+    )
+    if use_subprocess:
+        return _CNCSubprocessPlugin(
+            python_executable, config_path,
+            label="HXApi CNC (Subprocess 모드)",
+            available=CNC_SUBPROCESS_AVAILABLE,
+            process_capable=False,
+            **common
+        )
+    return SensorPlugin(
+        label="HXApi CNC (직접 DLL 로드)",
+        comm_factory=lambda: CNCCommunication(config_path),
+        db_class=CNC_DB if CNC_AVAILABLE else None,
+        collector_class=CNC_Collector if CNC_AVAILABLE else None,
+        available=CNC_AVAILABLE,
+        **common
+    )
+
+
+class _HikCameraPlugin(SensorPlugin):
+    """HikRobot 카메라 (프레임을 레지스터로 발행, 두 대의 합성 이미지는 SensorManager에서 처리)"""
+
+    def __init__(self, serial: str, **kwargs):
+        super().__init__(**kwargs)
+        self.serial = serial
+
+    def create(self, register):
+        name = self.name
+
+        def push_frame(frame):
+            register.publish(name, frame)
+
+        return None, None, HikCameraThread(self.serial, on_new_frame=push_frame, parent=None)
+
+
+def make_hik_camera_plugin(name: str, options: Optional[Dict[str, str]] = None) -> SensorPlugin:
+    """HikRobot 카메라 (serial 옵션 필요)"""
+    options = options or {}
+    return _HikCameraPlugin(
+        options.get("serial", ""),
+        name=name, label=f"HikRobot 카메라 ({name})", kind="hik_camera", icon="📹",
+        sample_rate=float(options.get("fps", 30)),
+        available=HIKCAMERA_AVAILABLE,
+        # HikCameraThread 수신 버퍼 크기 (Mono8 1920×1080)
+        max_frame_bytes=1920 * 1080
+    )
+
+
+def make_optris_plugin(name: str = "optris", options: Optional[Dict[str, str]] = None) -> SensorPlugin:
+    """Optris 열화상 카메라 (중심/최대 온도)"""
+    options = options or {}
+    dll_path = options.get("dll_path") or None
+    channels = ["center_temp", "max_temp"]
+    return SensorPlugin(
+        name=name, label="Optris 열화상 카메라", kind="optris", icon="🌡️",
+        comm_factory=lambda: OptrisCamera(dll_path),
+        collector_class=PollingCollector,
+        sample_rate=10,
+        channels=channels,
+        data_key=f"{name}_data",
+        columns={channel: f"{name}_{channel}" for channel in channels},
+        methods={channel: "linear" for channel in channels},
+        available=OPTRIS_AVAILABLE,
+        collector_kwargs={"sample_rate": 10}
+    )
+
+
+SENSOR_TYPES: Dict[str, Callable[..., SensorPlugin]] = {
+    "camera": make_camera_plugin,
+    "laser": make_laser_plugin,
+    "pyrometer": make_pyrometer_plugin,
+    "cnc": make_cnc_plugin,
+    "hik_camera": make_hik_camera_plugin,
+    "optris": make_optris_plugin,
+}
+
+
+def build_default_registry(use_cnc_subprocess: bool = False, cnc_python_path: Optional[str] = None,
+                           config_path: Optional[str] = None) -> SensorRegistry:
+    """기본 센서 + config/Sensors.ini에 등록된 추가 센서로 레지스트리 구성
+
+    정규화 데이터 열 순서가 기존 CSV와 같도록 CNC → Pyrometer → 레이저 → 카메라 순으로 등록
+    """
+    registry = SensorRegistry()
+    registry.register(make_cnc_plugin(use_subprocess=use_cnc_subprocess, python_executable=cnc_python_path))
+    registry.register(make_pyrometer_plugin())
+    registry.register(make_laser_plugin())
+    registry.register(make_camera_plugin())
+    registry.register(make_hik_camera_plugin("hik_camera_1", {"serial": "02J81094725"}))
+    registry.register(make_hik_camera_plugin("hik_camera_2", {"serial": "02J75405689"}))
+
+    # 추가 센서 (예: [pyrometer_2] type = pyrometer, config = Pyrometer_2.ini)
+    config_path = config_path or os.path.join(CONFIG_DIR, "Sensors.ini")
+    if os.path.exists(config_path):
+        config = conf.ConfigParser()
+        config.read(config_path, encoding="utf-8")
+        for section in config.sections():
+            options = dict(config.items(section))
+            if options.get("enabled", "true").lower() != "true":
+                continue
+            factory = SENSOR_TYPES.get(options.get("type", ""))
+            if factory is None:
+                print(f"⚠️ 알 수 없는 센서 종류입니다: [{section}] type={options.get('type')}")
+                continue
+            try:
+                registry.register(factory(section, options))
+            except Exception as e:
+                print(f"⚠️ 센서 플러그인 등록 실패 ({section}): {e}")
+
+    return registry
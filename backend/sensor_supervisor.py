@@ -0,0 +1,213 @@
+"""
+센서 감시자 - 멈추거나 끊긴 컬렉터를 감지하여 지수 백오프로 재연결
+컬렉터 스레드 종료, 통신 비활성(activate=False), 연속 읽기 오류, 새 샘플 없음(staleness)을 감지하면
+통신 객체와 컬렉터를 다시 생성하고 connection_status를 실시간으로 갱신
+링 버퍼와 저장 이력은 SensorManager에 남아 있으므로 백엔드 재시작 없이 복구됨
+"""
+import asyncio
+import time
+from typing import Dict, Any, Optional
+
+
+class SensorHealth:
+    """센서별 재연결 통계"""
+
+    def __init__(self):
+        self.reconnect_count = 0        # 재연결 성공 횟수
+        self.failure_count = 0          # 끊김 감지 횟수
+        self.attempt_count = 0          # 재연결 시도 횟수 (실패 포함)
+        self.total_downtime = 0.0       # 누적 다운타임 (초, 현재 진행 중인 구간 제외)
+        self.down_since: Optional[float] = None
+        self.next_attempt: Optional[float] = None
+        self.backoff: Optional[float] = None
+        self.recovered_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        current = (now - self.down_since) if self.down_since is not None else 0.0
+        return {
+            "reconnect_count": self.reconnect_count,
+            "failure_count": self.failure_count,
+            "attempt_count": self.attempt_count,
+            "downtime_s": round(self.total_downtime + current, 3),
+            "current_downtime_s": round(current, 3),
+            "next_retry_in_s": round(max(0.0, self.next_attempt - now), 3) if self.next_attempt else None,
+            "last_error": self.last_error
+        }
+
+
+class SensorSupervisor:
+    """컬렉터 상태 감시 및 재연결 (이벤트 루프 태스크)"""
+
+    def __init__(self, sensor_manager, check_interval: float = 0.5, stale_timeout: float = 2.0,
+                 error_threshold: int = 5, backoff_initial: float = 1.0, backoff_max: float = 30.0):
+        """
+        Args:
+            sensor_manager: 감시할 SensorManager
+            check_interval: 상태 점검 주기 (초)
+            stale_timeout: 새 샘플이 이 시간 이상 없으면 멈춘 것으로 판단 (초)
+            error_threshold: 연속 읽기 오류가 이 횟수 이상이면 끊긴 것으로 판단
+            backoff_initial: 첫 재연결 대기 시간 (초), 실패할 때마다 2배
+            backoff_max: 최대 재연결 대기 시간 (초)
+        """
+        self.sensor_manager = sensor_manager
+        self.check_interval = check_interval
+        self.stale_timeout = stale_timeout
+        self.error_threshold = error_threshold
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+
+        self.health: Dict[str, SensorHealth] = {
+            plugin.name: SensorHealth() for plugin in sensor_manager.registry
+        }
+        self._task: Optional[asyncio.Task] = None
+        # 진행 중인 재연결 (느린 센서가 다른 센서 점검을 막지 않도록 센서별 태스크)
+        self._reconnects: Dict[str, asyncio.Task] = {}
+
+    def start(self):
+        """감시 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """감시 태스크 정지 (진행 중인 재연결 취소)"""
+        for task in self._reconnects.values():
+            task.cancel()
+        await asyncio.gather(*self._reconnects.values(), return_exceptions=True)
+        self._reconnects.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ 센서 감시 오류: {e}")
+            await asyncio.sleep(self.check_interval)
+
+    async def check(self):
+        """모든 센서 한 번 점검 (끊김 감지 → 백오프 대기 → 재연결)"""
+        manager = self.sensor_manager
+        now = time.monotonic()
+
+        for name, health in self.health.items():
+            if name in self._reconnects:
+                continue
+            state = manager.sensor_states.get(name)
+
+            if state == "connected":
+                reason = self._diagnose(name, now)
+                if reason is None:
+                    continue
+                print(f"⚠️ {name} 센서 이상 감지: {reason}")
+                health.failure_count += 1
+                health.last_error = reason
+                health.down_since = now
+                if health.recovered_at is not None and now - health.recovered_at < self.backoff_max:
+                    # 재연결 직후 다시 끊김 (불안정) → 이전 백오프 유지
+                    health.next_attempt = now + health.backoff
+                    health.backoff = min(health.backoff * 2, self.backoff_max)
+                else:
+                    # 첫 재연결은 바로 시도
+                    health.backoff = self.backoff_initial
+                    health.next_attempt = now
+                manager.connection_status[name] = False
+                manager.sensor_states[name] = "reconnecting"
+
+            elif state in ("failed", "reconnecting"):
+                if health.down_since is None:
+                    # 시작 시 연결 실패한 센서
+                    health.down_since = now
+                    health.backoff = self.backoff_initial
+                    health.next_attempt = now + self.backoff_initial
+                    health.last_error = manager.startup_report.get(name, {}).get("error")
+                    manager.sensor_states[name] = "reconnecting"
+            else:
+                # unavailable(모듈 없음), connecting(시작 연결 진행 중)은 감시하지 않음
+                continue
+
+            if health.next_attempt is not None and now >= health.next_attempt:
+                task = asyncio.create_task(self._reconnect(name, health))
+                self._reconnects[name] = task
+                task.add_done_callback(lambda _, name=name: self._reconnects.pop(name, None))
+
+    def _diagnose(self, name: str, now: float) -> Optional[str]:
+        """연결된 센서의 이상 원인 (정상이면 None)"""
+        manager = self.sensor_manager
+        collector = manager.collectors.get(name)
+        comm = manager.sensors.get(name)
+
+        if collector is None:
+            return "컬렉터 없음"
+        if hasattr(collector, 'is_running'):
+            # CNC subprocess 매니저: 프로세스 종료 여부
+            if not collector.is_running():
+                return "프로세스 종료"
+        elif hasattr(collector, 'is_alive') and not collector.is_alive():
+            return "컬렉터 스레드 종료"
+        # 워커 프로세스 모드에서는 컬렉터가 워커의 통신 상태를 전달
+        if getattr(comm if comm is not None else collector, 'activate', True) is False:
+            return "통신 비활성"
+
+        errors = getattr(collector, 'consecutive_errors', 0)
+        if errors >= self.error_threshold:
+            last_error = getattr(collector, 'last_error', None)
+            return f"연속 읽기 오류 {errors}회 ({last_error})"
+
+        # 마지막 샘플(또는 연결 시각) 이후 경과 시간
+        snap = manager.register.get(name)
+        reference = manager.attached_at.get(name, now)
+        if snap is not None:
+            reference = max(reference, snap.timestamp)
+        if now - reference > self.stale_timeout:
+            return f"{now - reference:.1f}초간 새 샘플 없음"
+        return None
+
+    async def _reconnect(self, name: str, health: SensorHealth):
+        """재연결 1회 시도 (실패 시 백오프 2배)"""
+        plugin = self.sensor_manager.registry.get(name)
+        health.attempt_count += 1
+        print(f"🔄 {plugin.label} 재연결 시도 ({health.attempt_count}회차)...")
+        try:
+            await self.sensor_manager.reconnect_sensor(name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            health.last_error = str(e)
+            health.next_attempt = time.monotonic() + health.backoff
+            print(f"❌ {plugin.label} 재연결 실패: {e} ({health.backoff:.1f}초 후 재시도)")
+            health.backoff = min(health.backoff * 2, self.backoff_max)
+            return
+
+        now = time.monotonic()
+        health.reconnect_count += 1
+        health.total_downtime += now - health.down_since
+        print(f"✅ {plugin.label} 재연결 성공 (다운타임 {now - health.down_since:.1f}초)")
+        health.down_since = None
+        health.next_attempt = None
+        health.recovered_at = now
+
+    def get_stats(self) -> Dict[str, Any]:
+        """센서별 상태, 재연결 횟수, 다운타임 조회"""
+        now = time.monotonic()
+        manager = self.sensor_manager
+        return {
+            "stale_timeout_s": self.stale_timeout,
+            "error_threshold": self.error_threshold,
+            "sensors": {
+                name: {
+                    "state": manager.sensor_states.get(name),
+                    "connected": manager.connection_status.get(name, False),
+                    **health.to_dict(now)
+                }
+                for name, health in self.health.items()
+            }
+        }
@@ -0,0 +1,271 @@
+"""
+센서 워커 프로세스 - 컬렉터를 별도 프로세스에서 실행
+카메라 프레임 분석(OpenCV) 등 CPU 작업이 uvicorn 프로세스의 GIL을 점유하지 않도록
+워커가 공유 메모리 링(backend.shm_ring)에 샘플/프레임을 기록하고,
+백엔드의 ProcessCollector 리더 스레드가 이를 읽어 기존과 같이 SnapshotRegister로 발행
+(SensorManager, 링 버퍼, 융합, 감시자는 스레드 컬렉터와 동일한 인터페이스로 동작)
+"""
+import multiprocessing as mp
+import threading
+import time
+import traceback
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from backend.shm_ring import (
+    SharedSampleRing, SharedFrameRing,
+    H_ERROR_COUNT, H_CONSECUTIVE_ERRORS, H_ACTIVE
+)
+
+# 플랫폼과 무관하게 spawn 사용 (스레드가 있는 프로세스의 fork 회피, Windows와 동일 동작)
+_CONTEXT = mp.get_context("spawn")
+
+
+class SharedMemoryPublisher:
+    """워커 프로세스에서 SnapshotRegister 대신 컬렉터에 전달되는 발행 객체"""
+
+    def __init__(self, samples: Optional[SharedSampleRing], frames: Optional[SharedFrameRing],
+                 frame_key: Optional[str]):
+        self.samples = samples
+        self.frames = frames
+        self.frame_key = frame_key
+        self._warned = False
+
+    def publish(self, name: str, data: Any, timestamp: Optional[float] = None):
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if isinstance(data, np.ndarray):
+            # 프레임만 발행하는 센서 (HikRobot)
+            self._write_frame(timestamp, data)
+            return
+        if not isinstance(data, dict):
+            return
+        if self.frames is not None and self.frame_key:
+            frame = data.get(self.frame_key)
+            if isinstance(frame, np.ndarray):
+                # 프레임을 먼저 기록해 샘플을 읽을 때 같은 시각의 프레임이 준비되어 있도록 함
+                self._write_frame(timestamp, frame)
+        if self.samples is not None:
+            self.samples.write(timestamp, data)
+
+    def _write_frame(self, timestamp: float, frame: np.ndarray):
+        if self.frames is None:
+            return
+        if not self.frames.write(timestamp, frame) and not self._warned:
+            self._warned = True
+            print(f"⚠️ 프레임이 공유 메모리 슬롯보다 큽니다: {frame.shape} > {self.frames.max_bytes} bytes")
+
+
+def worker_main(name: str, registry_kwargs: Dict[str, Any], channels, sample_capacity: int,
+                sample_shm: Optional[str], frame_bytes: int, frame_shm: Optional[str],
+                frame_key: Optional[str], stop_event, conn):
+    """워커 프로세스 진입점: 플러그인 생성 → 컬렉터 실행 → 상태를 공유 메모리 헤더에 기록"""
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from backend.sensor_registry import build_default_registry
+
+    samples = SharedSampleRing(channels, sample_capacity, name=sample_shm, create=False) if sample_shm else None
+    frames = SharedFrameRing(frame_bytes, name=frame_shm, create=False) if frame_shm else None
+    publisher = SharedMemoryPublisher(samples, frames, frame_key)
+
+    # 플러그인은 람다를 포함하므로 전달하지 않고 워커에서 레지스트리를 다시 구성
+    try:
+        plugin = build_default_registry(**registry_kwargs).get(name)
+        if plugin is None:
+            raise RuntimeError(f"레지스트리에 없는 센서입니다: {name}")
+        comm, db, collector = plugin.create(publisher)
+        if getattr(comm, 'activate', True) is False:
+            raise RuntimeError("장비가 응답하지 않습니다")
+        collector.start()
+    except BaseException as e:
+        conn.send(("error", f"{e}"))
+        traceback.print_exc()
+        return
+    conn.send(("ready", os.getpid()))
+
+    parent = mp.parent_process()
+    try:
+        while not stop_event.wait(0.1):
+            if samples is not None:
+                active = getattr(comm, 'activate', None) if comm is not None else None
+                samples.set_status(
+                    getattr(collector, 'error_count', 0),
+                    getattr(collector, 'consecutive_errors', 0),
+                    active
+                )
+            # 컬렉터 종료 또는 백엔드 프로세스 종료 시 워커도 종료
+            if hasattr(collector, 'is_alive') and not collector.is_alive():
+                break
+            if parent is not None and not parent.is_alive():
+                break
+    finally:
+        try:
+            collector.stop()
+            if hasattr(collector, 'join'):
+                collector.join(timeout=2)
+            if comm is not None and hasattr(comm, 'close'):
+                comm.close()
+        except Exception as e:
+            print(f"⚠️ {name} 워커 정리 오류: {e}")
+        if samples is not None:
+            samples.close()
+        if frames is not None:
+            frames.close()
+
+
+class ProcessCollector:
+    """워커 프로세스 + 공유 메모리 리더 스레드 (SensorManager 컬렉터 인터페이스)"""
+
+    def __init__(self, plugin, registry_kwargs: Dict[str, Any], register,
+                 start_timeout: float = 30.0):
+        self.plugin = plugin
+        self.name = plugin.name
+        self.register = register
+        self.registry_kwargs = registry_kwargs
+        self.start_timeout = start_timeout
+
+        rate = max(1.0, float(plugin.sample_rate))
+        # 리더는 샘플 주기의 절반마다 폴링, 링은 2초분 (최소 64 슬롯)
+        self.poll_interval = min(0.02, max(0.002, 0.5 / rate))
+        self.samples = (SharedSampleRing(plugin.channels, max(64, int(rate * 2)))
+                        if plugin.channels else None)
+        self.frames = (SharedFrameRing(plugin.max_frame_bytes)
+                       if plugin.max_frame_bytes else None)
+
+        self.process = None
+        self._stop_event = _CONTEXT.Event()
+        self._reader: Optional[threading.Thread] = None
+        self._running = False
+        self._latest_frame = None
+
+    def spawn(self):
+        """워커 프로세스 시작 후 연결 완료까지 대기 (블로킹, 연결 스레드에서 호출)"""
+        parent_conn, child_conn = _CONTEXT.Pipe(duplex=False)
+        self.process = _CONTEXT.Process(
+            target=worker_main,
+            name=f"sensor-worker-{self.name}",
+            args=(
+                self.name, self.registry_kwargs,
+                self.plugin.channels, self.samples.capacity if self.samples else 0,
+                self.samples.name if self.samples else None,
+                self.frames.max_bytes if self.frames else 0,
+                self.frames.name if self.frames else None,
+                self.plugin.frame_key, self._stop_event, child_conn
+            ),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        try:
+            if parent_conn.poll(self.start_timeout):
+                status, detail = parent_conn.recv()
+            else:
+                status, detail = "error", f"워커 프로세스 시작 시간 초과 ({self.start_timeout}초)"
+        except EOFError:
+            status, detail = "error", "워커 프로세스가 비정상 종료되었습니다"
+        finally:
+            parent_conn.close()
+
+        if status != "ready":
+            self.stop()
+            raise RuntimeError(detail)
+
+    # --- 컬렉터 인터페이스 ---
+
+    def start(self):
+        """리더 스레드 시작"""
+        self._running = True
+        self._reader = threading.Thread(target=self._read_loop, name=f"shm-reader-{self.name}", daemon=True)
+        self._reader.start()
+
+    def stop(self):
+        """워커 프로세스 정지 → 리더 정지 → 공유 메모리 해제"""
+        self._stop_event.set()
+        if self.process is not None:
+            self.process.join(timeout=3)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=1)
+        self._running = False
+        if self._reader is not None and self._reader is not threading.current_thread():
+            self._reader.join(timeout=1)
+        for ring in (self.samples, self.frames):
+            if ring is not None and ring.shm is not None:
+                ring.close()
+                ring.unlink()
+                ring.shm = None
+
+    def is_running(self) -> bool:
+        """워커 프로세스 실행 여부 (감시자에서 사용)"""
+        return self.process is not None and self.process.is_alive()
+
+    def _status(self, field: int, default: int) -> int:
+        """워커가 공유 메모리 헤더에 기록한 상태 값"""
+        if self.samples is None or self.samples.header is None:
+            return default
+        return int(self.samples.header[field])
+
+    @property
+    def error_count(self) -> int:
+        return self._status(H_ERROR_COUNT, 0)
+
+    @property
+    def consecutive_errors(self) -> int:
+        return self._status(H_CONSECUTIVE_ERRORS, 0)
+
+    @property
+    def activate(self) -> Optional[bool]:
+        """워커 통신 객체 activate (알 수 없으면 None)"""
+        value = self._status(H_ACTIVE, -1)
+        return None if value < 0 else bool(value)
+
+    @property
+    def last_error(self) -> Optional[str]:
+        return "워커 프로세스 읽기 오류" if self.consecutive_errors else None
+
+    def _read_loop(self):
+        """공유 메모리 → SnapshotRegister (샘플마다 발행, 링 버퍼가 전체 샘플레이트로 기록됨)"""
+        channels = self.plugin.channels
+        frame_key = self.plugin.frame_key
+        while self._running:
+            try:
+                if self.frames is not None:
+                    latest = self.frames.read_latest()
+                    if latest is not None:
+                        self._latest_frame = latest[1]
+                        if not channels:
+                            # 프레임만 발행하는 센서
+                            self.register.publish(self.name, latest[1], latest[0])
+
+                if self.samples is not None:
+                    for timestamp, row in self.samples.read_new():
+                        data = {
+                            channel: (None if value != value else value)
+                            for channel, value in zip(channels, row.tolist())
+                        }
+                        if frame_key and self._latest_frame is not None:
+                            data[frame_key] = self._latest_frame
+                        self.register.publish(self.name, data, timestamp)
+            except Exception as e:
+                if not self._running:
+                    break
+                print(f"⚠️ {self.name} 공유 메모리 읽기 오류: {e}")
+            time.sleep(self.poll_interval)
+
+
+class ProcessSensorPlugin:
+    """플러그인을 워커 프로세스에서 실행하도록 감싼 플러그인 (create만 대체)"""
+
+    def __init__(self, plugin, registry_kwargs: Dict[str, Any]):
+        self.plugin = plugin
+        self.registry_kwargs = registry_kwargs
+
+    def __getattr__(self, item):
+        return getattr(self.plugin, item)
+
+    def create(self, register):
+        collector = ProcessCollector(self.plugin, self.registry_kwargs, register)
+        collector.spawn()
+        return None, None, collector
@@ -0,0 +1,210 @@
+"""
+공유 메모리 링 버퍼 - 센서 워커 프로세스 → 백엔드 프로세스 샘플/프레임 전달
+multiprocessing.shared_memory 위에 NumPy 뷰를 올리고 슬롯별 시퀀스 번호(seqlock)로
+잠금 없이 단일 쓰기(워커) / 단일 읽기(백엔드 리더 스레드)를 처리
+
+슬롯 시퀀스 규칙: i번째 기록 중에는 2i+1(홀수), 기록 완료 후 2i+2
+읽기 전후 시퀀스가 같고 기대값(2i+2)이면 유효, 아니면 기록 중이거나 덮어쓴 슬롯
+"""
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 헤더 필드 (int64)
+HEADER_FIELDS = 8
+H_WRITE_COUNT = 0        # 누적 기록 수
+H_ERROR_COUNT = 1        # 워커 컬렉터 누적 읽기 오류
+H_CONSECUTIVE_ERRORS = 2 # 워커 컬렉터 연속 읽기 오류
+H_ACTIVE = 3             # 워커 통신 객체 activate (1/0, -1: 알 수 없음)
+
+
+def _attach(name: Optional[str], size: int, create: bool) -> shared_memory.SharedMemory:
+    """공유 메모리 생성(백엔드) 또는 연결(워커)
+
+    워커는 spawn으로 시작되어 백엔드의 resource_tracker를 공유하므로
+    세그먼트 해제(unlink)는 생성한 백엔드 프로세스에서만 수행
+    """
+    if create:
+        return shared_memory.SharedMemory(create=True, size=size)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedSampleRing:
+    """숫자 채널 샘플 링 (타임스탬프 + float64 채널 값)"""
+
+    def __init__(self, channels: List[str], capacity: int, name: Optional[str] = None,
+                 create: bool = True):
+        """
+        Args:
+            channels: 채널 이름 (쓰기/읽기 양쪽이 같은 순서로 사용)
+            capacity: 슬롯 수 (리더가 이만큼 뒤처지면 오래된 샘플 유실)
+            name: 연결할 공유 메모리 이름 (create=False일 때)
+            create: True면 새 세그먼트 생성 (백엔드), False면 연결 (워커)
+        """
+        self.channels = list(channels)
+        self.capacity = int(capacity)
+        n = len(self.channels)
+        size = 8 * (HEADER_FIELDS + self.capacity * (2 + n))
+        self.shm = _attach(name, size, create)
+        self.name = self.shm.name
+
+        buf = self.shm.buf
+        offset = 0
+        self.header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += 8 * HEADER_FIELDS
+        self.seq = np.ndarray((self.capacity,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += 8 * self.capacity
+        self.timestamps = np.ndarray((self.capacity,), dtype=np.float64, buffer=buf, offset=offset)
+        offset += 8 * self.capacity
+        self.values = np.ndarray((self.capacity, n), dtype=np.float64, buffer=buf, offset=offset)
+
+        if create:
+            self.header[:] = 0
+            self.header[H_ACTIVE] = -1
+            self.seq[:] = 0
+
+        self._read_index = 0
+        self.lost = 0   # 리더가 뒤처져 유실된 샘플 수
+
+    def write(self, timestamp: float, data: Dict):
+        """샘플 한 개 기록 (워커 프로세스, 단일 쓰기)"""
+        i = int(self.header[H_WRITE_COUNT])
+        slot = i % self.capacity
+        self.seq[slot] = 2 * i + 1
+        self.timestamps[slot] = timestamp
+        row = self.values[slot]
+        for k, channel in enumerate(self.channels):
+            value = data.get(channel)
+            try:
+                row[k] = float(value) if value is not None else np.nan
+            except (TypeError, ValueError):
+                row[k] = np.nan
+        self.seq[slot] = 2 * i + 2
+        self.header[H_WRITE_COUNT] = i + 1
+
+    def read_new(self) -> List[Tuple[float, np.ndarray]]:
+        """마지막 읽기 이후 기록된 샘플 목록 (백엔드 리더 스레드)"""
+        count = int(self.header[H_WRITE_COUNT])
+        if count - self._read_index > self.capacity:
+            self.lost += count - self.capacity - self._read_index
+            self._read_index = count - self.capacity
+
+        samples = []
+        for i in range(self._read_index, count):
+            slot = i % self.capacity
+            expected = 2 * i + 2
+            if self.seq[slot] != expected:
+                self.lost += 1
+                continue
+            timestamp = float(self.timestamps[slot])
+            row = self.values[slot].copy()
+            if self.seq[slot] != expected:
+                # 읽는 중 덮어씀
+                self.lost += 1
+                continue
+            samples.append((timestamp, row))
+        self._read_index = count
+        return samples
+
+    def set_status(self, error_count: int, consecutive_errors: int, active: Optional[bool]):
+        """워커 컬렉터 상태 기록 (워커 프로세스)"""
+        self.header[H_ERROR_COUNT] = error_count
+        self.header[H_CONSECUTIVE_ERRORS] = consecutive_errors
+        self.header[H_ACTIVE] = -1 if active is None else int(bool(active))
+
+    def close(self):
+        # NumPy 뷰를 먼저 해제해야 공유 메모리를 닫을 수 있음
+        self.header = self.seq = self.timestamps = self.values = None
+        self.shm.close()
+
+    def unlink(self):
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedFrameRing:
+    """이미지 프레임 링 (최신 프레임 전달용, uint8)"""
+
+    def __init__(self, max_bytes: int, slots: int = 3, name: Optional[str] = None,
+                 create: bool = True):
+        """
+        Args:
+            max_bytes: 프레임 한 장의 최대 크기 (높이 × 너비 × 채널)
+            slots: 슬롯 수 (리더가 최신 프레임을 읽는 동안 워커가 다른 슬롯에 기록)
+        """
+        self.max_bytes = int(max_bytes)
+        self.slots = int(slots)
+        size = 8 * (HEADER_FIELDS + self.slots * 5) + self.slots * self.max_bytes
+        self.shm = _attach(name, size, create)
+        self.name = self.shm.name
+
+        buf = self.shm.buf
+        offset = 0
+        self.header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += 8 * HEADER_FIELDS
+        self.seq = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += 8 * self.slots
+        self.timestamps = np.ndarray((self.slots,), dtype=np.float64, buffer=buf, offset=offset)
+        offset += 8 * self.slots
+        self.shapes = np.ndarray((self.slots, 3), dtype=np.int64, buffer=buf, offset=offset)
+        offset += 8 * self.slots * 3
+        self.payload = np.ndarray((self.slots, self.max_bytes), dtype=np.uint8, buffer=buf, offset=offset)
+
+        if create:
+            self.header[:] = 0
+            self.seq[:] = 0
+
+        self._last_read = 0
+        self.dropped = 0    # 최대 크기를 넘어 버린 프레임 수
+
+    def write(self, timestamp: float, frame: np.ndarray) -> bool:
+        """프레임 기록 (워커 프로세스), 최대 크기를 넘으면 False"""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.size > self.max_bytes or frame.ndim not in (2, 3):
+            self.dropped += 1
+            return False
+
+        i = int(self.header[H_WRITE_COUNT])
+        slot = i % self.slots
+        self.seq[slot] = 2 * i + 1
+        self.timestamps[slot] = timestamp
+        shape = frame.shape if frame.ndim == 3 else frame.shape + (0,)
+        self.shapes[slot] = shape
+        self.payload[slot, :frame.size] = frame.reshape(-1)
+        self.seq[slot] = 2 * i + 2
+        self.header[H_WRITE_COUNT] = i + 1
+        return True
+
+    def read_latest(self) -> Optional[Tuple[float, np.ndarray]]:
+        """마지막 읽기 이후 새 프레임이 있으면 최신 프레임 복사본 반환 (백엔드 리더 스레드)"""
+        for _ in range(3):
+            count = int(self.header[H_WRITE_COUNT])
+            if count == self._last_read:
+                return None
+            i = count - 1
+            slot = i % self.slots
+            expected = 2 * i + 2
+            if self.seq[slot] != expected:
+                continue
+            timestamp = float(self.timestamps[slot])
+            h, w, c = (int(x) for x in self.shapes[slot])
+            shape = (h, w, c) if c else (h, w)
+            frame = self.payload[slot, :h * w * max(c, 1)].reshape(shape).copy()
+            if self.seq[slot] != expected:
+                continue
+            self._last_read = count
+            return timestamp, frame
+        return None
+
+    def close(self):
+        self.header = self.seq = self.timestamps = self.shapes = self.payload = None
+        self.shm.close()
+
+    def unlink(self):
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
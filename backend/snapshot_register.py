@@ -0,0 +1,79 @@
+"""
+스냅샷 레지스터 - 센서별 최신값 보관 (atomic-swap 방식)
+컬렉터 스레드가 새 샘플을 발행하면 (seq, 시각, 데이터) 튜플 참조를 한 번에 교체하고,
+이벤트 루프는 락이나 스레드 풀 없이 모든 센서의 최신값을 한 번에 읽음
+"""
+import itertools
+import time
+from typing import Dict, Any, Optional, NamedTuple, Callable, List
+
+
+class Snapshot(NamedTuple):
+    """센서 한 개의 최신 샘플"""
+    seq: int            # 센서별 단조 증가 시퀀스 번호
+    timestamp: float    # 샘플 획득 시각 (time.monotonic)
+    data: Any           # 샘플 데이터 (dict는 발행 시점 사본)
+
+
+class SnapshotRegister:
+    """센서별 최신값 레지스터
+
+    CPython에서 dict 항목 대입과 itertools.count의 next()는 원자적이므로
+    쓰기 측(컬렉터 스레드)은 불변 튜플을 만들어 참조만 교체하고,
+    읽기 측(이벤트 루프)은 찢어진(torn) 값을 볼 일 없이 블로킹 없이 읽을 수 있음
+    """
+
+    def __init__(self):
+        self._slots: Dict[str, Snapshot] = {}
+        self._counters: Dict[str, itertools.count] = {}
+        self._listeners: List[Callable[[str, "Snapshot"], None]] = []
+
+    def add_listener(self, callback: Callable[[str, "Snapshot"], None]):
+        """발행 알림 콜백 등록 (컬렉터 스레드에서 호출되므로 가볍게 유지할 것)"""
+        self._listeners.append(callback)
+
+    def publish(self, name: str, data: Any, timestamp: Optional[float] = None):
+        """새 샘플 발행 (컬렉터 스레드에서 호출)"""
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = self._counters.setdefault(name, itertools.count(1))
+
+        # 컬렉터가 같은 dict 객체를 재사용하므로 발행 시점 사본을 보관
+        if isinstance(data, dict):
+            data = dict(data)
+
+        snap = Snapshot(
+            next(counter),
+            timestamp if timestamp is not None else time.monotonic(),
+            data
+        )
+        self._slots[name] = snap
+
+        for callback in self._listeners:
+            try:
+                callback(name, snap)
+            except Exception as e:
+                print(f"⚠️ 레지스터 리스너 오류 ({name}): {e}")
+
+    def get(self, name: str) -> Optional[Snapshot]:
+        """특정 센서의 최신 스냅샷 조회"""
+        return self._slots.get(name)
+
+    def snapshot(self) -> Dict[str, Snapshot]:
+        """모든 센서의 최신 스냅샷을 한 번에 조회"""
+        return self._slots.copy()
+
+    def sequences(self) -> Dict[str, int]:
+        """센서별 최신 시퀀스 번호 조회"""
+        return {name: snap.seq for name, snap in self._slots.items()}
+
+    def clear(self, name: str):
+        """센서 슬롯 제거 (센서 연결 해제 시)"""
+        self._slots.pop(name, None)
+
+    def age(self, name: str, now: Optional[float] = None) -> Optional[float]:
+        """최신 샘플 이후 경과 시간 (초)"""
+        snap = self._slots.get(name)
+        if snap is None:
+            return None
+        return (now if now is not None else time.monotonic()) - snap.timestamp
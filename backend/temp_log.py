@@ -0,0 +1,117 @@
+"""
+임시 저장 세그먼트 로그 - 자동저장 데이터를 메모리 대신 디스크의 append-only CSV 세그먼트에 보관
+기록 스레드(CsvWriter)가 segment_seconds마다 새 세그먼트를 열고, 세션이 끝나면(discard) 임시 폴더째 삭제
+메모리에는 아직 기록하지 않은 행(flush_interval 분량의 기록 큐)만 남으므로 보관 시간과 관계없이 메모리 사용량이 일정함
+영구 저장은 행을 다시 직렬화하지 않고 세그먼트 파일을 옮기거나(rename) 바이트 구간을 이어 붙여 CSV 한 개로 만듦
+"""
+import csv
+import io
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Sequence
+
+from backend.csv_writer import CsvWriter
+
+# 세그먼트 복사 단위
+_COPY_CHUNK = 1 << 20
+
+
+class TempSegmentLog(CsvWriter):
+    """임시 저장 세그먼트 로그 (세그먼트마다 같은 헤더의 CSV)"""
+
+    FORMAT = "temp"
+    # 세그먼트 교체는 segment_seconds마다 일어나는 내부 동작이므로 출력하지 않음
+    LOG_ROTATION = False
+
+    def __init__(self, folder: str, fieldnames: Sequence[str], segment_seconds: float = 60.0,
+                 queue_size: int = 10000, flush_interval: float = 1.0):
+        """
+        Args:
+            folder: 세그먼트를 만들 임시 폴더 (discard 시 폴더째 삭제)
+            fieldnames: CSV 열
+            segment_seconds: 새 세그먼트로 교체하는 주기 (초)
+        """
+        super().__init__(folder, fieldnames, queue_size=queue_size, flush_interval=flush_interval,
+                         rotate_seconds=segment_seconds)
+        # [경로, 기록 행 수]
+        self.segments: List[List[Any]] = []
+        self._segments_lock = threading.Lock()
+
+        header = io.StringIO()
+        csv.writer(header).writerow(self.fieldnames)
+        self._header_bytes = len(header.getvalue().encode("utf-8"))
+
+    def _open_file(self) -> str:
+        path = super()._open_file()
+        with self._segments_lock:
+            self.segments.append([path, 0])
+        return path
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        super()._write_rows(rows)
+        self.segments[-1][1] += len(rows)
+
+    @property
+    def row_count(self) -> int:
+        """보관 중인 행 수 (기록 대기 행 포함)"""
+        return sum(segment[1] for segment in list(self.segments)) + self.queue_depth
+
+    @property
+    def disk_bytes(self) -> int:
+        total = 0
+        for path, _ in list(self.segments):
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def promote(self, csv_path: str, move: bool = False) -> int:
+        """보관 중인 세그먼트 → CSV 한 개 (블로킹, 이벤트 루프에서는 executor로 호출) → 행 수
+
+        먼저 flush() 또는 stop()으로 대기 행을 기록해 둘 것.
+        move=True(기록 스레드 정지 후)면 첫 세그먼트를 옮기고 나머지 세그먼트를 헤더를 빼고 이어 붙이며,
+        아니면 각 세그먼트의 현재 크기까지를 복사 (기록은 계속됨)
+        """
+        with self._segments_lock:
+            segments = [(path, os.path.getsize(path), rows) for path, rows in self.segments]
+            if not segments:
+                raise ValueError("보관 중인 세그먼트가 없습니다")
+
+            first_path, first_size, _ = segments[0]
+            if move:
+                shutil.move(first_path, csv_path)
+                out = open(csv_path, "ab")
+            else:
+                out = open(csv_path, "wb")
+                self._copy_range(first_path, out, 0, first_size)
+            with out:
+                for path, size, _ in segments[1:]:
+                    self._copy_range(path, out, self._header_bytes, size)
+            if move:
+                self.segments = []
+        return sum(rows for _, _, rows in segments)
+
+    @staticmethod
+    def _copy_range(path: str, out, start: int, end: int):
+        """파일의 [start, end) 바이트 구간을 out에 이어 붙임"""
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(_COPY_CHUNK, remaining))
+                if not chunk:
+                    break
+                out.write(chunk)
+                remaining -= len(chunk)
+
+    def discard(self):
+        """기록 스레드를 멈추고 임시 폴더 삭제 (블로킹)"""
+        self.stop()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update(segments=len(self.segments), disk_bytes=self.disk_bytes)
+        return stats
@@ -0,0 +1,133 @@
+"""
+틱 스케줄러 - 단조 시계(monotonic) 데드라인 기반 주기 실행
+작업 시간만큼 주기가 늘어나는 sleep 방식 대신 고정된 데드라인 격자를 사용하여
+50Hz 수집 루프의 드리프트를 제거하고 지터/오버런 통계를 기록
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class TickScheduler:
+    """단조 시계 데드라인 기반 주기 스케줄러"""
+
+    OVERRUN_POLICIES = ("skip", "catch_up")
+
+    def __init__(self, rate_hz: float = 50.0, overrun_policy: str = "skip",
+                 max_catch_up: int = 5, stats_window: int = 1000):
+        """
+        Args:
+            rate_hz: 목표 실행 주기 (Hz)
+            overrun_policy: 틱이 주기를 넘겼을 때의 정책
+                - "skip": 놓친 틱을 버리고 다음 격자 시점에 맞춤
+                - "catch_up": 놓친 틱을 연속 실행하여 따라잡음 (최대 max_catch_up개)
+            max_catch_up: catch_up 정책에서 따라잡을 최대 틱 수 (초과분은 skip 처리)
+            stats_window: 통계 계산에 사용할 최근 틱 수
+        """
+        if rate_hz <= 0:
+            raise ValueError(f"잘못된 주기입니다: {rate_hz}")
+        if overrun_policy not in self.OVERRUN_POLICIES:
+            raise ValueError(f"지원하지 않는 오버런 정책입니다: {overrun_policy}")
+
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.overrun_policy = overrun_policy
+        self.max_catch_up = max(0, int(max_catch_up))
+
+        self._next_deadline: Optional[float] = None
+        self._tick_started: Optional[float] = None
+        self._catching_up = False   # catch_up 정책에서 밀린 틱을 따라잡는 중
+
+        # 통계
+        self.tick_count = 0
+        self.overrun_count = 0
+        self.skipped_ticks = 0
+        self._tick_times = deque(maxlen=stats_window)   # 실제 틱 시작 시각
+        self._lateness = deque(maxlen=stats_window)     # 데드라인 대비 지연 (초)
+        self._busy = deque(maxlen=stats_window)         # 틱 작업 소요 시간 (초)
+
+    async def wait_next(self) -> int:
+        """다음 데드라인까지 대기 후 틱 번호 반환"""
+        now = time.monotonic()
+
+        if self._tick_started is not None:
+            self._busy.append(now - self._tick_started)
+
+        if self._next_deadline is None:
+            self._next_deadline = now
+
+        deadline = self._next_deadline
+        delay = deadline - now
+        # 따라잡는 중인 틱은 앞선 오버런의 지연을 이어받으므로 지연 통계에서 제외
+        in_catch_up = self._catching_up
+        if delay > 0:
+            in_catch_up = self._catching_up = False
+            await asyncio.sleep(delay)
+        elif -delay >= self.period:
+            # 한 주기 이상 밀림 → 오버런 (격자에서 처음 밀린 시점만 집계, 따라잡는 동안은 같은 오버런)
+            if not self._catching_up:
+                self.overrun_count += 1
+            missed = int(-delay // self.period)
+            if self.overrun_policy != "catch_up" or missed > self.max_catch_up:
+                keep = self.max_catch_up if self.overrun_policy == "catch_up" else 0
+                dropped = missed - keep
+                self.skipped_ticks += dropped
+                deadline += dropped * self.period
+            self._catching_up = self.overrun_policy == "catch_up"
+
+        started = time.monotonic()
+        if not in_catch_up:
+            self._lateness.append(max(0.0, started - deadline))
+        self._tick_times.append(started)
+        self._tick_started = started
+        self._next_deadline = deadline + self.period
+        self.tick_count += 1
+        return self.tick_count
+
+    def resync(self):
+        """현재 시각을 틱 시작으로 보고 데드라인 격자를 재정렬 (장시간 대기 후 오버런으로 집계하지 않음)"""
+        now = time.monotonic()
+        self._next_deadline = now + self.period
+        self._tick_started = now
+        self._catching_up = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """달성 주기, 지터 백분위수, 오버런 통계 반환"""
+        achieved_rate = 0.0
+        if len(self._tick_times) >= 2:
+            span = self._tick_times[-1] - self._tick_times[0]
+            if span > 0:
+                achieved_rate = (len(self._tick_times) - 1) / span
+
+        lateness_ms = sorted(x * 1000.0 for x in self._lateness)
+        busy_ms = sorted(x * 1000.0 for x in self._busy)
+
+        return {
+            "target_rate_hz": self.rate_hz,
+            "achieved_rate_hz": round(achieved_rate, 2),
+            "overrun_policy": self.overrun_policy,
+            "tick_count": self.tick_count,
+            "overrun_count": self.overrun_count,
+            "skipped_ticks": self.skipped_ticks,
+            "jitter_ms": {
+                "p50": round(self._percentile(lateness_ms, 50), 3),
+                "p95": round(self._percentile(lateness_ms, 95), 3),
+                "p99": round(self._percentile(lateness_ms, 99), 3),
+                "max": round(lateness_ms[-1], 3) if lateness_ms else 0.0
+            },
+            "busy_ms": {
+                "p50": round(self._percentile(busy_ms, 50), 3),
+                "p95": round(self._percentile(busy_ms, 95), 3),
+                "max": round(busy_ms[-1], 3) if busy_ms else 0.0
+            },
+            "window": len(self._tick_times)
+        }
+
+    @staticmethod
+    def _percentile(sorted_values, pct: float) -> float:
+        """정렬된 리스트에서 백분위수 계산 (nearest-rank)"""
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+        return sorted_values[index]
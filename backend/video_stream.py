@@ -0,0 +1,232 @@
+"""
+영상 스트림 - Basler/HikRobot 프레임을 JPEG로 인코딩해 MJPEG로 전송
+수치 WebSocket 스트림에는 프레임 메타데이터(frame_id, 크기)만 싣고 영상은 별도 엔드포인트로 분리
+
+새 프레임은 요청된 크기마다 인코딩 워커 스레드에서 한 번만 JPEG로 인코딩되어 모든 시청자가 공유하고,
+느린 시청자는 전송이 끝난 시점의 최신 프레임으로 건너뛰므로 뒤처진 프레임이 쌓이지 않음
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from backend.metrics import METRICS
+
+_ENCODE_SECONDS = METRICS.histogram("hbnu_video_encode_seconds", "영상 프레임 JPEG 인코딩 시간",
+                                    labelnames=("stream",))
+_FRAMES_SENT = METRICS.counter("hbnu_video_frames_sent_total", "MJPEG 시청자에게 보낸 프레임 수",
+                               labelnames=("stream",))
+
+# multipart 경계 문자열
+MJPEG_BOUNDARY = "frame"
+# 축소 너비 단위 (요청 너비를 이 단위로 올림) 및 스트림별로 캐시할 최대 너비 수
+WIDTH_STEP = 160
+MAX_CACHED_WIDTHS = 8
+
+
+def combine_frames(frame1: np.ndarray, frame2: np.ndarray) -> np.ndarray:
+    """HikRobot 2대 프레임을 같은 높이로 맞춰 가로로 합성"""
+    h = max(frame1.shape[0], frame2.shape[0])
+    f1 = cv2.resize(frame1, (frame1.shape[1], h)) if frame1.shape[0] != h else frame1
+    f2 = cv2.resize(frame2, (frame2.shape[1], h)) if frame2.shape[0] != h else frame2
+    if f1.ndim != f2.ndim:
+        f1 = cv2.cvtColor(f1, cv2.COLOR_GRAY2BGR) if f1.ndim == 2 else f1
+        f2 = cv2.cvtColor(f2, cv2.COLOR_GRAY2BGR) if f2.ndim == 2 else f2
+    return cv2.hconcat([f1, f2])
+
+
+class VideoStream:
+    """영상 소스 하나 (최신 프레임 조회 + 크기별 JPEG 캐시)"""
+
+    def __init__(self, name: str, source: Callable[[], Optional[Tuple[Any, Any]]],
+                 prepare: Optional[Callable[[Any], np.ndarray]] = None):
+        """
+        Args:
+            name: 스트림 이름
+            source: 최신 (frame_id, 원본) 조회 (이벤트 루프에서 호출되므로 가볍게 유지)
+            prepare: 원본 → 인코딩할 프레임 변환 (인코딩 워커 스레드에서 실행, 예: 2대 합성)
+        """
+        self.name = name
+        self.source = source
+        self.prepare = prepare
+        self._cache: Dict[int, Tuple[Any, bytes]] = {}          # 너비 → (frame_id, JPEG)
+        self._pending: Dict[Tuple[Any, int], asyncio.Future] = {}
+        self._encode_seconds = _ENCODE_SECONDS.labels(stream=name)
+        self.frames_sent = _FRAMES_SENT.labels(stream=name)
+        self.encoded_count = 0
+        self.viewers = 0
+        self._frame_width = 0   # 마지막으로 인코딩한 (축소 전) 프레임 너비
+
+    def _encode(self, raw: Any, width: int, quality: int) -> bytes:
+        """인코딩 워커 스레드: (합성) → (축소) → JPEG"""
+        started = time.perf_counter()
+        frame = self.prepare(raw) if self.prepare is not None else raw
+        self._frame_width = frame.shape[1]
+        if width and frame.shape[1] > width:
+            height = max(1, round(frame.shape[0] * width / frame.shape[1]))
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise RuntimeError(f"{self.name} JPEG 인코딩 실패")
+        self._encode_seconds.observe(time.perf_counter() - started)
+        return jpeg.tobytes()
+
+    async def latest_jpeg(self, executor: ThreadPoolExecutor, width: int = 0,
+                          quality: int = 80) -> Optional[Tuple[Any, bytes]]:
+        """최신 프레임의 JPEG (같은 프레임/너비는 한 번만 인코딩해 공유)"""
+        current = self.source()
+        if current is None:
+            return None
+        frame_id, raw = current
+        width = self._snap_width(width)
+        cached = self._cache.get(width)
+        if cached is not None and cached[0] == frame_id:
+            return cached
+
+        key = (frame_id, width)
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(executor, self._encode, raw, width, quality)
+            self._pending[key] = future
+            future.add_done_callback(lambda _, key=key: self._pending.pop(key, None))
+        # 먼저 요청한 시청자가 끊겨도 같은 프레임을 기다리는 다른 시청자의 인코딩은 취소하지 않음
+        jpeg = await asyncio.shield(future)
+        cached = self._cache.get(width)
+        if cached is None or cached[0] != frame_id:
+            if width not in self._cache and len(self._cache) >= MAX_CACHED_WIDTHS:
+                # 가장 먼저 캐시한 너비부터 제거
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[width] = (frame_id, jpeg)
+            self.encoded_count += 1
+        return frame_id, jpeg
+
+    def _snap_width(self, width: int) -> int:
+        """요청 너비 → 인코딩/캐시 너비 (WIDTH_STEP 단위로 올림, 프레임 너비 이상이면 0=원본 크기)
+
+        시청자마다 다른 너비를 요청해도 캐시와 인코딩 종류가 몇 가지로 제한됨
+        """
+        if width <= 0:
+            return 0
+        width = -(-width // WIDTH_STEP) * WIDTH_STEP
+        if self._frame_width and width >= self._frame_width:
+            return 0
+        return width
+
+
+class VideoHub:
+    """센서 레지스터의 프레임으로 영상 스트림 구성 및 MJPEG 전송"""
+
+    # 기존 이미지 API 이름 호환
+    ALIASES = {"basler": "camera"}
+
+    def __init__(self, sensor_manager, quality: int = 80, max_fps: float = 15.0, workers: int = 1):
+        """
+        Args:
+            sensor_manager: 프레임을 발행하는 SensorManager (레지스터, 레지스트리)
+            quality: JPEG 품질 (0-100)
+            max_fps: 시청자별 최대 전송 프레임률
+            workers: 인코딩 워커 스레드 수
+        """
+        self.quality = int(quality)
+        self.max_fps = float(max_fps)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="video-encode")
+        self.streams: Dict[str, VideoStream] = {}
+
+        register = sensor_manager.register
+        hik_names = []
+        for plugin in sensor_manager.registry:
+            if plugin.frame_key:
+                self.streams[plugin.name] = VideoStream(
+                    plugin.name, self._frame_source(register, plugin.name, plugin.frame_key))
+            elif plugin.kind == "hik_camera":
+                hik_names.append(plugin.name)
+                self.streams[plugin.name] = VideoStream(
+                    plugin.name, self._frame_source(register, plugin.name, None))
+
+        # HikRobot 2대 합성 (기존 combined_image와 같은 화면, 합성도 인코딩 워커에서 수행)
+        if len(hik_names) >= 2:
+            first, second = hik_names[:2]
+
+            def combined_source():
+                snap1, snap2 = register.get(first), register.get(second)
+                if snap1 is None or snap2 is None:
+                    return None
+                if not isinstance(snap1.data, np.ndarray) or not isinstance(snap2.data, np.ndarray):
+                    return None
+                return (snap1.seq, snap2.seq), (snap1.data, snap2.data)
+
+            self.streams["hik"] = VideoStream("hik", combined_source, prepare=lambda pair: combine_frames(*pair))
+
+    @staticmethod
+    def _frame_source(register, name: str, frame_key: Optional[str]):
+        def source():
+            snap = register.get(name)
+            if snap is None:
+                return None
+            frame = snap.data.get(frame_key) if frame_key and isinstance(snap.data, dict) else snap.data
+            if not isinstance(frame, np.ndarray):
+                return None
+            return snap.seq, frame
+        return source
+
+    def get_stream(self, name: str) -> Optional[VideoStream]:
+        return self.streams.get(self.ALIASES.get(name, name))
+
+    async def snapshot(self, name: str, width: int = 0) -> Optional[bytes]:
+        """최신 프레임 JPEG 한 장"""
+        stream = self.get_stream(name)
+        if stream is None:
+            return None
+        result = await stream.latest_jpeg(self._executor, width, self.quality)
+        return result[1] if result else None
+
+    async def mjpeg(self, name: str, width: int = 0, fps: Optional[float] = None) -> AsyncIterator[bytes]:
+        """multipart/x-mixed-replace MJPEG 본문 (새 프레임이 있을 때만 전송)"""
+        stream = self.get_stream(name)
+        if stream is None:
+            return
+        # 0 이하/NaN 프레임률은 최대 프레임률로 (간격이 0이 되면 이벤트 루프를 계속 점유함)
+        interval = 1.0 / (min(fps, self.max_fps) if fps is not None and fps > 0 else self.max_fps)
+        last_id = None
+        stream.viewers += 1
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    result = await stream.latest_jpeg(self._executor, width, self.quality)
+                except Exception as e:
+                    print(f"⚠️ {stream.name} 영상 인코딩 오류: {e}")
+                    result = None
+                if result is not None and result[0] != last_id:
+                    last_id, jpeg = result
+                    # 느린 시청자는 여기서 전송이 끝날 때까지 대기하고, 그동안의 프레임은 건너뜀
+                    yield (
+                        f"--{MJPEG_BOUNDARY}\r\n"
+                        f"Content-Type: image/jpeg\r\n"
+                        f"Content-Length: {len(jpeg)}\r\n\r\n"
+                    ).encode("ascii") + jpeg + b"\r\n"
+                    stream.frames_sent.inc()
+                await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+        finally:
+            stream.viewers -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "quality": self.quality,
+            "max_fps": self.max_fps,
+            "streams": {
+                name: {
+                    "viewers": stream.viewers,
+                    "encoded_frames": stream.encoded_count,
+                    "available": stream.source() is not None
+                }
+                for name, stream in self.streams.items()
+            }
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
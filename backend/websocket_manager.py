@@ -1,25 +1,470 @@
 """
 WebSocket 매니저 - 실시간 데이터 전송 관리
 클라이언트와의 WebSocket 연결을 관리하고 실시간 데이터를 브로드캐스트
+
+브로드캐스트는 메시지를 한 번만 직렬화해 클라이언트별 송신 큐에 넣고 바로 반환하며,
+실제 전송은 클라이언트별 송신 태스크가 담당 (느린 클라이언트가 수집 루프와 다른 클라이언트를 막지 않음)
+차트만 그리는 클라이언트는 배치 모드로 여러 틱을 필드별 배열 메시지 하나로 받을 수 있음
+최근 센서 데이터는 재전송 링 버퍼에 남겨, 재연결한 클라이언트(/ws?resume_from=seq&stream=id)에게
+놓친 구간을 배치 메시지로 한 번에 보내고 이어서 실시간 전송
+하트비트 태스크가 주기적으로 ping을 보내 클라이언트별 왕복 시간(RTT)을 측정하고,
+제한 시간 동안 아무 메시지(pong 포함)도 보내지 않은 반쯤 열린 연결은 정리
 """
 import json
+import time
+import uuid
 import asyncio
-from typing import List, Dict, Any
+from collections import deque
+from itertools import islice
+from typing import List, Dict, Any, Optional, Callable, FrozenSet, Tuple
 from fastapi import WebSocket
 
+from backend.metrics import METRICS, STAGE_SECONDS
+from backend import fast_json
+from backend.ws_protocol import (BinarySchema, BINARY_SUBPROTOCOL, MAX_BATCH_SAMPLES, select_protocol,
+                                 flatten, diff, columnize)
+
+_SERIALIZE_SECONDS = STAGE_SECONDS.labels(stage="ws_serialize")
+_SEND_SECONDS = STAGE_SECONDS.labels(stage="ws_send")
+_MESSAGES_SENT = METRICS.counter("hbnu_ws_messages_sent_total", "WebSocket으로 전송한 센서 데이터 메시지 수 (클라이언트별)")
+_BYTES_SENT = METRICS.counter("hbnu_ws_bytes_sent_total", "WebSocket으로 전송한 센서 데이터 바이트 수 (클라이언트별)")
+_SEND_ERRORS = METRICS.counter("hbnu_ws_send_errors_total", "WebSocket 전송 실패 수")
+_DROPPED = METRICS.counter("hbnu_ws_dropped_total", "송신 큐가 가득 차 버리거나 최신 값으로 대체된 메시지 수")
+_RESUMES = METRICS.counter("hbnu_ws_resumes_total", "재연결 이어받기 요청 수", labelnames=("result",))
+_REPLAYED = METRICS.counter("hbnu_ws_replayed_samples_total", "재연결 클라이언트에게 재전송한 센서 데이터 수")
+_RTT_SECONDS = METRICS.histogram("hbnu_ws_rtt_seconds", "WebSocket ping/pong 왕복 시간 (송신 큐 대기 포함)")
+_REAPED = METRICS.counter("hbnu_ws_reaped_total", "응답이 없어 정리한 WebSocket 연결 수")
+
+# 송신 큐 정책
+QUEUE_POLICIES = ("latest", "drop_oldest")
+
+# 구독 집계 방식 (데시메이션 구간 동안의 값)
+AGGREGATIONS = ("last", "minmax")
+
+# 배치 대기 시간 상한 (밀리초)
+MAX_BATCH_MS = 10000
+
+# 재전송 배치 메시지 하나의 최대 샘플 수 (바이너리 샘플 수 필드 u16)
+REPLAY_CHUNK = 0xFFFF
+
+
+class ClientConnection:
+    """클라이언트별 송신 큐와 송신 태스크
+
+    큐 정책:
+        latest: 센서 데이터는 최신 한 건만 유지 (아직 보내지 못한 이전 데이터는 대체),
+                상태/제어 메시지는 순서대로 보관
+        drop_oldest: 모든 메시지를 순서대로 보관하고 가득 차면 가장 오래된 메시지를 버림
+    """
+
+    def __init__(self, websocket: WebSocket, queue_size: int = 8, policy: str = "latest",
+                 on_close: Optional[Callable[[WebSocket], None]] = None, protocol: str = "json",
+                 delta: bool = False):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"지원하지 않는 송신 큐 정책입니다: {policy} (가능: {', '.join(QUEUE_POLICIES)})")
+        self.websocket = websocket
+        self.id = id(websocket)
+        self.client = str(websocket.client) if getattr(websocket, 'client', None) else "unknown"
+        self.queue_size = max(1, int(queue_size))
+        self.policy = policy
+        self.on_close = on_close
+        self.protocol = protocol        # json 또는 binary (센서 데이터 인코딩)
+        self.delta = delta              # 델타 모드 (키프레임 사이에 바뀐 필드만 전송)
+        self.needs_keyframe = True      # 다음 센서 데이터를 키프레임으로 보내야 하는지
+        self.group: Optional["StreamGroup"] = None  # 구독 조건 (None이면 전체 채널, 매 틱)
+
+        self._queue: deque = deque()
+        self._latest_data = None        # latest 정책의 대기 중인 센서 데이터 (메시지, 크기)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        self.connected_at = time.time()
+        self.sent_count = 0
+        self.sent_bytes = 0
+        self.dropped_count = 0
+        self.max_queue_depth = 0
+        self.keyframes_sent = 0
+        self.deltas_sent = 0
+        self.batches_sent = 0
+        self.replayed = 0
+
+        # 하트비트: 마지막 수신 시각(단조 시계), 마지막 ping, 왕복 시간
+        self.last_seen = time.monotonic()
+        self.ping_id: Optional[int] = None
+        self.ping_sent_at = 0.0
+        self.unanswered_pings = 0
+        self.rtt: Optional[float] = None
+        self.rtt_avg: Optional[float] = None
+        self.rtt_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue) + (1 if self._latest_data is not None else 0)
+
+    @property
+    def has_pending_data(self) -> bool:
+        """아직 보내지 못한 센서 데이터가 있어 다음 데이터가 이를 대체하는지 (latest 정책)"""
+        return self._latest_data is not None
+
+    def mark_ping(self, ping_id: int, sent_at: float):
+        if self.ping_id is not None:
+            self.unanswered_pings += 1
+        self.ping_id = ping_id
+        self.ping_sent_at = sent_at
+
+    def mark_pong(self, ping_id: Any, now: float) -> Optional[float]:
+        """마지막 ping에 대한 pong이면 왕복 시간 갱신 → 왕복 시간 (초)"""
+        if ping_id is None or ping_id != self.ping_id:
+            return None
+        rtt = now - self.ping_sent_at
+        self.ping_id = None
+        self.unanswered_pings = 0
+        self.rtt = rtt
+        # 지수 이동 평균 (최근 약 5회)
+        self.rtt_avg = rtt if self.rtt_avg is None else self.rtt_avg + 0.2 * (rtt - self.rtt_avg)
+        if rtt > self.rtt_max:
+            self.rtt_max = rtt
+        return rtt
+
+    def start(self):
+        """송신 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._send_loop())
+
+    def close(self):
+        """송신 태스크 정지 (대기 중인 메시지는 버림)"""
+        self.closed = True
+        self._queue.clear()
+        self._latest_data = None
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._task = None
+
+    def enqueue(self, message, size: int, is_data: bool = False, conflate: bool = True) -> bool:
+        """송신 큐에 메시지 추가 (대기 없음), 기존 메시지를 버렸으면 False
+
+        conflate=False인 센서 데이터(배치)는 latest 정책에서도 최신 값으로 대체하지 않고 순서대로 보관
+        """
+        if self.closed:
+            return False
+        kept = True
+        if is_data and conflate and self.policy == "latest":
+            if self._latest_data is not None:
+                self.dropped_count += 1
+                _DROPPED.inc()
+                kept = False
+            self._latest_data = (message, size, True)
+        else:
+            if len(self._queue) >= self.queue_size:
+                _, _, dropped_data = self._queue.popleft()
+                if dropped_data:
+                    # 델타 연쇄가 끊겼으므로 다음 센서 데이터는 키프레임
+                    self.needs_keyframe = True
+                self.dropped_count += 1
+                _DROPPED.inc()
+                kept = False
+            self._queue.append((message, size, is_data))
+        depth = self.queue_depth
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        self._wakeup.set()
+        return kept
+
+    def _next(self):
+        if self._queue:
+            return self._queue.popleft()
+        if self._latest_data is not None:
+            item, self._latest_data = self._latest_data, None
+            return item
+        return None
+
+    async def _send_loop(self):
+        websocket = self.websocket
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                item = self._next()
+                while item is not None:
+                    message, size, is_data = item
+                    started = time.perf_counter()
+                    if isinstance(message, bytes):
+                        await websocket.send_bytes(message)
+                    else:
+                        await websocket.send_text(message)
+                    self.sent_count += 1
+                    self.sent_bytes += size
+                    if is_data:
+                        _SEND_SECONDS.observe(time.perf_counter() - started)
+                        _MESSAGES_SENT.inc()
+                        _BYTES_SENT.inc(size)
+                    item = self._next()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ WebSocket 전송 오류 ({self.client}): {e}")
+            _SEND_ERRORS.inc()
+            self.closed = True
+            if self.on_close is not None:
+                self.on_close(websocket)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "client": self.client,
+            "protocol": self.protocol,
+            "delta": self.delta,
+            "subscription": self.group.describe() if self.group is not None else None,
+            "policy": self.policy,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_size": self.queue_size,
+            "sent": self.sent_count,
+            "sent_bytes": self.sent_bytes,
+            "dropped": self.dropped_count,
+            "keyframes": self.keyframes_sent,
+            "deltas": self.deltas_sent,
+            "batches": self.batches_sent,
+            "replayed": self.replayed,
+            "rtt_ms": round(self.rtt * 1000, 2) if self.rtt is not None else None,
+            "rtt_avg_ms": round(self.rtt_avg * 1000, 2) if self.rtt_avg is not None else None,
+            "rtt_max_ms": round(self.rtt_max * 1000, 2),
+            "unanswered_pings": self.unanswered_pings,
+            "idle_s": round(time.monotonic() - self.last_seen, 1),
+            "connected_s": round(time.time() - self.connected_at, 1)
+        }
+
+
+class StreamGroup:
+    """같은 구독 조건(채널, 최대 전송률, 집계 방식)의 클라이언트 묶음
+
+    데시메이션 시점, 최소/최대 누적, 델타 기준, 배치 버퍼, 직렬화 결과를 묶음 단위로 공유하므로
+    직렬화 비용은 클라이언트 수가 아니라 서로 다른 구독 조건 수에 비례
+    """
+
+    def __init__(self, keys: Optional[FrozenSet[str]] = None, max_rate: float = 0.0,
+                 aggregation: str = "last", batch: int = 0, batch_ms: float = 0.0):
+        """
+        Args:
+            keys: 전송할 sensor_data 키 (None이면 전체)
+            max_rate: 최대 전송률 (Hz, 0이면 매 틱)
+            aggregation: last(전송 시점 값) 또는 minmax(구간 최소/최대 추가)
+            batch: 배치 하나에 묶을 틱 수 (0이면 batch_ms만 적용)
+            batch_ms: 배치 첫 샘플의 최대 대기 시간 (밀리초, 0이면 batch만 적용, 둘 다 0이면 배치 없음)
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"지원하지 않는 집계 방식입니다: {aggregation} (가능: {', '.join(AGGREGATIONS)})")
+        batch, batch_ms = int(batch), float(batch_ms)
+        if not 0 <= batch <= MAX_BATCH_SAMPLES:
+            raise ValueError(f"batch는 0 ~ {MAX_BATCH_SAMPLES} 사이여야 합니다: {batch}")
+        if not 0 <= batch_ms <= MAX_BATCH_MS:
+            raise ValueError(f"batch_ms는 0 ~ {MAX_BATCH_MS} 사이여야 합니다: {batch_ms}")
+        self.keys = keys
+        self.max_rate = max(0.0, float(max_rate))
+        self.aggregation = aggregation
+        self.interval = 1.0 / self.max_rate if self.max_rate > 0 else 0.0
+        self.batch_size = batch
+        self.batch_ms = batch_ms
+        self.clients: Dict[int, "ClientConnection"] = {}
+
+        # 배치 버퍼: (seq, Unix 시각, 데이터, 구간 최소/최대)
+        self.pending: List[Tuple[int, float, Dict[str, Any], Optional[Tuple[Dict, Dict]]]] = []
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+
+        self.next_due = 0.0
+        self.last_seq = 0               # 이 묶음에 마지막으로 보낸 seq (델타 base_seq)
+        self.last_flat = None           # 델타 기준 (마지막 전송 데이터의 flatten 결과)
+        self.last_keyframe = 0.0
+        self._min: Dict[str, Dict[str, float]] = {}
+        self._max: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def key(self) -> Tuple:
+        return (self.keys, self.max_rate, self.aggregation, self.batch_size, self.batch_ms)
+
+    @property
+    def batching(self) -> bool:
+        return bool(self.batch_size or self.batch_ms)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "channels": sorted(self.keys) if self.keys is not None else None,
+            "max_rate": self.max_rate or None,
+            "aggregation": self.aggregation,
+            "batch": self.batch_size or None,
+            "batch_ms": self.batch_ms or None
+        }
+
+    def add_sample(self, seq: int, data: Dict[str, Any], extrema: Optional[Tuple[Dict, Dict]]) -> bool:
+        """배치 버퍼에 샘플 추가 → 틱 수 조건을 채워 바로 전송해야 하면 True"""
+        self.pending.append((seq, time.time(), data, extrema))
+        return len(self.pending) >= (self.batch_size or MAX_BATCH_SAMPLES)
+
+    def take_pending(self) -> List[Tuple[int, float, Dict[str, Any], Optional[Tuple[Dict, Dict]]]]:
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        pending, self.pending = self.pending, []
+        return pending
+
+    def select(self, sensor_data: Dict[str, Any]) -> Dict[str, Any]:
+        """구독한 센서 데이터만 ({name}_data가 아닌 timestamp 등 최상위 값은 항상 포함)"""
+        if self.keys is None:
+            return sensor_data
+        return {
+            key: value for key, value in sensor_data.items()
+            if key in self.keys or not key.endswith("_data")
+        }
+
+    def accumulate(self, data: Dict[str, Any]):
+        """minmax 집계: 매 틱 숫자 필드의 구간 최소/최대 갱신"""
+        for key, values in data.items():
+            if not isinstance(values, dict):
+                continue
+            mins = self._min.setdefault(key, {})
+            maxs = self._max.setdefault(key, {})
+            for field, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                if field in mins:
+                    if value < mins[field]:
+                        mins[field] = value
+                    if value > maxs[field]:
+                        maxs[field] = value
+                else:
+                    mins[field] = maxs[field] = value
+
+    def take_extrema(self) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, float]]]:
+        extrema = (self._min, self._max)
+        self._min, self._max = {}, {}
+        return extrema
+
+    def due(self, now: float) -> bool:
+        """이번 틱에 전송할 차례인지 (틱 지터를 감안해 구간의 10% 여유)"""
+        if not self.interval:
+            return True
+        if now < self.next_due - 0.1 * self.interval:
+            return False
+        self.next_due += self.interval
+        if self.next_due <= now:
+            self.next_due = now + self.interval
+        return True
+
+
+class ReplayBuffer:
+    """최근 센서 데이터 링 버퍼 (seq가 연속인 (seq, Unix 시각, sensor_data))"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(0, int(capacity))
+        self._items: deque = deque(maxlen=self.capacity or 1)
+
+    def append(self, seq: int, timestamp: float, data: Dict[str, Any]):
+        if self.capacity:
+            self._items.append((seq, timestamp, data))
+
+    @property
+    def first_seq(self) -> Optional[int]:
+        return self._items[0][0] if self.capacity and self._items else None
+
+    @property
+    def last_seq(self) -> Optional[int]:
+        return self._items[-1][0] if self.capacity and self._items else None
+
+    def since(self, seq: int) -> Optional[List[Tuple[int, float, Dict[str, Any]]]]:
+        """seq 이후의 모든 항목 (이미 밀려난 구간이 있거나 버퍼를 사용하지 않으면 None)"""
+        if not self.capacity:
+            return None
+        last = self.last_seq
+        if last is None or seq >= last:
+            return []
+        first = self.first_seq
+        if seq < first - 1:
+            return None
+        return list(islice(self._items, seq - first + 1, None))
+
+
+def _encode(message: Dict[str, Any]):
+    """JSON 직렬화 (fast_json, NumPy 값 직접 지원) → (텍스트 프레임 문자열, 바이트 크기)"""
+    payload = fast_json.dumps(message)
+    return payload.decode('utf-8'), len(payload)
+
 
 class WebSocketManager:
     """WebSocket 연결 관리 및 실시간 데이터 브로드캐스트"""
     
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, queue_size: int = 8, queue_policy: str = "latest", registry=None,
+                 keyframe_interval: float = 2.0, replay_size: int = 3000,
+                 heartbeat_interval: float = 10.0, heartbeat_timeout: float = 30.0):
+        """
+        Args:
+            queue_size: 클라이언트별 송신 큐 길이
+            queue_policy: 송신 큐 정책 (latest: 최신 센서 데이터만 유지, drop_oldest: 가장 오래된 메시지 버림)
+            registry: 센서 레지스트리 (바이너리 프로토콜 채널 스키마, 없으면 JSON만 지원)
+            keyframe_interval: 델타 모드 클라이언트에게 전체 데이터를 보내는 주기 (초)
+            replay_size: 재연결 클라이언트에게 다시 보낼 수 있는 최근 센서 데이터 수 (0이면 사용 안 함)
+            heartbeat_interval: ping 전송 주기 (초, 0이면 하트비트 사용 안 함)
+            heartbeat_timeout: 이 시간 동안 클라이언트 메시지(pong 포함)가 없으면 연결 정리 (초, 0이면 정리 안 함)
+        """
+        if queue_policy not in QUEUE_POLICIES:
+            raise ValueError(f"지원하지 않는 송신 큐 정책입니다: {queue_policy} (가능: {', '.join(QUEUE_POLICIES)})")
+        self.queue_size = queue_size
+        self.queue_policy = queue_policy
+        self.clients: Dict[int, ClientConnection] = {}
         self.connection_count = 0
+        self.binary_schema = BinarySchema.from_registry(registry) if registry is not None else None
+        self.data_seq = 0   # 센서 데이터 메시지 순번
+        # 서버 실행마다 새로 만드는 스트림 ID (재시작으로 seq가 초기화되면 이어받기 거부)
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.replay = ReplayBuffer(replay_size)
+        self._replay_cache: Dict[Tuple, List[Tuple[Any, int]]] = {}
+        self._replay_cache_seq = 0
+        self.heartbeat_interval = max(0.0, float(heartbeat_interval))
+        self.heartbeat_timeout = max(0.0, float(heartbeat_timeout))
+        self.ping_seq = 0
+        self.reaped_count = 0
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self.keyframe_interval = keyframe_interval
+        # 구독 조건별 클라이언트 묶음 (기본 묶음: 전체 채널, 매 틱)
+        self.groups: Dict[Tuple, StreamGroup] = {}
+        # 구독 가능한 채널 (sensor_data 키), 레지스트리가 없으면 제한 없음
+        self.channel_keys = None
+        if registry is not None:
+            self.channel_keys = set(registry.data_keys().values()) | {"hik_camera_data"}
+        METRICS.gauge("hbnu_ws_connections", "연결된 WebSocket 클라이언트 수",
+                      callback=lambda: self.connection_count)
+        METRICS.gauge("hbnu_ws_queue_depth", "전체 클라이언트 송신 큐에 대기 중인 메시지 수",
+                      callback=lambda: sum(client.queue_depth for client in self.clients.values()))
+    
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return [client.websocket for client in self.clients.values()]
     
     async def connect(self, websocket: WebSocket):
         """새 WebSocket 연결 수락"""
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        self.connection_count += 1
+        # 바이너리 서브프로토콜을 요청한 클라이언트만 바이너리 프레임 사용
+        requested = getattr(websocket, 'scope', {}).get('subprotocols', [])
+        subprotocol = select_protocol(requested, self.binary_schema)
+        await websocket.accept(subprotocol=subprotocol)
+        protocol = "binary" if subprotocol == BINARY_SUBPROTOCOL else "json"
+        # 델타/배치 모드는 쿼리 파라미터로 선택 (/ws?delta=1, /ws?batch=10&batch_ms=200)
+        query = getattr(websocket, 'query_params', {})
+        delta = query.get('delta', '').lower() in ('1', 'true')
+        try:
+            resume_from = int(query['resume_from']) if query.get('resume_from') else None
+        except ValueError:
+            resume_from = None
+        try:
+            group = StreamGroup(batch=int(query.get('batch') or 0), batch_ms=float(query.get('batch_ms') or 0))
+        except ValueError as e:
+            print(f"⚠️ 잘못된 배치 설정 무시: {e}")
+            group = StreamGroup()
+        client = ClientConnection(websocket, self.queue_size, self.queue_policy,
+                                  on_close=self.disconnect, protocol=protocol, delta=delta)
+        self.clients[client.id] = client
+        self.connection_count = len(self.clients)
+        self._join_group(client, group)
+        client.start()
         
         print(f"🔗 WebSocket 연결됨 (총 {self.connection_count}개)")
         
@@ -27,61 +472,400 @@ class WebSocketManager:
         await self.send_personal_message({
             "type": "connection",
             "message": "WebSocket 연결이 성공했습니다",
-            "timestamp": self._get_timestamp()
+            "timestamp": self._get_timestamp(),
+            "protocol": protocol,
+            "delta": delta,
+            "subscription": group.describe(),
+            "stream": self.stream_id,
+            "seq": self.data_seq
         }, websocket)
+        if protocol == "binary":
+            await self.send_personal_message(self.binary_schema.schema_message(), websocket)
+        # 이어받기: 대기 없이 바로 큐에 넣으므로 재전송 구간과 다음 실시간 데이터 사이에 빈틈이 없음
+        if resume_from is not None:
+            self._resume(client, resume_from, query.get('stream'))
+    
+    def start(self):
+        """하트비트 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self.heartbeat_interval and self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+    
+    async def _heartbeat_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.heartbeat_interval)
+                self.reap_dead_connections()
+                await self.ping_all_connections()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"❌ 하트비트 오류: {e}")
+    
+    def reap_dead_connections(self) -> int:
+        """heartbeat_timeout 동안 아무 메시지도 보내지 않은 연결 정리 → 정리한 연결 수"""
+        if not self.heartbeat_timeout:
+            return 0
+        deadline = time.monotonic() - self.heartbeat_timeout
+        dead = [client for client in self.clients.values() if client.last_seen < deadline]
+        for client in dead:
+            print(f"💀 응답 없는 WebSocket 연결 정리 ({client.client}, 미응답 ping {client.unanswered_pings}회)")
+            self.disconnect(client.websocket)
+            # 반쯤 열린 소켓은 닫기 핸드셰이크가 끝나지 않을 수 있으므로 기다리지 않음
+            asyncio.create_task(self._close_quietly(client.websocket))
+        self.reaped_count += len(dead)
+        _REAPED.inc(len(dead))
+        return len(dead)
+    
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=1001), timeout=5.0)
+        except Exception:
+            pass
     
     def disconnect(self, websocket: WebSocket):
-        """WebSocket 연결 해제"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            self.connection_count -= 1
+        """WebSocket 연결 해제 (클라이언트 dict와 구독 묶음 dict에서 O(1) 제거, 여러 번 호출해도 안전)"""
+        client = self.clients.pop(id(websocket), None)
+        if client is not None:
+            self._leave_group(client)
+            client.close()
+            self.connection_count = len(self.clients)
             print(f"🔌 WebSocket 연결 해제됨 (총 {self.connection_count}개)")
     
+    def _resume(self, client: ClientConnection, resume_from: int, stream: Optional[str]):
+        """resume_from(클라이언트가 마지막으로 받은 seq) 이후 센서 데이터를 배치 메시지로 재전송"""
+        current = self.data_seq
+        items = None
+        if stream and stream != self.stream_id:
+            reason = "stream_changed"      # 서버 재시작 등으로 seq가 초기화됨
+        elif resume_from > current:
+            reason = "ahead"
+        else:
+            items = self.replay.since(resume_from)
+            reason = "ok" if items is not None else "expired"
+        _RESUMES.labels(result=reason).inc()
+        client.enqueue(*_encode({
+            "type": "resume",
+            "resumed": items is not None,
+            "reason": reason,
+            "stream": self.stream_id,
+            "from_seq": resume_from,
+            "to_seq": current,
+            "replayed": len(items) if items else 0,
+            "timestamp": self._get_timestamp()
+        }))
+        if not items:
+            return
+        for message, size in self._replay_messages(client, resume_from, items):
+            client.enqueue(message, size, is_data=True, conflate=False)
+        client.replayed += len(items)
+        _REPLAYED.inc(len(items))
+    
+    def _replay_messages(self, client: ClientConnection, resume_from: int,
+                         items: List[Tuple[int, float, Dict[str, Any]]]) -> List[Tuple[Any, int]]:
+        """재전송 배치 메시지 (같은 틱에 같은 지점에서 재연결한 클라이언트끼리 직렬화 결과 공유)"""
+        if self._replay_cache_seq != self.data_seq:
+            self._replay_cache.clear()
+            self._replay_cache_seq = self.data_seq
+        group = client.group
+        key = (resume_from, client.protocol, group.keys if group is not None else None)
+        cached = self._replay_cache.get(key)
+        if cached is not None:
+            return cached
+        messages = []
+        for start in range(0, len(items), REPLAY_CHUNK):
+            chunk = items[start:start + REPLAY_CHUNK]
+            seqs = [item[0] for item in chunk]
+            times = [item[1] for item in chunk]
+            samples = [group.select(item[2]) if group is not None else item[2] for item in chunk]
+            if client.protocol == "json":
+                messages.append(_encode({
+                    "type": "sensor_batch",
+                    "replay": True,
+                    "seq": seqs[-1],
+                    "first_seq": seqs[0],
+                    "count": len(chunk),
+                    "seqs": seqs,
+                    "times": times,
+                    "data": columnize(samples),
+                    "timestamp": self._get_timestamp(),
+                    "connection_count": self.connection_count
+                }))
+            else:
+                frame = self.binary_schema.encode_batch(seqs, times, samples)
+                messages.append((frame, len(frame)))
+        self._replay_cache[key] = messages
+        return messages
+    
+    def _join_group(self, client: ClientConnection, group: StreamGroup):
+        """같은 조건의 기존 묶음이 있으면 합류, 없으면 새 묶음 등록"""
+        self._leave_group(client)
+        group = self.groups.setdefault(group.key, group)
+        group.clients[client.id] = client
+        client.group = group
+        client.needs_keyframe = True
+    
+    def _leave_group(self, client: ClientConnection):
+        group = client.group
+        if group is None:
+            return
+        group.clients.pop(client.id, None)
+        if not group.clients:
+            self.groups.pop(group.key, None)
+            group.take_pending()
+        client.group = None
+    
+    def _resolve_channels(self, channels) -> Tuple[Optional[FrozenSet[str]], List[str]]:
+        """구독 채널 이름(cnc, laser, ... 또는 cnc_data) → (sensor_data 키 집합, 알 수 없는 이름)"""
+        if channels is None or channels == "all" or channels == ["all"]:
+            return None, []
+        if isinstance(channels, str):
+            channels = [channels]
+        keys, unknown = set(), []
+        for name in channels:
+            name = str(name)
+            key = name if name.endswith("_data") else f"{name}_data"
+            if self.channel_keys is not None and key not in self.channel_keys:
+                unknown.append(name)
+            else:
+                keys.add(key)
+        return frozenset(keys), unknown
+    
+    def subscribe(self, websocket: WebSocket, channels=None, max_rate: float = 0.0,
+                  aggregation: str = "last", batch: int = 0, batch_ms: float = 0.0) -> Dict[str, Any]:
+        """클라이언트 구독 조건 변경 → 적용된 구독 조건"""
+        client = self.clients.get(id(websocket))
+        if client is None:
+            raise ValueError("연결되지 않은 클라이언트입니다")
+        keys, unknown = self._resolve_channels(channels)
+        group = StreamGroup(keys, float(max_rate or 0), str(aggregation or "last").lower(),
+                            int(batch or 0), float(batch_ms or 0))
+        self._join_group(client, group)
+        return {**client.group.describe(), "unknown": unknown}
+    
+    def handle_client_message(self, websocket: WebSocket, text: str):
+        """클라이언트 메시지 처리
+
+        pong: {"type": "pong", "id": n} (ping의 id를 그대로 반환, 왕복 시간 측정)
+        resync: 다음 전송 시 키프레임
+        subscribe: {"type": "subscribe", "channels": ["cnc", "laser"], "max_rate": 10, "aggregation": "minmax",
+                    "batch": 10, "batch_ms": 200}
+        """
+        client = self.clients.get(id(websocket))
+        if client is None:
+            return
+        # 어떤 메시지든 연결이 살아 있다는 뜻
+        now = time.monotonic()
+        client.last_seen = now
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+        msg_type = message.get("type")
+        if msg_type == "pong":
+            rtt = client.mark_pong(message.get("id"), now)
+            if rtt is not None:
+                _RTT_SECONDS.observe(rtt)
+        elif msg_type == "resync":
+            client.needs_keyframe = True
+        elif msg_type == "subscribe":
+            try:
+                reply = {"type": "subscribed", **self.subscribe(
+                    websocket, message.get("channels"), message.get("max_rate") or 0,
+                    message.get("aggregation") or "last", message.get("batch") or 0,
+                    message.get("batch_ms") or 0
+                )}
+            except (TypeError, ValueError) as e:
+                reply = {"type": "error", "message": f"구독 요청 오류: {e}"}
+            reply["timestamp"] = self._get_timestamp()
+            client.enqueue(*_encode(reply))
+    
+    def shutdown(self):
+        """하트비트와 모든 송신 태스크 정지 (서버 종료 시)"""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        for group in self.groups.values():
+            group.take_pending()
+        self.groups.clear()
+        for client in list(self.clients.values()):
+            client.close()
+        self.clients.clear()
+        self.connection_count = 0
+    
     async def send_personal_message(self, message: Dict[str, Any], websocket: WebSocket):
-        """특정 클라이언트에게 메시지 전송"""
+        """특정 클라이언트에게 메시지 전송 (송신 큐에 추가)"""
+        client = self.clients.get(id(websocket))
+        if client is None:
+            return
         try:
-            await websocket.send_text(json.dumps(message, ensure_ascii=False))
+            client.enqueue(*_encode(message))
         except Exception as e:
             print(f"⚠️ 개별 메시지 전송 오류: {e}")
-            self.disconnect(websocket)
+    
+    def _broadcast(self, message: Dict[str, Any]):
+        """한 번 직렬화해 모든 클라이언트 송신 큐에 추가 (소켓 대기 없음)"""
+        message_json, size = _encode(message)
+        for client in list(self.clients.values()):
+            client.enqueue(message_json, size)
     
     async def broadcast_data(self, sensor_data: Dict[str, Any]):
-        """모든 연결된 클라이언트에게 센서 데이터 브로드캐스트"""
-        if not self.active_connections:
+        """모든 연결된 클라이언트에게 센서 데이터 브로드캐스트 (구독 조건별로 한 번씩 직렬화)"""
+        # 연결된 클라이언트가 없어도 순번과 재전송 버퍼는 계속 갱신 (끊겼던 클라이언트의 이어받기용)
+        self.data_seq += 1
+        self.replay.append(self.data_seq, time.time(), sensor_data)
+        if not self.clients:
             return
         
         try:
-            # 센서 데이터를 WebSocket 메시지 형태로 변환
-            message = {
-                "type": "sensor_data",
-                "data": sensor_data,
-                "timestamp": self._get_timestamp(),
-                "connection_count": self.connection_count
-            }
-            
-            # JSON 직렬화
-            message_json = json.dumps(message, ensure_ascii=False, default=str)
-            
-            # 모든 연결된 클라이언트에게 전송
-            disconnected_connections = []
-            
-            for connection in self.active_connections:
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    print(f"⚠️ 브로드캐스트 전송 오류: {e}")
-                    disconnected_connections.append(connection)
-            
-            # 연결이 끊어진 클라이언트 제거
-            for connection in disconnected_connections:
-                self.disconnect(connection)
+            started = time.perf_counter()
+            now = time.monotonic()
+            for group in list(self.groups.values()):
+                self._broadcast_group(group, sensor_data, now)
+            _SERIALIZE_SECONDS.observe(time.perf_counter() - started)
                 
         except Exception as e:
             print(f"❌ 브로드캐스트 오류: {e}")
     
+    def _broadcast_group(self, group: StreamGroup, sensor_data: Dict[str, Any], now: float):
+        """구독 묶음 하나에 전송 (전송 차례가 아니면 집계만)"""
+        seq = self.data_seq
+        data = group.select(sensor_data)
+        minmax = group.aggregation == "minmax"
+        if minmax:
+            group.accumulate(data)
+        if not group.due(now):
+            return
+        if group.batching:
+            self._add_to_batch(group, seq, data, group.take_extrema() if minmax else None)
+            return
+        clients = list(group.clients.values())
+        encoded = {}
+        
+        # 델타 모드 클라이언트용 마지막 전송 대비 변경분 (묶음 안의 델타 클라이언트가 공유)
+        # minmax 집계는 구간 값이 매번 달라지므로 델타 없이 전체 전송
+        keyframe_due = True
+        changed = removed = None
+        if not minmax and any(client.delta for client in clients):
+            flat = flatten(data)
+            if group.last_flat is not None and now - group.last_keyframe < self.keyframe_interval:
+                keyframe_due = False
+                changed, removed = diff(group.last_flat, flat)
+            else:
+                group.last_keyframe = now
+            group.last_flat = flat
+        else:
+            group.last_flat = None
+        extrema = group.take_extrema() if minmax else None
+        base_seq = group.last_seq
+        group.last_seq = seq
+        
+        def full(protocol: str):
+            # 프로토콜별로 한 번만 직렬화 (해당 프로토콜 클라이언트가 있을 때만)
+            if protocol not in encoded:
+                if protocol == "json":
+                    # 센서 데이터를 WebSocket 메시지 형태로 변환
+                    message = {
+                        "type": "sensor_data",
+                        "data": data,
+                        "timestamp": self._get_timestamp(),
+                        "connection_count": self.connection_count,
+                        "seq": seq
+                    }
+                    if extrema is not None:
+                        message.update(aggregation="minmax", min=extrema[0], max=extrema[1])
+                    encoded[protocol] = _encode(message)
+                else:
+                    frame = self.binary_schema.encode(seq, time.time(), data, extrema=extrema)
+                    encoded[protocol] = (frame, len(frame))
+            return encoded[protocol]
+        
+        def delta(protocol: str):
+            key = f"{protocol}_delta"
+            if key not in encoded:
+                if protocol == "json":
+                    encoded[key] = _encode({
+                        "type": "sensor_delta",
+                        "seq": seq,
+                        "base_seq": base_seq,
+                        "changed": changed,
+                        "removed": removed
+                    })
+                elif self.binary_schema.covers(removed, changed):
+                    frame = self.binary_schema.encode(seq, time.time(), data, changed=changed,
+                                                      base_seq=base_seq)
+                    encoded[key] = (frame, len(frame))
+                else:
+                    # 바이너리 델타로 표현할 수 없는 채널 삭제 (센서 끊김/None으로 전환) → 키프레임
+                    encoded[key] = None
+            return encoded[key]
+        
+        for client in clients:
+            message = None
+            # 대기 중인 데이터를 대체하거나 이전 데이터가 버려졌으면 델타 연쇄가 끊기므로 키프레임
+            if (client.delta and not keyframe_due and not client.needs_keyframe
+                    and not client.has_pending_data):
+                message = delta(client.protocol)
+            if message is not None:
+                client.deltas_sent += 1
+            else:
+                message = full(client.protocol)
+                if client.delta:
+                    client.needs_keyframe = False
+                    client.keyframes_sent += 1
+            client.enqueue(message[0], message[1], is_data=True)
+    
+    def _add_to_batch(self, group: StreamGroup, seq: int, data: Dict[str, Any],
+                      extrema: Optional[Tuple[Dict, Dict]]):
+        """배치 버퍼에 추가하고 틱 수를 채우면 바로, 아니면 첫 샘플 기준 batch_ms 뒤에 전송"""
+        if group.add_sample(seq, data, extrema):
+            self._flush_batch(group)
+        elif group.flush_handle is None and group.batch_ms:
+            loop = asyncio.get_running_loop()
+            group.flush_handle = loop.call_later(group.batch_ms / 1000.0, self._flush_batch, group)
+    
+    def _flush_batch(self, group: StreamGroup):
+        """배치 버퍼를 필드별 배열 메시지 하나로 직렬화해 묶음의 모든 클라이언트에 전송"""
+        pending = group.take_pending()
+        if not pending or not group.clients:
+            return
+        seqs = [item[0] for item in pending]
+        times = [item[1] for item in pending]
+        samples = [item[2] for item in pending]
+        extrema = [item[3] for item in pending] if group.aggregation == "minmax" else None
+        encoded = {}
+        for client in list(group.clients.values()):
+            if client.protocol not in encoded:
+                if client.protocol == "json":
+                    message = {
+                        "type": "sensor_batch",
+                        "seq": seqs[-1],
+                        "first_seq": seqs[0],
+                        "count": len(pending),
+                        "seqs": seqs,
+                        "times": times,
+                        "data": columnize(samples),
+                        "timestamp": self._get_timestamp(),
+                        "connection_count": self.connection_count
+                    }
+                    if extrema is not None:
+                        message.update(aggregation="minmax",
+                                       min=columnize([item[0] for item in extrema]),
+                                       max=columnize([item[1] for item in extrema]))
+                    encoded["json"] = _encode(message)
+                else:
+                    frame = self.binary_schema.encode_batch(seqs, times, samples, extrema=extrema)
+                    encoded[client.protocol] = (frame, len(frame))
+            message, size = encoded[client.protocol]
+            client.batches_sent += 1
+            # 배치는 여러 틱을 담고 있으므로 최신 값으로 대체하지 않음
+            client.enqueue(message, size, is_data=True, conflate=False)
+    
     async def broadcast_status(self, status_data: Dict[str, Any]):
         """시스템 상태 정보 브로드캐스트"""
-        if not self.active_connections:
+        if not self.clients:
             return
         
         try:
@@ -90,27 +874,14 @@ class WebSocketManager:
                 "data": status_data,
                 "timestamp": self._get_timestamp()
             }
-            
-            message_json = json.dumps(message, ensure_ascii=False, default=str)
-            
-            disconnected_connections = []
-            
-            for connection in self.active_connections:
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    print(f"⚠️ 상태 브로드캐스트 전송 오류: {e}")
-                    disconnected_connections.append(connection)
-            
-            for connection in disconnected_connections:
-                self.disconnect(connection)
+            self._broadcast(message)
                 
         except Exception as e:
             print(f"❌ 상태 브로드캐스트 오류: {e}")
     
     async def broadcast_save_status(self, save_status: Dict[str, Any]):
         """저장 상태 정보 브로드캐스트"""
-        if not self.active_connections:
+        if not self.clients:
             return
         
         try:
@@ -119,20 +890,7 @@ class WebSocketManager:
                 "data": save_status,
                 "timestamp": self._get_timestamp()
             }
-            
-            message_json = json.dumps(message, ensure_ascii=False, default=str)
-            
-            disconnected_connections = []
-            
-            for connection in self.active_connections:
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    print(f"⚠️ 저장 상태 브로드캐스트 전송 오류: {e}")
-                    disconnected_connections.append(connection)
-            
-            for connection in disconnected_connections:
-                self.disconnect(connection)
+            self._broadcast(message)
                 
         except Exception as e:
             print(f"❌ 저장 상태 브로드캐스트 오류: {e}")
@@ -143,49 +901,49 @@ class WebSocketManager:
         return datetime.now().isoformat()
     
     def get_connection_info(self) -> Dict[str, Any]:
-        """연결 정보 조회"""
+        """연결 정보 조회 (클라이언트별 송신 큐 길이, 버린 메시지 수 포함)"""
         return {
             "active_connections": self.connection_count,
-            "connections": [
-                {
-                    "id": id(conn),
-                    "client": str(conn.client) if hasattr(conn, 'client') else "unknown"
-                }
-                for conn in self.active_connections
-            ]
+            "stream": self.stream_id,
+            "seq": self.data_seq,
+            "replay": {
+                "size": self.replay.capacity,
+                "first_seq": self.replay.first_seq,
+                "last_seq": self.replay.last_seq
+            },
+            "queue_policy": self.queue_policy,
+            "queue_size": self.queue_size,
+            "heartbeat": {
+                "interval_s": self.heartbeat_interval,
+                "timeout_s": self.heartbeat_timeout,
+                "reaped": self.reaped_count
+            },
+            "connections": [client.get_stats() for client in self.clients.values()]
         }
     
     async def ping_all_connections(self):
-        """모든 연결에 핑 메시지 전송 (연결 상태 확인)"""
-        if not self.active_connections:
+        """모든 연결에 핑 메시지 전송 (클라이언트는 같은 id로 pong 응답, 왕복 시간 측정)"""
+        if not self.clients:
             return
         
         try:
+            self.ping_seq += 1
             ping_message = {
                 "type": "ping",
+                "id": self.ping_seq,
                 "timestamp": self._get_timestamp()
             }
-            
-            message_json = json.dumps(ping_message, ensure_ascii=False)
-            
-            disconnected_connections = []
-            
-            for connection in self.active_connections:
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    print(f"⚠️ 핑 전송 오류: {e}")
-                    disconnected_connections.append(connection)
-            
-            for connection in disconnected_connections:
-                self.disconnect(connection)
+            sent_at = time.monotonic()
+            for client in self.clients.values():
+                client.mark_ping(self.ping_seq, sent_at)
+            self._broadcast(ping_message)
                 
         except Exception as e:
             print(f"❌ 핑 브로드캐스트 오류: {e}")
     
     async def send_error_message(self, error_message: str):
         """에러 메시지를 모든 클라이언트에게 전송"""
-        if not self.active_connections:
+        if not self.clients:
             return
         
         try:
@@ -194,20 +952,7 @@ class WebSocketManager:
                 "message": error_message,
                 "timestamp": self._get_timestamp()
             }
-            
-            message_json = json.dumps(message, ensure_ascii=False)
-            
-            disconnected_connections = []
-            
-            for connection in self.active_connections:
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    print(f"⚠️ 에러 메시지 전송 오류: {e}")
-                    disconnected_connections.append(connection)
-            
-            for connection in disconnected_connections:
-                self.disconnect(connection)
+            self._broadcast(message)
                 
         except Exception as e:
             print(f"❌ 에러 메시지 브로드캐스트 오류: {e}")
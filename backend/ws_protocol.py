@@ -0,0 +1,338 @@
+"""
+WebSocket 바이너리 프로토콜 - 센서 데이터 고정 레이아웃 프레임
+/ws 연결 시 서브프로토콜 "hbnu.sensor.v1"을 요청한 클라이언트에게만 사용
+(요청하지 않은 클라이언트는 기존 JSON 텍스트 메시지를 그대로 받음)
+
+연결 직후 JSON 텍스트로 schema 메시지를 한 번 보내고, 이후 센서 데이터는 바이너리 프레임으로 전송:
+    헤더 (little-endian, 20 bytes): version u8, msg_type u8, channel_count u16, seq u32, base_seq u32,
+                                    timestamp f64 (Unix 초)
+    존재 비트마스크: ceil(channel_count / 8) bytes, 채널 i는 (i // 8)번째 바이트의 (i % 8)번째 비트
+    값: 존재하는 채널만 스키마 순서대로 float64
+    msg_type 1(sensor_data)은 전체 값, 2(sensor_delta)는 base_seq 이후 바뀐 채널만 포함,
+    3(sensor_minmax)은 채널마다 (마지막 값, 구간 최소, 구간 최대) float64 3개
+    4(sensor_batch)/5(sensor_batch_minmax)는 여러 틱을 묶은 열 단위 프레임 (아래 배치 모드 참고)
+
+델타 모드 (/ws?delta=1): 주기적인 키프레임(전체 sensor_data) 사이에 바뀐 필드만 전송
+    JSON: {"type": "sensor_delta", "seq": n, "base_seq": m, "changed": {key: {field: value}}, "removed": {key: [field]}}
+    클라이언트는 removed를 먼저 적용한 뒤 changed를 적용하고, 상태 값이 dict가 아니면 changed 값으로 통째로 교체
+    (센서 연결/해제로 키가 None ↔ dict로 바뀌면 removed 없이 changed에 새 값 전체를 담음)
+    base_seq는 이 클라이언트에게 직전에 보낸 seq (전송률 제한 시 seq는 건너뛰며 증가)
+    클라이언트는 base_seq가 마지막으로 받은 seq와 다르면 {"type": "resync"}를 보내 다음 전송에 키프레임을 받음
+배치 모드 (/ws?batch=N 또는 /ws?batch_ms=T): N틱 또는 T밀리초 동안의 데이터를 필드별 배열 하나로 묶어 전송
+    JSON: {"type": "sensor_batch", "seq": 마지막 seq, "first_seq": n, "count": k, "seqs": [...], "times": [Unix 초...],
+           "data": {key: {field: [값...]}, "timestamp": [...]}} (해당 틱에 없는 값은 null)
+    바이너리: 헤더(seq=마지막 seq, base_seq=첫 seq) + 샘플 수 u16 + 시각 float64[k] + 존재 비트마스크
+              + 존재하는 채널마다 float64[k] 열 (없는 값은 NaN, batch_minmax는 값/최소/최대 열 3개)
+필드 이름을 매 메시지마다 반복하지 않으므로 JSON 대비 크기와 직렬화 비용이 작음
+숫자 채널만 포함하며, 연결 상태 등은 기존 JSON 상태 메시지와 REST API로 확인
+"""
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+BINARY_SUBPROTOCOL = "hbnu.sensor.v1"
+PROTOCOL_VERSION = 1
+
+# 메시지 종류
+MSG_SENSOR_DATA = 1
+MSG_SENSOR_DELTA = 2
+MSG_SENSOR_MINMAX = 3
+MSG_SENSOR_BATCH = 4
+MSG_SENSOR_BATCH_MINMAX = 5
+
+FRAME_HEADER = struct.Struct("<BBHIId")
+BATCH_COUNT = struct.Struct("<H")
+
+# 배치 한 건의 최대 샘플 수 (바이너리 샘플 수 필드 u16)
+MAX_BATCH_SAMPLES = 1000
+
+
+class BinarySchema:
+    """센서 데이터 채널 순서 (sensor_data[data_key][field]) 및 프레임 인코딩"""
+
+    def __init__(self, channels: List[Tuple[str, str]]):
+        """
+        Args:
+            channels: (data_key, field) 목록, 프레임의 채널 순서
+        """
+        self.channels = list(channels)
+        self.mask_bytes = (len(self.channels) + 7) // 8
+        # data_key별 (채널 인덱스, 필드) 묶음: 센서 단위로 한 번만 조회
+        self._groups: Dict[str, List[Tuple[int, str]]] = {}
+        for index, (key, field) in enumerate(self.channels):
+            self._groups.setdefault(key, []).append((index, field))
+
+    @classmethod
+    def from_registry(cls, registry) -> "BinarySchema":
+        """센서 레지스트리의 숫자 채널로 스키마 구성"""
+        channels = []
+        for plugin in registry:
+            if plugin.data_key:
+                channels.extend((plugin.data_key, channel) for channel in plugin.channels)
+        return cls(channels)
+
+    def schema_message(self) -> Dict[str, Any]:
+        """연결 시 한 번 보내는 스키마 메시지 (JSON)"""
+        return {
+            "type": "schema",
+            "protocol": BINARY_SUBPROTOCOL,
+            "version": PROTOCOL_VERSION,
+            "header": {
+                "format": FRAME_HEADER.format,
+                "size": FRAME_HEADER.size,
+                "fields": ["version", "msg_type", "channel_count", "seq", "base_seq", "timestamp"]
+            },
+            "msg_types": {
+                "sensor_data": MSG_SENSOR_DATA,
+                "sensor_delta": MSG_SENSOR_DELTA,
+                "sensor_minmax": MSG_SENSOR_MINMAX,
+                "sensor_batch": MSG_SENSOR_BATCH,
+                "sensor_batch_minmax": MSG_SENSOR_BATCH_MINMAX
+            },
+            "mask_bytes": self.mask_bytes,
+            "channels": [{"key": key, "field": field} for key, field in self.channels]
+        }
+
+    def encode(self, seq: int, timestamp: float, sensor_data: Dict[str, Any],
+               changed: Optional[Dict[str, Any]] = None, base_seq: int = 0,
+               extrema: Optional[Tuple[Dict, Dict]] = None) -> bytes:
+        """sensor_data → 바이너리 프레임
+
+        changed를 주면 해당 필드만 담은 델타 프레임,
+        extrema(구간 최소, 최대)를 주면 채널마다 (값, 최소, 최대)를 담은 minmax 프레임
+        """
+        mask = bytearray(self.mask_bytes)
+        values = []
+        source = sensor_data if changed is None else changed
+        for key, fields in self._groups.items():
+            data = source.get(key)
+            if not data:
+                continue
+            for index, field in fields:
+                if field not in data:
+                    continue
+                value = data[field]
+                if value is None or isinstance(value, (str, bytes)):
+                    continue
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                values.append(value)
+                if extrema is not None:
+                    values.append(float(extrema[0].get(key, {}).get(field, value)))
+                    values.append(float(extrema[1].get(key, {}).get(field, value)))
+                mask[index >> 3] |= 1 << (index & 7)
+        if extrema is not None:
+            msg_type = MSG_SENSOR_MINMAX
+        else:
+            msg_type = MSG_SENSOR_DATA if changed is None else MSG_SENSOR_DELTA
+        header = FRAME_HEADER.pack(PROTOCOL_VERSION, msg_type, len(self.channels),
+                                   seq & 0xFFFFFFFF, base_seq & 0xFFFFFFFF, timestamp)
+        return header + bytes(mask) + struct.pack(f"<{len(values)}d", *values)
+
+    def encode_batch(self, seqs: List[int], times: List[float], samples: List[Dict[str, Any]],
+                     extrema: Optional[List[Tuple[Dict, Dict]]] = None) -> bytes:
+        """여러 틱의 sensor_data → 열 단위 배치 프레임 (채널마다 샘플 수만큼 float64, 없는 값은 NaN)
+
+        extrema(틱별 구간 최소, 최대 목록)를 주면 채널마다 값/최소/최대 열 3개
+        """
+        count = len(samples)
+        nan = float("nan")
+        columns: Dict[int, List[float]] = {}
+        for i, sample in enumerate(samples):
+            for key, fields in self._groups.items():
+                data = sample.get(key)
+                if not data:
+                    continue
+                for index, field in fields:
+                    value = data.get(field)
+                    if value is None or isinstance(value, (str, bytes)):
+                        continue
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        continue
+                    column = columns.get(index)
+                    if column is None:
+                        width = 3 if extrema is not None else 1
+                        column = columns[index] = [nan] * (count * width)
+                    column[i] = value
+                    if extrema is not None:
+                        mins, maxs = extrema[i]
+                        column[count + i] = float(mins.get(key, {}).get(field, value))
+                        column[2 * count + i] = float(maxs.get(key, {}).get(field, value))
+
+        mask = bytearray(self.mask_bytes)
+        values = []
+        for index in sorted(columns):
+            mask[index >> 3] |= 1 << (index & 7)
+            values.extend(columns[index])
+        msg_type = MSG_SENSOR_BATCH if extrema is None else MSG_SENSOR_BATCH_MINMAX
+        header = FRAME_HEADER.pack(PROTOCOL_VERSION, msg_type, len(self.channels),
+                                   seqs[-1] & 0xFFFFFFFF, seqs[0] & 0xFFFFFFFF, times[-1])
+        return (header + BATCH_COUNT.pack(count) + struct.pack(f"<{count}d", *times)
+                + bytes(mask) + struct.pack(f"<{len(values)}d", *values))
+
+    def covers(self, removed: Dict[str, Any], changed: Optional[Dict[str, Any]] = None) -> bool:
+        """삭제된 필드(또는 None으로 바뀐 센서)가 스키마 채널 밖에만 있는지 (바이너리 델타는 삭제를 표현할 수 없음)"""
+        if changed:
+            for key, value in changed.items():
+                if key in self._groups and not isinstance(value, dict):
+                    return False
+        for key, fields in removed.items():
+            group = self._groups.get(key)
+            if group is None:
+                continue
+            names = {field for _, field in group}
+            if fields is None or names.intersection(fields):
+                return False
+        return True
+
+    def decode(self, payload: bytes) -> Tuple[int, int, int, float, Dict[str, Dict[str, Any]]]:
+        """바이너리 프레임 → (msg_type, seq, base_seq, timestamp, sensor_data 형태 dict)
+
+        minmax 프레임의 값은 (값, 최소, 최대) 튜플,
+        배치 프레임은 필드별 값 목록(없는 값은 NaN, minmax는 튜플 목록)과 샘플 시각 목록 "time" (테스트/벤치마크 클라이언트용)
+        """
+        version, msg_type, count, seq, base_seq, timestamp = FRAME_HEADER.unpack_from(payload)
+        if (version != PROTOCOL_VERSION
+                or not MSG_SENSOR_DATA <= msg_type <= MSG_SENSOR_BATCH_MINMAX
+                or count != len(self.channels)):
+            raise ValueError(f"스키마와 맞지 않는 프레임입니다 (version={version}, type={msg_type}, channels={count})")
+        offset = FRAME_HEADER.size
+        if msg_type in (MSG_SENSOR_BATCH, MSG_SENSOR_BATCH_MINMAX):
+            return (msg_type, seq, base_seq, timestamp,
+                    self._decode_batch(payload, offset, msg_type == MSG_SENSOR_BATCH_MINMAX))
+        mask = payload[offset:offset + self.mask_bytes]
+        offset += self.mask_bytes
+        present = [i for i in range(count) if mask[i >> 3] & (1 << (i & 7))]
+        width = 3 if msg_type == MSG_SENSOR_MINMAX else 1
+        values = struct.unpack_from(f"<{len(present) * width}d", payload, offset)
+        data: Dict[str, Dict[str, Any]] = {}
+        for n, index in enumerate(present):
+            key, field = self.channels[index]
+            data.setdefault(key, {})[field] = values[n] if width == 1 else values[n * 3:n * 3 + 3]
+        return msg_type, seq, base_seq, timestamp, data
+
+    def _decode_batch(self, payload: bytes, offset: int, minmax: bool) -> Dict[str, Any]:
+        (samples,) = BATCH_COUNT.unpack_from(payload, offset)
+        offset += BATCH_COUNT.size
+        data: Dict[str, Any] = {"time": list(struct.unpack_from(f"<{samples}d", payload, offset))}
+        offset += 8 * samples
+        mask = payload[offset:offset + self.mask_bytes]
+        offset += self.mask_bytes
+        present = [i for i in range(len(self.channels)) if mask[i >> 3] & (1 << (i & 7))]
+        width = 3 if minmax else 1
+        values = struct.unpack_from(f"<{len(present) * width * samples}d", payload, offset)
+        for n, index in enumerate(present):
+            key, field = self.channels[index]
+            start = n * width * samples
+            column = values[start:start + samples]
+            if minmax:
+                column = list(zip(column, values[start + samples:start + 2 * samples],
+                                  values[start + 2 * samples:start + 3 * samples]))
+            data.setdefault(key, {})[field] = list(column)
+        return data
+
+
+def columnize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """sensor_data 목록 → 필드별 배열 {key: {field: [값...]}} (최상위 값은 {key: [값...]}, 없는 값은 None)"""
+    count = len(samples)
+    columns: Dict[str, Any] = {}
+    for i, sample in enumerate(samples):
+        for key, value in sample.items():
+            if isinstance(value, dict):
+                fields = columns.get(key)
+                if not isinstance(fields, dict):
+                    fields = columns[key] = {}
+                for field, item in value.items():
+                    column = fields.get(field)
+                    if column is None:
+                        column = fields[field] = [None] * count
+                    column[i] = item
+            elif value is not None:
+                column = columns.get(key)
+                if not isinstance(column, list):
+                    column = columns[key] = [None] * count
+                column[i] = value
+    return columns
+
+
+def flatten(sensor_data: Dict[str, Any]) -> Dict[Tuple[str, Optional[str]], Any]:
+    """sensor_data → {(key, field): value} (센서 dict가 아닌 최상위 값은 field=None)"""
+    flat = {}
+    for key, value in sensor_data.items():
+        if isinstance(value, dict):
+            for field, item in value.items():
+                flat[(key, field)] = item
+        else:
+            flat[(key, None)] = value
+    return flat
+
+
+def diff(previous: Dict[Tuple[str, Optional[str]], Any],
+         current: Dict[Tuple[str, Optional[str]], Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """두 flatten 결과의 차이 → (changed, removed)
+
+    changed: {key: {field: value}} (최상위 값은 {key: value})
+    removed: {key: [field, ...]} (최상위 값은 {key: None})
+    키가 None ↔ dict로 바뀐 경우(센서 연결/해제)는 changed에만 새 값 전체가 들어가고 removed에는 넣지 않음
+    """
+    changed: Dict[str, Any] = {}
+    removed: Dict[str, Any] = {}
+    missing = object()
+    for (key, field), value in current.items():
+        old = previous.get((key, field), missing)
+        if old is not missing and (old is value or old == value):
+            continue
+        if field is None:
+            changed[key] = value
+        else:
+            changed.setdefault(key, {})[field] = value
+    gone = previous.keys() - current.keys()
+    if not gone:
+        return changed, removed
+    dict_keys = {key for key, field in current if field is not None}
+    for (key, field) in gone:
+        if field is None:
+            if key in dict_keys:
+                # None → dict: changed에 새 필드 전체가 들어 있음
+                continue
+            removed[key] = None
+        else:
+            if (key, None) in current:
+                # dict → None: changed[key]가 값 전체를 교체
+                continue
+            removed.setdefault(key, []).append(field)
+    return changed, removed
+
+
+def apply_delta(state: Dict[str, Any], message: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON 델타 메시지를 클라이언트 상태(sensor_data)에 적용 (테스트/벤치마크 클라이언트용, 삭제 → 변경 순서)"""
+    for key, fields in (message.get("removed") or {}).items():
+        if fields is None:
+            state.pop(key, None)
+            continue
+        data = state.get(key)
+        if data is not None:
+            for field in fields:
+                data.pop(field, None)
+            if not data:
+                state.pop(key, None)
+    for key, value in (message.get("changed") or {}).items():
+        data = state.get(key)
+        if isinstance(value, dict) and isinstance(data, dict):
+            data.update(value)
+        elif isinstance(value, dict):
+            # 없던 센서 또는 None이던 센서가 연결됨 → 통째로 교체
+            state[key] = dict(value)
+        else:
+            state[key] = value
+    return state
+
+
+def select_protocol(requested: List[str], schema: Optional[BinarySchema]) -> Optional[str]:
+    """클라이언트가 요청한 서브프로토콜 중 지원하는 것 (없으면 None = JSON)"""
+    if schema is not None and BINARY_SUBPROTOCOL in requested:
+        return BINARY_SUBPROTOCOL
+    return None
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+JSON 직렬화 벤치마크 - 기존 경로 vs backend.fast_json
+
+비교 대상:
+    WebSocket 브로드캐스트: json.dumps(message, ensure_ascii=False, default=str) vs fast_json.dumps
+    REST 히스토리 응답: jsonable_encoder + json.dumps (FastAPI 기본 JSONResponse) vs FastJSONResponse
+    센서 링 버퍼 구간: ndarray.tolist() + NaN 치환 + json.dumps vs NumPy 배열 직접 직렬화
+
+사용법:
+    python benchmarks/json_encode_bench.py --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+from backend import fast_json
+
+
+def make_sensor_data(numpy_values: bool = False) -> dict:
+    """collect_all_data 형태의 한 틱 데이터 (numpy_values=True면 NumPy 스칼라 포함)"""
+    num = np.float32 if numpy_values else float
+    return {
+        "timestamp": "2024-01-01 12:00:00.000",
+        "camera_data": {"melt_pool_area": num(15.25), "image_available": True,
+                        "frame_id": 1024, "frame_shape": [520, 720, 3]},
+        "laser_data": {"outpower": num(random.uniform(400, 500)), "setpower": num(500.0)},
+        "pyrometer_data": {"mpt": num(random.uniform(1600, 1700)), "1ct": num(1620.0), "2ct": num(1680.0)},
+        "cnc_data": {
+            "curpos_x": num(random.uniform(0, 100)), "curpos_y": num(random.uniform(0, 100)),
+            "curpos_z": num(5.2), "curpos_a": num(0.0), "curpos_c": num(0.0),
+            "feed_rate": 1000.0, "feed_override": 100.0, "rapid_override": 100.0
+        },
+        "hik_camera_data": None
+    }
+
+
+def make_history_row() -> dict:
+    """DataStorage._normalize_data 형태의 히스토리 행"""
+    return {
+        "timestamp": "2024-01-01 12:00:00.000", "time_elapsed": random.uniform(0, 1000),
+        "curpos_x": random.uniform(0, 100), "curpos_y": random.uniform(0, 100), "curpos_z": 5.2,
+        "curpos_a": 0.0, "curpos_c": 0.0, "mpt": random.uniform(1600, 1700), "1ct": 1620.0, "2ct": 1680.0,
+        "outpower": random.uniform(400, 500), "setpower": 500.0, "melt_pool_area": 15.25,
+        "image_available": True, "hik_image_available": False
+    }
+
+
+def bench(func, repeat: int) -> float:
+    """호출 1회당 평균 시간 (마이크로초)"""
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 직렬화 벤치마크")
+    parser.add_argument("--rows", type=int, default=1000, help="히스토리 응답 행 수")
+    parser.add_argument("--samples", type=int, default=6000, help="링 버퍼 구간 샘플 수 (예: 60초 × 100Hz)")
+    parser.add_argument("--repeat", type=int, default=200, help="반복 횟수")
+    args = parser.parse_args()
+
+    message = {"type": "sensor_data", "data": make_sensor_data(), "timestamp": "2024-01-01T12:00:00",
+               "connection_count": 3, "seq": 1}
+    numpy_message = dict(message, data=make_sensor_data(numpy_values=True))
+    history = [make_history_row() for _ in range(args.rows)]
+    window = {name: np.random.rand(args.samples) for name in ("curpos_x", "curpos_y", "curpos_z")}
+    window["curpos_x"][::50] = np.nan
+    timestamps = np.cumsum(np.full(args.samples, 0.01))
+
+    def legacy_ws(msg):
+        text = json.dumps(msg, ensure_ascii=False, default=str)
+        return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+    def legacy_history():
+        return json.dumps(jsonable_encoder(history), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+
+    def legacy_window():
+        return json.dumps(jsonable_encoder({
+            "timestamp": timestamps.tolist(),
+            "channels": {name: [None if v != v else v for v in values.tolist()] for name, values in window.items()}
+        })).encode("utf-8")
+
+    cases = [
+        ("WebSocket sensor_data", lambda: legacy_ws(message), lambda: len(fast_json.dumps(message))),
+        ("WebSocket sensor_data (NumPy 스칼라)", lambda: legacy_ws(numpy_message),
+         lambda: len(fast_json.dumps(numpy_message))),
+        (f"REST 히스토리 {args.rows}행", legacy_history,
+         lambda: fast_json.FastJSONResponse(history).body),
+        (f"링 버퍼 구간 {args.samples}샘플 × 3채널", legacy_window,
+         lambda: fast_json.dumps({"timestamp": timestamps, "channels": window})),
+    ]
+
+    print(f"fast_json 백엔드: {fast_json.BACKEND}")
+    print(f"{'항목':<36} {'기존 (us)':>12} {'fast_json (us)':>15} {'배속':>8}")
+    for label, legacy, fast in cases:
+        legacy_us = bench(legacy, args.repeat)
+        fast_us = bench(fast, args.repeat)
+        print(f"{label:<36} {legacy_us:>12.1f} {fast_us:>15.1f} {legacy_us / fast_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
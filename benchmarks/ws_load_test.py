@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+WebSocket 부하 테스트 - 대시보드 클라이언트 여러 개를 동시에 연결해 팬아웃 성능 측정
+
+백엔드(main.app 시뮬레이션 모드 또는 test_backend.py)를 별도 프로세스로 띄우고
+asyncio WebSocket 클라이언트 N개로 /ws를 구독하면서 다음을 기록:
+    메시지/샘플 수신률, 종단 지연(센서 데이터 시각 → 클라이언트 수신) 백분위,
+    서버 프로세스 CPU/메모리, seq 누락(버려진 메시지), 지연 예산을 넘긴 샘플 수
+결과는 JSON 보고서로 저장 (같은 Linux 머신 하나에서 실행, CPU는 /proc에서 측정)
+
+사용법:
+    python benchmarks/ws_load_test.py --clients 20,50,100 --duration 15
+    python benchmarks/ws_load_test.py --mode binary --clients 50 --env WS_QUEUE_POLICY=drop_oldest
+    python benchmarks/ws_load_test.py --server test_backend --clients 20
+    python benchmarks/ws_load_test.py --server external --url http://127.0.0.1:8000 --clients 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import websockets
+
+from backend.ws_protocol import (BinarySchema, BINARY_SUBPROTOCOL, MSG_SENSOR_BATCH, MSG_SENSOR_BATCH_MINMAX,
+                                 MSG_SENSOR_DELTA)
+
+# 수신 모드 → (/ws 쿼리 문자열, 서브프로토콜)
+MODES = {
+    "json": ("", None),
+    "delta": ("delta=1", None),
+    "binary": ("", BINARY_SUBPROTOCOL),
+    "binary-delta": ("delta=1", BINARY_SUBPROTOCOL),
+    "batch": ("batch=10&batch_ms=200", None),
+    "binary-batch": ("batch=10&batch_ms=200", BINARY_SUBPROTOCOL),
+}
+
+SERVER_APPS = {
+    "main": "backend.main:app",
+    "test_backend": "test_backend:app",
+}
+
+
+def _parse_time(value: Any) -> Optional[float]:
+    """센서 데이터 timestamp ("2024-01-01 12:00:00.000" 또는 ISO) → Unix 초"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+class ProcessMonitor:
+    """/proc/<pid>에서 프로세스 CPU 시간과 RSS 조회 (Linux)"""
+
+    def __init__(self, pid: Optional[int]):
+        self.pid = pid
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self.peak_percent = 0.0
+        self._last = None
+
+    def cpu_seconds(self) -> Optional[float]:
+        if self.pid is None:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                # comm에 공백이 있을 수 있으므로 마지막 ')' 이후부터 분리
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self.clock_ticks
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def rss_mb(self) -> Optional[float]:
+        if self.pid is None:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024.0
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def sample(self):
+        """주기적으로 호출해 최대 CPU 사용률 갱신"""
+        now, cpu = time.monotonic(), self.cpu_seconds()
+        if cpu is None:
+            return
+        if self._last is not None and now > self._last[0]:
+            percent = 100.0 * (cpu - self._last[1]) / (now - self._last[0])
+            self.peak_percent = max(self.peak_percent, percent)
+        self._last = (now, cpu)
+
+    def reset(self):
+        self.peak_percent = 0.0
+        self._last = None
+
+
+class ClientStats:
+    """클라이언트 하나의 수신 통계"""
+
+    def __init__(self):
+        self.connected = False
+        self.error: Optional[str] = None
+        self.recording = False
+        self.recording_since = 0.0  # 측정 시작 시각 (배치에 담긴 이전 샘플 제외)
+        self.messages = 0
+        self.samples = 0
+        self.bytes = 0
+        self.latencies: List[float] = []
+        self.missing = 0            # seq 누락 (서버에서 버려지거나 대체된 샘플)
+        self.broken_deltas = 0      # base_seq가 직전 seq와 다른 델타
+        self.last_seq: Optional[int] = None
+        self.first_seq: Optional[int] = None
+
+    def start_recording(self):
+        self.recording_since = time.time()
+        self.recording = True
+
+    def record_sample(self, sent_at: Optional[float], received_at: float):
+        if sent_at is not None and sent_at < self.recording_since:
+            return
+        self.samples += 1
+        if sent_at is not None:
+            self.latencies.append((received_at - sent_at) * 1000.0)
+
+    def track_seq(self, first: Optional[int], last: Optional[int]):
+        """연속 seq 확인 (구독/전송률 제한 없이 매 틱 받는 경우 누락 = 버려진 메시지)"""
+        if first is None or last is None:
+            return
+        if self.recording and self.last_seq is not None and first > self.last_seq + 1:
+            self.missing += first - self.last_seq - 1
+        if self.first_seq is None:
+            self.first_seq = first
+        self.last_seq = max(last, self.last_seq or last)
+
+
+async def run_client(url: str, subprotocol: Optional[str], stats: ClientStats, stop: asyncio.Event):
+    """/ws 구독 (ping에는 pong으로 응답, 수신 통계 기록)"""
+    schema: Optional[BinarySchema] = None
+    try:
+        kwargs = {"subprotocols": [subprotocol]} if subprotocol else {}
+        async with websockets.connect(url, max_size=None, **kwargs) as ws:
+            stats.connected = True
+            while not stop.is_set():
+                try:
+                    payload = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue
+                received_at = time.time()
+
+                if isinstance(payload, bytes):
+                    if schema is None:
+                        continue
+                    msg_type, seq, base_seq, timestamp, data = schema.decode(payload)
+                    batch = msg_type in (MSG_SENSOR_BATCH, MSG_SENSOR_BATCH_MINMAX)
+                    if stats.recording:
+                        stats.messages += 1
+                        stats.bytes += len(payload)
+                        if batch:
+                            for sent_at in data["time"]:
+                                stats.record_sample(sent_at, received_at)
+                        else:
+                            if msg_type == MSG_SENSOR_DELTA and base_seq != stats.last_seq:
+                                stats.broken_deltas += 1
+                            stats.record_sample(timestamp, received_at)
+                    # 배치 프레임의 base_seq는 첫 샘플의 seq
+                    stats.track_seq(base_seq if batch else seq, seq)
+                    continue
+
+                message = json.loads(payload)
+                msg_type = message.get("type")
+                if msg_type == "ping":
+                    await ws.send(json.dumps({"type": "pong", "id": message.get("id")}))
+                    continue
+                if msg_type == "schema":
+                    schema = BinarySchema([(c["key"], c["field"]) for c in message["channels"]])
+                    continue
+                if msg_type not in ("sensor_data", "sensor_delta", "sensor_batch"):
+                    continue
+                if not stats.recording:
+                    stats.track_seq(message.get("first_seq", message.get("seq")), message.get("seq"))
+                    continue
+                stats.messages += 1
+                stats.bytes += len(payload.encode("utf-8")) if isinstance(payload, str) else len(payload)
+
+                if msg_type == "sensor_batch":
+                    for sent_at in message.get("times", []):
+                        stats.record_sample(sent_at, received_at)
+                    stats.track_seq(message.get("first_seq"), message.get("seq"))
+                elif msg_type == "sensor_delta":
+                    if message.get("base_seq") != stats.last_seq:
+                        stats.broken_deltas += 1
+                    stats.record_sample(_parse_time(message.get("changed", {}).get("timestamp")), received_at)
+                    stats.track_seq(message.get("seq"), message.get("seq"))
+                else:
+                    data = message.get("data") or {}
+                    stats.record_sample(_parse_time(data.get("timestamp")), received_at)
+                    stats.track_seq(message.get("seq"), message.get("seq"))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        stats.error = f"{type(e).__name__}: {e}"
+
+
+def _http_json(base_url: str, path: str, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+    try:
+        with urllib.request.urlopen(base_url + path, timeout=timeout) as response:
+            return json.loads(response.read())
+    except Exception:
+        return None
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p90": None, "p99": None, "max": None, "mean": None}
+    array = np.asarray(values)
+    p50, p90, p99 = np.percentile(array, [50, 90, 99])
+    return {
+        "p50": round(float(p50), 2), "p90": round(float(p90), 2), "p99": round(float(p99), 2),
+        "max": round(float(array.max()), 2), "mean": round(float(array.mean()), 2)
+    }
+
+
+async def run_load(base_url: str, clients: int, mode: str, query: str, duration: float, warmup: float,
+                   late_ms: float, monitor: ProcessMonitor) -> Dict[str, Any]:
+    """클라이언트 N개로 한 번 측정"""
+    mode_query, subprotocol = MODES[mode]
+    params = "&".join(part for part in (mode_query, query) if part)
+    url = base_url.replace("http", "ws", 1) + "/ws" + (f"?{params}" if params else "")
+
+    stop = asyncio.Event()
+    stats = [ClientStats() for _ in range(clients)]
+    tasks = [asyncio.create_task(run_client(url, subprotocol, s, stop)) for s in stats]
+
+    # 접속 및 워밍업 (이 구간의 메시지는 seq 기준점만 기록)
+    await asyncio.sleep(warmup)
+    for s in stats:
+        s.start_recording()
+    monitor.reset()
+    monitor.sample()
+    cpu_started = monitor.cpu_seconds()
+    harness_started = time.process_time()
+    started = time.monotonic()
+    while time.monotonic() - started < duration:
+        await asyncio.sleep(min(1.0, duration - (time.monotonic() - started)))
+        monitor.sample()
+    elapsed = time.monotonic() - started
+    cpu_finished = monitor.cpu_seconds()
+    harness_cpu = time.process_time() - harness_started
+    for s in stats:
+        s.recording = False
+
+    server_ws = await asyncio.get_running_loop().run_in_executor(None, _http_json, base_url, "/api/status/websocket")
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    connected = [s for s in stats if s.connected]
+    latencies = [value for s in connected for value in s.latencies]
+    samples = sum(s.samples for s in connected)
+    messages = sum(s.messages for s in connected)
+    per_client_rate = [s.samples / elapsed for s in connected]
+    late = sum(1 for value in latencies if value > late_ms)
+
+    result = {
+        "clients": clients,
+        "connected": len(connected),
+        "failed": clients - len(connected),
+        "errors": sorted({s.error for s in stats if s.error})[:5],
+        "duration_s": round(elapsed, 2),
+        "messages": messages,
+        "samples": samples,
+        "bytes": sum(s.bytes for s in connected),
+        "message_rate": round(messages / elapsed, 1),
+        "sample_rate_per_client": {
+            "mean": round(float(np.mean(per_client_rate)), 2) if per_client_rate else None,
+            "min": round(float(np.min(per_client_rate)), 2) if per_client_rate else None
+        },
+        "latency_ms": _percentiles(latencies),
+        "late": {"budget_ms": late_ms, "count": late, "ratio": round(late / len(latencies), 4) if latencies else None},
+        "missing_samples": sum(s.missing for s in connected),
+        "broken_deltas": sum(s.broken_deltas for s in connected),
+        "server": {
+            "cpu_percent": (round(100.0 * (cpu_finished - cpu_started) / elapsed, 1)
+                            if cpu_started is not None and cpu_finished is not None else None),
+            "cpu_percent_peak": round(monitor.peak_percent, 1) if monitor.pid else None,
+            "rss_mb": round(monitor.rss_mb(), 1) if monitor.rss_mb() is not None else None
+        },
+        "harness_cpu_percent": round(100.0 * harness_cpu / elapsed, 1)
+    }
+    if server_ws and "connections" in server_ws:
+        connections = server_ws["connections"]
+        result["server_websocket"] = {
+            "dropped": sum(c.get("dropped", 0) for c in connections),
+            "max_queue_depth": max((c.get("max_queue_depth", 0) for c in connections), default=0),
+            "rtt_avg_ms": _percentiles([c["rtt_avg_ms"] for c in connections if c.get("rtt_avg_ms") is not None]),
+            "reaped": server_ws.get("heartbeat", {}).get("reaped")
+        }
+    return result
+
+
+def start_server(app: str, port: int, extra_env: Dict[str, str], log_path: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    # 센서 없이 더미 데이터로 동작 (재연결 감시도 끔)
+    env.update(SENSOR_SIMULATE="true", SENSOR_SUPERVISOR="false")
+    env.update(extra_env)
+    log = open(log_path, "w")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+def wait_ready(base_url: str, timeout: float = 30.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _http_json(base_url, "/api/status", timeout=1.0) is not None:
+            return True
+        time.sleep(0.3)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket 부하 테스트")
+    parser.add_argument("--server", choices=("main", "test_backend", "external"), default="main",
+                        help="측정할 서버 (external은 --url의 이미 실행 중인 서버)")
+    parser.add_argument("--url", default=None, help="external 서버 주소 (예: http://127.0.0.1:8000)")
+    parser.add_argument("--port", type=int, default=18765, help="부하 테스트용으로 띄울 서버 포트")
+    parser.add_argument("--clients", default="20,50,100", help="동시 접속 클라이언트 수 (쉼표로 여러 단계)")
+    parser.add_argument("--duration", type=float, default=15.0, help="단계별 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="접속 후 측정 전 대기 시간 (초)")
+    parser.add_argument("--mode", choices=sorted(MODES), default="json", help="수신 모드")
+    parser.add_argument("--query", default="", help="/ws에 추가할 쿼리 문자열 (예: batch=25)")
+    parser.add_argument("--late-ms", type=float, default=100.0, help="지연 예산 (이보다 늦은 샘플을 late로 집계)")
+    parser.add_argument("--env", action="append", default=[], help="서버 환경 변수 KEY=VALUE (여러 번 지정 가능)")
+    parser.add_argument("--output", default="ws_load_report.json", help="JSON 보고서 경로")
+    args = parser.parse_args()
+
+    extra_env = dict(item.split("=", 1) for item in args.env)
+    client_counts = [int(n) for n in args.clients.split(",") if n.strip()]
+
+    server = None
+    log_path = os.path.join(tempfile.gettempdir(), f"ws_load_server_{args.port}.log")
+    if args.server == "external":
+        if not args.url:
+            parser.error("--server external에는 --url이 필요합니다")
+        base_url = args.url.rstrip("/")
+    else:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = start_server(SERVER_APPS[args.server], args.port, extra_env, log_path)
+        print(f"🚀 {args.server} 서버 시작 (pid {server.pid}, 로그 {log_path})")
+        if not wait_ready(base_url):
+            server.terminate()
+            print("❌ 서버가 시작되지 않았습니다")
+            sys.exit(1)
+
+    monitor = ProcessMonitor(server.pid if server else None)
+    runs = []
+    try:
+        for count in client_counts:
+            print(f"📊 클라이언트 {count}개 측정 중 ({args.mode}, {args.duration:.0f}초)...")
+            result = asyncio.run(run_load(base_url, count, args.mode, args.query, args.duration,
+                                          args.warmup, args.late_ms, monitor))
+            runs.append(result)
+            latency = result["latency_ms"]
+            print(f"   접속 {result['connected']}/{count}, 클라이언트당 {result['sample_rate_per_client']['mean']} 샘플/s, "
+                  f"지연 p50 {latency['p50']}ms p99 {latency['p99']}ms, 누락 {result['missing_samples']}, "
+                  f"late {result['late']['count']}, 서버 CPU {result['server']['cpu_percent']}%")
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "config": {
+            "server": args.server,
+            "url": base_url,
+            "mode": args.mode,
+            "query": args.query,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "late_budget_ms": args.late_ms,
+            "server_env": extra_env
+        },
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count()
+        },
+        "runs": runs
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ 보고서 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,69 @@
  */
 import React, { useState, useEffect } from 'react';
 import { useSensorData } from '../hooks/useSensorData';
+import { ApiService } from '../services/api';
 
 interface CameraViewProps {
   cameraType?: 'basler' | 'hikrobot';
 }
 
+// 컴포넌트 밖에 정의해 재렌더링 시 <img>가 다시 마운트되지 않도록 함 (MJPEG 연결 유지)
+const ImageDisplay = ({ 
+  imageUrl, 
+  loading, 
+  available, 
+  title, 
+  placeholder 
+}: {
+  imageUrl: string | null;
+  loading: boolean;
+  available: boolean;
+  title: string;
+  placeholder: string;
+}) => (
+  <div className="h-full flex flex-col">
+    <div className="flex items-center justify-between mb-2">
+      <h4 className="text-sm font-semibold text-gray-700">{title}</h4>
+      <div className="flex items-center space-x-2">
+        <div className={`w-2 h-2 rounded-full ${available ? 'bg-green-500' : 'bg-red-500'}`}></div>
+        <span className="text-xs text-gray-500">
+          {available ? 'Connected' : 'Disconnected'}
+        </span>
+      </div>
+    </div>
+
+    <div className="flex-1 bg-gray-100 rounded-lg overflow-hidden relative">
+      {loading ? (
+        <div className="h-full flex items-center justify-center">
+          <div className="text-center">
+            <div className="animate-spin rounded-full h-8 w-8 border-b-2 border-blue-500 mx-auto mb-2"></div>
+            <div className="text-sm text-gray-500">이미지 로딩 중...</div>
+          </div>
+        </div>
+      ) : imageUrl ? (
+        <img
+          src={imageUrl}
+          alt={title}
+          className="w-full h-full object-contain"
+          onError={() => {
+            console.error(`${title} 이미지 로드 실패`);
+          }}
+        />
+      ) : (
+        <div className="h-full flex items-center justify-center">
+          <div className="text-center text-gray-500">
+            <div className="text-4xl mb-2">{placeholder}</div>
+            <div className="text-sm">
+              {available ? '이미지를 불러오는 중...' : '카메라가 연결되지 않았습니다'}
+            </div>
+          </div>
+        </div>
+      )}
+    </div>
+
+  </div>
+);
+
 const CameraView: React.FC<CameraViewProps> = ({ cameraType }) => {
   const { latestData } = useSensorData();
   const [baslerImageUrl, setBaslerImageUrl] = useState<string | null>(null);
@@ -18,103 +76,19 @@ const CameraView: React.FC<CameraViewProps> = ({ cameraType }) => {
   const [baslerLoading, setBaslerLoading] = useState(false);
   const [hikLoading, setHikLoading] = useState(false);
 
-  // Basler 이미지 로드
+  // Basler 영상 스트림 (연결되면 MJPEG URL 지정, 프레임은 서버가 푸시)
+  const baslerAvailable = (latestData?.camera_data as any)?.image_available || false;
   useEffect(() => {
-    const loadBaslerImage = async () => {
-      if ((latestData?.camera_data as any)?.image_available) {
-        setBaslerLoading(true);
-        try {
-          const imageUrl = await import('../services/api').then(api => 
-            api.ApiService.getImage('basler')
-          );
-          setBaslerImageUrl(imageUrl);
-        } catch (error) {
-          console.error('Basler 이미지 로드 실패:', error);
-        } finally {
-          setBaslerLoading(false);
-        }
-      }
-    };
-
-    loadBaslerImage();
-  }, [(latestData?.camera_data as any)?.image_available]);
+    setBaslerLoading(false);
+    setBaslerImageUrl(baslerAvailable ? ApiService.getVideoStreamUrl('basler', 720) : null);
+  }, [baslerAvailable]);
 
-  // HikRobot 이미지 로드
+  // HikRobot 영상 스트림 (2대 합성 화면)
+  const hikAvailable = (latestData?.hik_camera_data as any)?.hik_image_available || false;
   useEffect(() => {
-    const loadHikImage = async () => {
-      if ((latestData?.hik_camera_data as any)?.hik_image_available) {
-        setHikLoading(true);
-        try {
-          const imageUrl = await import('../services/api').then(api => 
-            api.ApiService.getImage('hik')
-          );
-          setHikImageUrl(imageUrl);
-        } catch (error) {
-          console.error('HikRobot 이미지 로드 실패:', error);
-        } finally {
-          setHikLoading(false);
-        }
-      }
-    };
-
-    loadHikImage();
-  }, [(latestData?.hik_camera_data as any)?.hik_image_available]);
-
-  const ImageDisplay = ({ 
-    imageUrl, 
-    loading, 
-    available, 
-    title, 
-    placeholder 
-  }: {
-    imageUrl: string | null;
-    loading: boolean;
-    available: boolean;
-    title: string;
-    placeholder: string;
-  }) => (
-    <div className="h-full flex flex-col">
-      <div className="flex items-center justify-between mb-2">
-        <h4 className="text-sm font-semibold text-gray-700">{title}</h4>
-        <div className="flex items-center space-x-2">
-          <div className={`w-2 h-2 rounded-full ${available ? 'bg-green-500' : 'bg-red-500'}`}></div>
-          <span className="text-xs text-gray-500">
-            {available ? 'Connected' : 'Disconnected'}
-          </span>
-        </div>
-      </div>
-
-      <div className="flex-1 bg-gray-100 rounded-lg overflow-hidden relative">
-        {loading ? (
-          <div className="h-full flex items-center justify-center">
-            <div className="text-center">
-              <div className="animate-spin rounded-full h-8 w-8 border-b-2 border-blue-500 mx-auto mb-2"></div>
-              <div className="text-sm text-gray-500">이미지 로딩 중...</div>
-            </div>
-          </div>
-        ) : imageUrl ? (
-          <img
-            src={imageUrl}
-            alt={title}
-            className="w-full h-full object-contain"
-            onError={() => {
-              console.error(`${title} 이미지 로드 실패`);
-            }}
-          />
-        ) : (
-          <div className="h-full flex items-center justify-center">
-            <div className="text-center text-gray-500">
-              <div className="text-4xl mb-2">{placeholder}</div>
-              <div className="text-sm">
-                {available ? '이미지를 불러오는 중...' : '카메라가 연결되지 않았습니다'}
-              </div>
-            </div>
-          </div>
-        )}
-      </div>
-
-    </div>
-  );
+    setHikLoading(false);
+    setHikImageUrl(hikAvailable ? ApiService.getVideoStreamUrl('hik', 1280) : null);
+  }, [hikAvailable]);
 
   // cameraType이 지정되지 않은 경우 기본 동작 (탭 방식)
   if (!cameraType) {
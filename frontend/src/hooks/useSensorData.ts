@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback } from 'react';
-import { ApiService, WebSocketService, SensorData, SystemStatus, SaveStatus } from '../services/api';
+import { ApiService, WebSocketService, SensorData, SystemStatus, SaveStatus, ResumeResult } from '../services/api';
 
 interface UseSensorDataResult {
   isConnected: boolean;
@@ -12,6 +12,9 @@ interface UseSensorDataResult {
   stopSaving: () => Promise<void>;
 }
 
+// 차트에 유지할 최대 데이터 개수
+const MAX_HISTORY = 500;
+
 export const useSensorData = (): UseSensorDataResult => {
   const [isConnected, setIsConnected] = useState<boolean>(false);
   const [latestData, setLatestData] = useState<SensorData | null>(null);
@@ -46,13 +49,32 @@ export const useSensorData = (): UseSensorDataResult => {
     setHistoryData(prev => {
       const newHistory = [...prev, data];
       // 최대 500개의 데이터만 유지
-      if (newHistory.length > 500) {
-        return newHistory.slice(newHistory.length - 500);
+      if (newHistory.length > MAX_HISTORY) {
+        return newHistory.slice(newHistory.length - MAX_HISTORY);
+      }
+      return newHistory;
+    });
+  }, []);
+
+  // 배치 메시지 (재연결 시 놓친 구간 재전송): 한 번의 상태 갱신으로 이어 붙임
+  const handleSensorBatch = useCallback((rows: SensorData[]) => {
+    if (rows.length === 0) return;
+    setLatestData(rows[rows.length - 1]);
+    setHistoryData(prev => {
+      const newHistory = prev.concat(rows);
+      if (newHistory.length > MAX_HISTORY) {
+        return newHistory.slice(newHistory.length - MAX_HISTORY);
       }
       return newHistory;
     });
   }, []);
 
+  const handleResume = useCallback((result: ResumeResult) => {
+    if (result.resumed) {
+      console.log(`🔄 놓친 데이터 ${result.replayed}개 이어받음 (seq ${result.from_seq} → ${result.to_seq})`);
+    }
+  }, []);
+
   const handleStatusUpdate = useCallback((status: SystemStatus) => {
     setSystemStatus(status);
   }, []);
@@ -83,6 +105,8 @@ export const useSensorData = (): UseSensorDataResult => {
     // WebSocket 연결 및 이벤트 리스너 등록
     const wsService = new WebSocketService();
     wsService.on('sensor_data', handleWebSocketMessage);
+    wsService.on('sensor_batch', handleSensorBatch);
+    wsService.on('resume', handleResume);
     wsService.on('status_update', handleStatusUpdate);
     wsService.on('save_status', handleSaveStatusUpdate);
     wsService.on('connection', handleConnectionStatus);
@@ -93,13 +117,15 @@ export const useSensorData = (): UseSensorDataResult => {
     return () => {
       // 컴포넌트 언마운트 시 WebSocket 연결 해제 및 리스너 제거
       wsService.off('sensor_data', handleWebSocketMessage);
+      wsService.off('sensor_batch', handleSensorBatch);
+      wsService.off('resume', handleResume);
       wsService.off('status_update', handleStatusUpdate);
       wsService.off('save_status', handleSaveStatusUpdate);
       wsService.off('connection', handleConnectionStatus);
       wsService.off('error', handleWebSocketError);
       wsService.disconnect();
     };
-  }, [fetchInitialData, handleWebSocketMessage, handleStatusUpdate, handleSaveStatusUpdate, handleConnectionStatus, handleWebSocketError]);
+  }, [fetchInitialData, handleWebSocketMessage, handleSensorBatch, handleResume, handleStatusUpdate, handleSaveStatusUpdate, handleConnectionStatus, handleWebSocketError]);
 
   const startSaving = useCallback(async (folderName: string) => {
     try {
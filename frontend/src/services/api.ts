@@ -43,8 +43,10 @@ apiClient.interceptors.response.use(
 export interface SensorData {
   timestamp: string;
   camera_data?: {
-    image?: string;
     melt_pool_area?: number;
+    image_available?: boolean;
+    frame_id?: number;
+    frame_shape?: number[];
   };
   laser_data?: {
     outpower?: number;
@@ -63,7 +65,9 @@ export interface SensorData {
     curpos_c?: number;
   };
   hik_camera_data?: {
-    combined_image?: string;
+    hik_image_available?: boolean;
+    frame_id?: number[];
+    combined_shape?: number[];
   };
 }
 
@@ -80,6 +84,69 @@ export interface SystemStatus {
   timestamp: string;
 }
 
+// 필드별 배열로 묶인 센서 데이터 (sensor_batch 메시지, 재연결 시 놓친 구간 재전송)
+export interface SensorBatch {
+  seq: number;
+  first_seq: number;
+  count: number;
+  seqs: number[];
+  times: number[];
+  data: { [key: string]: any };
+  replay?: boolean;
+}
+
+// 재연결 이어받기 결과 (resume 메시지)
+export interface ResumeResult {
+  resumed: boolean;
+  reason: string;
+  from_seq: number;
+  to_seq: number;
+  replayed: number;
+}
+
+// sensor_batch 열 데이터 → 틱별 SensorData 목록
+export const expandSensorBatch = (batch: SensorBatch): SensorData[] => {
+  const rows: SensorData[] = [];
+  for (let i = 0; i < batch.count; i++) {
+    const row: { [key: string]: any } = {};
+    Object.entries(batch.data).forEach(([key, column]) => {
+      if (Array.isArray(column)) {
+        if (column[i] !== null) row[key] = column[i];
+        return;
+      }
+      const values: { [field: string]: any } = {};
+      let present = false;
+      Object.entries(column as { [field: string]: any[] }).forEach(([field, fieldValues]) => {
+        if (fieldValues[i] !== null) {
+          values[field] = fieldValues[i];
+          present = true;
+        }
+      });
+      if (present) row[key] = values;
+    });
+    rows.push(row as SensorData);
+  }
+  return rows;
+};
+
+// 히스토리 시간 구간 조회 (/api/data/history?start=&end=&seconds=&max_points=)
+export interface HistoryRangeQuery {
+  start?: number | string;  // UNIX 시각(초) 또는 ISO 형식 로컬 시각
+  end?: number | string;
+  seconds?: number;         // start 생략 시 최근 N초
+  max_points?: number;      // 채널별 최대 점 수 (초과 시 다운샘플)
+  downsample?: 'minmax' | 'lttb';
+  channels?: string[];
+}
+
+export interface HistoryRange {
+  count: number;
+  start: number | null;
+  end: number | null;
+  downsample: string | null;
+  channels: { [channel: string]: { timestamp: number[]; values: (number | null)[] } };
+}
+
 export interface SaveRequest {
   folder_name: string;
 }
@@ -122,6 +189,15 @@ export class ApiService {
     return response.data;
   }
 
+  /**
+   * 히스토리 시간 구간 조회 (채널별, 차트 폭에 맞춰 다운샘플)
+   */
+  static async getHistoryRange(query: HistoryRangeQuery): Promise<HistoryRange> {
+    const params = { ...query, channels: query.channels?.join(',') };
+    const response = await apiClient.get('/api/data/history', { params });
+    return response.data;
+  }
+
   /**
    * 데이터 저장 시작
    */
@@ -159,6 +235,15 @@ export class ApiService {
     return URL.createObjectURL(blob);
   }
 
+  /**
+   * 영상 스트림 URL (MJPEG, <img src>로 바로 표시)
+   * 서버가 새 프레임만 인코딩해 보내므로 이미지 폴링이 필요 없음
+   */
+  static getVideoStreamUrl(stream: 'basler' | 'hik' | string, width?: number): string {
+    const query = width ? `?width=${width}` : '';
+    return `${API_BASE_URL}/api/video/${stream}${query}`;
+  }
+
   /**
    * 서버 연결 테스트
    */
@@ -180,9 +265,14 @@ export class WebSocketService {
   private maxReconnectAttempts = 5;
   private reconnectInterval = 3000;
   private listeners: Map<string, Function[]> = new Map();
+  // 마지막으로 받은 센서 데이터 순번과 서버 스트림 ID (재연결 시 놓친 구간 이어받기)
+  private lastSeq: number | null = null;
+  private streamId: string | null = null;
 
   constructor() {
     this.listeners.set('sensor_data', []);
+    this.listeners.set('sensor_batch', []);
+    this.listeners.set('resume', []);
     this.listeners.set('status_update', []);
     this.listeners.set('save_status', []);
     this.listeners.set('connection', []);
@@ -194,7 +284,11 @@ export class WebSocketService {
    */
   connect(): void {
     try {
-      this.ws = new WebSocket('ws://127.0.0.1:8001/ws');
+      // 이전 연결에서 받은 데이터가 있으면 그 다음부터 이어받기
+      const resume = this.lastSeq !== null && this.streamId !== null
+        ? `?resume_from=${this.lastSeq}&stream=${this.streamId}`
+        : '';
+      this.ws = new WebSocket(`ws://127.0.0.1:8001/ws${resume}`);
       
       this.ws.onopen = () => {
         console.log('🔗 WebSocket 연결됨');
@@ -246,8 +340,19 @@ export class WebSocketService {
     
     switch (type) {
       case 'sensor_data':
+        if (typeof data.seq === 'number') this.lastSeq = data.seq;
         this.emit('sensor_data', data.data);
         break;
+      case 'sensor_batch':
+        this.lastSeq = data.seq;
+        this.emit('sensor_batch', expandSensorBatch(data));
+        break;
+      case 'resume':
+        if (!data.resumed) {
+          console.warn(`⚠️ WebSocket 이어받기 실패 (${data.reason}), 실시간 데이터부터 다시 수신`);
+        }
+        this.emit('resume', data);
+        break;
       case 'status_update':
         this.emit('status_update', data.data);
         break;
@@ -255,13 +360,21 @@ export class WebSocketService {
         this.emit('save_status', data.data);
         break;
       case 'connection':
-        this.emit('connection', data);
+        if (this.streamId !== data.stream) {
+          // 서버가 재시작되면 순번이 초기화되므로 이어받을 수 없음
+          this.lastSeq = null;
+          this.streamId = data.stream ?? null;
+        }
+        // 연결 상태 이벤트는 onopen에서 이미 발생
         break;
       case 'error':
         this.emit('error', data.message);
         break;
       case 'ping':
-        // 핑 응답은 무시
+        // 하트비트: 같은 id로 응답해야 서버가 연결을 유지하고 왕복 시간을 측정
+        if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+          this.ws.send(JSON.stringify({ type: 'pong', id: data.id }));
+        }
         break;
       default:
         console.log('알 수 없는 WebSocket 메시지 타입:', type);
@@ -0,0 +1,52 @@
+"""
+델타 프로토콜 테스트 - 센서 연결/해제(키가 None ↔ dict로 전환) 시 diff/apply_delta 결과가 키프레임과 같은지 확인
+실행: python -m pytest -q tests
+"""
+import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ws_protocol import apply_delta, diff, flatten
+
+
+def _roundtrip(previous, current):
+    """previous 상태에 diff(previous, current) 델타를 적용한 결과"""
+    changed, removed = diff(flatten(previous), flatten(current))
+    state = copy.deepcopy(previous)
+    return apply_delta(state, {"changed": changed, "removed": removed}), changed, removed
+
+
+def test_sensor_attach_replaces_none():
+    previous = {"timestamp": "a", "cnc_data": None}
+    current = {"timestamp": "b", "cnc_data": {"curpos_x": 1.0, "curpos_y": 2.0}}
+    state, changed, removed = _roundtrip(previous, current)
+    assert "cnc_data" not in removed
+    assert changed["cnc_data"] == {"curpos_x": 1.0, "curpos_y": 2.0}
+    assert state == current
+
+
+def test_sensor_detach_replaces_dict():
+    previous = {"timestamp": "a", "cnc_data": {"curpos_x": 1.0, "curpos_y": 2.0}}
+    current = {"timestamp": "b", "cnc_data": None}
+    state, changed, removed = _roundtrip(previous, current)
+    assert "cnc_data" not in removed
+    assert changed["cnc_data"] is None
+    assert state == current
+
+
+def test_attach_when_client_lacks_key():
+    previous = {"timestamp": "a", "cnc_data": None}
+    current = {"timestamp": "b", "cnc_data": {"curpos_x": 1.0}}
+    changed, removed = diff(flatten(previous), flatten(current))
+    state = apply_delta({"timestamp": "a"}, {"changed": changed, "removed": removed})
+    assert state == current
+
+
+def test_field_removal_still_sent():
+    previous = {"timestamp": "a", "camera_data": {"melt_pool_area": 3.0, "power": 1.0}, "laser_data": None}
+    current = {"timestamp": "b", "camera_data": {"power": 1.0}}
+    state, changed, removed = _roundtrip(previous, current)
+    assert removed == {"camera_data": ["melt_pool_area"], "laser_data": None}
+    assert state == current